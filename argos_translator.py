@@ -2,36 +2,92 @@
 """
 Argos Translate Integration for AccessAI
 Provides free, open-source translation without API keys
+
+Offline mode (ARGOS_OFFLINE=1) reads the package index from a pinned local
+snapshot and only uses packages installed at build time from local
+.argosmodel files (setup_argos_models.py); it never touches the network.
 """
 
+import json
+import os
 import argostranslate.package
 import argostranslate.translate
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# Offline mode: no package index update at startup, no downloads at request time
+ARGOS_OFFLINE = os.getenv('ARGOS_OFFLINE', '0') == '1'
+# Local .argosmodel files and the pinned index snapshot written by setup_argos_models.py
+ARGOS_MODEL_DIR = os.getenv('ARGOS_MODEL_DIR', 'argos_models')
+ARGOS_INDEX_SNAPSHOT = os.getenv('ARGOS_INDEX_SNAPSHOT', os.path.join(ARGOS_MODEL_DIR, 'index.json'))
+
+
+def package_filename(from_code: str, to_code: str) -> str:
+    """Local file name of a language pair's package (argospm naming)"""
+    return f"translate-{from_code}_{to_code}.argosmodel"
+
+
+def load_index_snapshot(path: str = ARGOS_INDEX_SNAPSHOT) -> list:
+    """AvailablePackage entries from a pinned copy of the Argos package index"""
+    with open(path, encoding='utf-8') as f:
+        return [argostranslate.package.AvailablePackage(metadata) for metadata in json.load(f)]
+
+
+def local_package_files(model_dir: str = ARGOS_MODEL_DIR) -> Dict[Tuple[str, str], str]:
+    """(from_code, to_code) -> path of every .argosmodel file in model_dir"""
+    files = {}
+    if not os.path.isdir(model_dir):
+        return files
+    for name in sorted(os.listdir(model_dir)):
+        if not (name.startswith('translate-') and name.endswith('.argosmodel')):
+            continue
+        codes = name[len('translate-'):-len('.argosmodel')].split('_')
+        if len(codes) == 2:
+            files[tuple(codes)] = os.path.join(model_dir, name)
+    return files
+
+
+def installed_pairs() -> set:
+    return {(pkg.from_code, pkg.to_code) for pkg in argostranslate.package.get_installed_packages()}
+
 
 class ArgosTranslator:
     """Wrapper for Argos Translate functionality"""
     
-    def __init__(self):
+    def __init__(self, offline: bool = ARGOS_OFFLINE, index_snapshot: str = ARGOS_INDEX_SNAPSHOT):
         """Initialize Argos Translate"""
         self.initialized = False
+        self.offline = offline
+        self.index_snapshot = index_snapshot
         self.available_packages = []
         self.supported_languages = {}
+        # Installed (from_code, to_code) pairs, so requests don't rescan the package directory
+        self.installed = set()
         
     def initialize(self):
-        """Download and initialize translation packages"""
+        """Load the package index (pinned snapshot when offline) and the installed packages"""
         try:
-            print("[*] Initializing Argos Translate...")
+            print(f"[*] Initializing Argos Translate{' (offline)' if self.offline else ''}...")
             
-            # Update package index
-            argostranslate.package.update_package_index()
-            print("[✓] Package index updated")
-            
-            # Get available packages
-            self.available_packages = argostranslate.package.get_available_packages()
+            if self.offline:
+                if os.path.exists(self.index_snapshot):
+                    self.available_packages = load_index_snapshot(self.index_snapshot)
+                    print(f"[✓] Package index snapshot loaded: {self.index_snapshot}")
+                else:
+                    print(f"[!] No package index snapshot at {self.index_snapshot}, using installed packages only")
+            else:
+                # Update package index
+                argostranslate.package.update_package_index()
+                print("[✓] Package index updated")
+                
+                # Get available packages
+                self.available_packages = argostranslate.package.get_available_packages()
             print(f"[✓] Found {len(self.available_packages)} available translation packages")
             
+            installed_packages = argostranslate.package.get_installed_packages()
+            self.installed = {(pkg.from_code, pkg.to_code) for pkg in installed_packages}
             # Build supported languages map
-            self._build_language_map()
+            self._build_language_map(installed_packages)
+            print(f"[✓] {len(self.installed)} translation packages installed")
             
             self.initialized = True
             print("[✓] Argos Translate initialized successfully")
@@ -40,9 +96,13 @@ class ArgosTranslator:
             print(f"[!] Error initializing Argos Translate: {e}")
             self.initialized = False
     
-    def _build_language_map(self):
-        """Build a map of supported language pairs"""
-        for package in self.available_packages:
+    def _build_language_map(self, installed_packages=()):
+        """Build a map of supported language pairs from the index and the installed packages
+
+        Installed packages are included so offline mode without an index
+        snapshot still lists the pairs it can translate.
+        """
+        for package in list(self.available_packages) + list(installed_packages):
             key = f"{package.from_code}_{package.to_code}"
             self.supported_languages[key] = {
                 'from_code': package.from_code,
@@ -55,10 +115,17 @@ class ArgosTranslator:
         """Download and install translation package if needed"""
         try:
             # Check if package is already installed
-            installed_packages = argostranslate.package.get_installed_packages()
-            for pkg in installed_packages:
-                if pkg.from_code == from_code and pkg.to_code == to_code:
-                    return True
+            if (from_code, to_code) in self.installed:
+                return True
+            # Installed since startup (e.g. by setup_argos_models.py)?
+            self.installed = installed_pairs()
+            if (from_code, to_code) in self.installed:
+                return True
+            
+            if self.offline:
+                print(f"[!] Package not installed: {from_code} -> {to_code} "
+                      f"(offline: run setup_argos_models.py install --pairs {from_code}_{to_code})")
+                return False
             
             # Find and install package
             package_to_install = next(
@@ -70,6 +137,7 @@ class ArgosTranslator:
             if package_to_install:
                 print(f"[*] Installing translation package: {from_code} -> {to_code}")
                 argostranslate.package.install_from_path(package_to_install.download())
+                self.installed.add((from_code, to_code))
                 print(f"[✓] Package installed: {from_code} -> {to_code}")
                 return True
             else:
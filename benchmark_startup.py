@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import time and memory of the backend modules and each model load
+Every measurement runs in a fresh interpreter, so imports are cold and each
+result's RSS belongs to that target alone. Model loads go through the
+server's lazy components (load plus warm-up) after importing the server with
+warmup disabled. Writes a JSON report and exits with status 1 when a target
+fails or goes over its wall-time / RSS threshold, so CI can track boot-time
+regressions.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --targets import:gesture_api_server_simple,load:gesture --repeat 5
+    python benchmark_startup.py --thresholds startup_thresholds.json --output startup_report.json --skip-missing
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+IMPORT_MODULES = ['nlp_processor', 'argos_translator', 'mongodb_connection',
+                  'gesture_api_server_simple', 'gesture_api_server_lite']
+COMPONENTS = ['gesture', 'landmarker', 'nlp', 'translate', 'documents', 'image_proxy']
+TARGETS = [f'import:{module}' for module in IMPORT_MODULES] + [f'load:{name}' for name in COMPONENTS]
+
+# Median wall time (ms) and RSS after the target (MB) allowed per target;
+# override any of them with --thresholds (a JSON file of the same shape)
+DEFAULT_THRESHOLDS: Dict[str, Dict[str, float]] = {
+    'import:nlp_processor': {'max_ms': 10000, 'max_rss_mb': 2000},
+    'import:argos_translator': {'max_ms': 5000, 'max_rss_mb': 1000},
+    'import:mongodb_connection': {'max_ms': 2000, 'max_rss_mb': 300},
+    'import:gesture_api_server_simple': {'max_ms': 1000, 'max_rss_mb': 300},
+    'import:gesture_api_server_lite': {'max_ms': 5000, 'max_rss_mb': 800},
+    'load:gesture': {'max_ms': 2000, 'max_rss_mb': 600},
+    'load:landmarker': {'max_ms': 5000, 'max_rss_mb': 800},
+    'load:nlp': {'max_ms': 60000, 'max_rss_mb': 3000},
+    'load:translate': {'max_ms': 30000, 'max_rss_mb': 2000},
+    'load:documents': {'max_ms': 3000, 'max_rss_mb': 500},
+    'load:image_proxy': {'max_ms': 1000, 'max_rss_mb': 300},
+}
+
+# Child processes measure import and load only: no background warmup or model watcher
+CHILD_ENV = {'GESTURE_WARMUP_COMPONENTS': 'none', 'GESTURE_MODEL_WATCH_INTERVAL': '0'}
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size of this process; None where it cannot be measured (e.g. Windows)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak RSS (KB on Linux, bytes on macOS) where /proc is not available
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(target: str) -> Dict:
+    """Run one target in this process (the child side)"""
+    kind, name = target.split(':', 1)
+    result = {'target': target, 'status': 'ok', 'error': None, 'missing_module': None}
+    baseline = rss_mb()
+    if kind == 'load':
+        # The server import is part of the baseline, not of the load
+        server = importlib.import_module('gesture_api_server_simple')
+        baseline = rss_mb()
+    start = time.perf_counter()
+    try:
+        if kind == 'import':
+            importlib.import_module(name)
+        else:
+            component = server.components.component(name)
+            component.warm()
+            result['details'] = component.to_dict()
+            if component.error:
+                result['status'] = 'error'
+                result['error'] = component.error
+                if component.error.startswith('ModuleNotFoundError') and "'" in component.error:
+                    result['missing_module'] = component.error.split("'")[1]
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+        if isinstance(e, ModuleNotFoundError):
+            result['missing_module'] = e.name
+    result['wall_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    rss = rss_mb()
+    result['rss_mb'] = round(rss, 1) if rss is not None else None
+    result['rss_delta_mb'] = round(rss - baseline, 1) if rss is not None else None
+    return result
+
+
+def run_child(target: str, timeout: float) -> Dict:
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        output = f.name
+    try:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', target, '--output', output],
+                              cwd=os.path.dirname(os.path.abspath(__file__)), env={**os.environ, **CHILD_ENV},
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=timeout)
+        if os.path.getsize(output):
+            with open(output) as f:
+                return json.load(f)
+        stderr = proc.stderr.strip().splitlines()
+        return {'target': target, 'status': 'error', 'missing_module': None,
+                'error': stderr[-1] if stderr else f"exit code {proc.returncode}"}
+    except subprocess.TimeoutExpired:
+        return {'target': target, 'status': 'error', 'missing_module': None, 'error': f"timed out after {timeout:.0f}s"}
+    finally:
+        os.unlink(output)
+
+
+def benchmark(target: str, repeat: int, threshold: Optional[Dict], timeout: float, skip_missing: bool) -> Dict:
+    runs = []
+    for _ in range(repeat):
+        run = run_child(target, timeout)
+        runs.append(run)
+        if run['status'] != 'ok':
+            break
+    result = dict(runs[-1])
+    result['runs'] = [run.get('wall_ms') for run in runs]
+    result['threshold'] = threshold
+    result['exceeded'] = []
+    if result['status'] != 'ok':
+        if skip_missing and result.get('missing_module'):
+            result['status'] = 'skipped'
+        return result
+
+    result['wall_ms'] = round(statistics.median(result['runs']), 1)
+    measured_rss = [run['rss_mb'] for run in runs if run['rss_mb'] is not None]
+    result['rss_mb'] = max(measured_rss) if measured_rss else None
+    if threshold:
+        if 'max_ms' in threshold and result['wall_ms'] > threshold['max_ms']:
+            result['exceeded'].append('max_ms')
+        # Without an RSS reading only the wall-time threshold applies
+        if 'max_rss_mb' in threshold and result['rss_mb'] is not None and result['rss_mb'] > threshold['max_rss_mb']:
+            result['exceeded'].append('max_rss_mb')
+    if result['exceeded']:
+        result['status'] = 'over_threshold'
+    return result
+
+
+def parse_targets(spec: Optional[str]) -> List[str]:
+    if not spec or spec == 'all':
+        return list(TARGETS)
+    targets = [target.strip() for target in spec.split(',') if target.strip()]
+    unknown = [target for target in targets if target not in TARGETS]
+    if unknown:
+        raise ValueError(f"Unknown target(s): {', '.join(unknown)} (expected any of {', '.join(TARGETS)})")
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend import time, model loads and memory")
+    parser.add_argument('--targets', help="Comma-separated targets (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh processes per target; wall time is the median")
+    parser.add_argument('--thresholds', help="JSON file overriding the default per-target thresholds")
+    parser.add_argument('--output', default='startup_report.json', help="JSON report path")
+    parser.add_argument('--timeout', type=float, default=600, help="Seconds allowed per process")
+    parser.add_argument('--skip-missing', action='store_true',
+                        help="Report targets whose dependencies are not installed as skipped instead of failed")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = measure(args.child)
+        with open(args.output, 'w') as f:
+            json.dump(result, f)
+        return
+
+    try:
+        targets = parse_targets(args.targets)
+    except ValueError as e:
+        print(f"[ERR] {e}")
+        sys.exit(2)
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            thresholds.update(json.load(f))
+
+    print(f"{'Target':<36}{'Status':>16}{'Wall ms':>10}{'RSS MB':>9}{'+RSS MB':>9}")
+    print("-" * 80)
+    results = []
+    for target in targets:
+        result = benchmark(target, max(1, args.repeat), thresholds.get(target), args.timeout, args.skip_missing)
+        results.append(result)
+        wall = f"{result['wall_ms']:.1f}" if result.get('wall_ms') is not None else '-'
+        rss = f"{result['rss_mb']:.0f}" if result.get('rss_mb') is not None else '-'
+        delta = f"{result['rss_delta_mb']:.0f}" if result.get('rss_delta_mb') is not None else '-'
+        print(f"{target:<36}{result['status']:>16}{wall:>10}{rss:>9}{delta:>9}")
+        if result['status'] in ('error', 'skipped'):
+            print(f"    {result['error']}")
+
+    failed = [result['target'] for result in results if result['status'] in ('error', 'over_threshold')]
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'passed': not failed,
+        'failed': failed,
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[*] Report written to {args.output}")
+    if failed:
+        print(f"[ERR] {len(failed)} target(s) failed or over threshold: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"[OK] All {len(results)} targets within thresholds")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Distill the gesture RandomForest into a compact student model
+Trains a NumPy MLP (or multinomial linear model) on the forest's soft labels
+over the saved landmark dataset, prints an accuracy / latency / memory
+comparison and saves the student for the server (GESTURE_SERVING_MODEL=student)
+
+Usage:
+    python distill_gesture_model.py gesture_classifier.pkl --data gesture_landmarks.npz
+    python distill_gesture_model.py gesture_classifier.pkl --hidden 0   # linear student
+"""
+
+import argparse
+import pickle
+import sys
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from forest_engine import CompiledForest
+from gesture_features import LEGACY_FEATURE_SPEC, extract_features, load_landmark_dataset
+from gesture_student import train_student
+
+
+def latency_percentiles(predict, X: np.ndarray, repeats: int = 500):
+    """p50/p99 single-sample latency in milliseconds"""
+    for i in range(min(20, len(X))):
+        predict(X[i:i + 1])  # Warm caches and lazy initialization
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X)].reshape(1, -1)
+        start = time.perf_counter()
+        predict(row)
+        timings.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(timings, [50, 99]) * 1000
+    return float(p50), float(p99)
+
+
+def jitter_landmarks(X_raw: np.ndarray, copies: int, noise: float, seed: int = 0) -> np.ndarray:
+    """Noisy copies of raw landmarks: a larger transfer set for the teacher to label"""
+    if copies <= 0:
+        return X_raw[:0]
+    rng = np.random.default_rng(seed)
+    repeated = np.repeat(X_raw, copies, axis=0)
+    return repeated + rng.normal(0.0, noise, repeated.shape)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the gesture RandomForest into a compact student model")
+    parser.add_argument('model', nargs='?', default='gesture_classifier.pkl', help="Pickled RandomForestClassifier")
+    parser.add_argument('--data', default='gesture_landmarks.npz', help="Raw landmark dataset saved by training")
+    parser.add_argument('--output', default='gesture_student.npz', help="Where to save the student")
+    parser.add_argument('--hidden', type=int, default=64, help="Hidden units (0 = multinomial linear model)")
+    parser.add_argument('--epochs', type=int, default=200)
+    parser.add_argument('--augment', type=int, default=4, help="Jittered copies of each training sample")
+    parser.add_argument('--noise', type=float, default=0.005, help="Landmark jitter (normalized image units)")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        forest = pickle.load(f)
+    feature_spec = getattr(forest, 'feature_spec_', LEGACY_FEATURE_SPEC)
+    print(f"[OK] Teacher {args.model}: {len(forest.estimators_)} trees, {forest.n_classes_} classes, "
+          f"features '{feature_spec}'")
+    forest.n_jobs = 1  # Single-sample latency without thread dispatch; matches the server's batches
+
+    X_raw, y, class_names = load_landmark_dataset(args.data)
+    print(f"[OK] Dataset {args.data}: {len(X_raw)} samples, {len(class_names)} classes")
+
+    X_train_raw, X_test_raw, y_train, y_test = train_test_split(
+        X_raw, y, test_size=args.test_size, random_state=42, stratify=y
+    )
+    transfer_raw = np.concatenate([X_train_raw, jitter_landmarks(X_train_raw, args.augment, args.noise)])
+    X_transfer = extract_features(transfer_raw, feature_spec)
+    X_test = extract_features(X_test_raw, feature_spec)
+
+    print(f"[*] Labelling {len(X_transfer)} transfer samples with the teacher...")
+    soft_targets = forest.predict_proba(X_transfer)
+
+    kind = f"MLP ({args.hidden} hidden units)" if args.hidden else "multinomial linear model"
+    print(f"[*] Training student: {kind}, {args.epochs} epochs")
+    # Hold part of the transfer set out to pick the best epoch (the test set stays untouched)
+    train_rows, val_rows = train_test_split(np.arange(len(X_transfer)), test_size=0.1, random_state=0)
+    teacher_labels = forest.classes_[np.argmax(soft_targets, axis=1)]
+    student = train_student(
+        X_transfer[train_rows], soft_targets[train_rows], forest.classes_, feature_spec,
+        hidden_units=args.hidden, epochs=args.epochs,
+        X_val=X_transfer[val_rows], y_val=teacher_labels[val_rows], labels=class_names
+    )
+    student.save(args.output)
+    print(f"[OK] Student saved: {args.output}")
+
+    compiled = CompiledForest.from_sklearn(forest)
+    forest_predictions = forest.predict(X_test)
+    candidates = [
+        ("Forest (scikit-learn)", forest.predict, len(pickle.dumps(forest))),
+        ("Forest (compiled)", compiled.predict, compiled.memory_bytes()),
+        (f"Student ({'mlp' if args.hidden else 'linear'})", student.predict, student.memory_bytes()),
+    ]
+
+    print(f"\n{'Model':<24}{'Accuracy':>10}{'Agreement':>11}{'p50 ms':>9}{'p99 ms':>9}{'Memory':>11}")
+    print("-" * 74)
+    student_accuracy = forest_accuracy = 0.0
+    for name, predict, memory in candidates:
+        predictions = predict(X_test)
+        accuracy = float(np.mean(predictions == y_test))
+        agreement = float(np.mean(predictions == forest_predictions))
+        p50, p99 = latency_percentiles(predict, X_test)
+        print(f"{name:<24}{accuracy * 100:>9.2f}%{agreement * 100:>10.2f}%{p50:>9.3f}{p99:>9.3f}"
+              f"{memory / 1e6:>9.2f}MB")
+        if name.startswith("Student"):
+            student_accuracy = accuracy
+        elif name == "Forest (scikit-learn)":
+            forest_accuracy = accuracy
+
+    print(f"\n[*] Test samples: {len(X_test)} (accuracy vs labels, agreement vs the forest)")
+    print(f"[*] Serve the student with GESTURE_SERVING_MODEL=student GESTURE_STUDENT_PATH={args.output}")
+    if student_accuracy < forest_accuracy - 0.05:
+        print("[!] Student is more than 5 points below the forest - try more --hidden units or --epochs")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
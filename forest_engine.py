@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Compiled RandomForest inference engine for gesture classification
+Flattens a fitted scikit-learn RandomForestClassifier into contiguous NumPy
+node arrays and evaluates every tree at once with vectorized traversal,
+avoiding scikit-learn's per-call validation and thread dispatch overhead
+
+Usage:
+    python forest_engine.py gesture_classifier.pkl [--data held_out.npy]
+"""
+
+import argparse
+import pickle
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def _sklearn_normalizes_leaves() -> bool:
+    """scikit-learn < 1.4 stores class counts in tree_.value and normalizes in predict_proba"""
+    import sklearn
+    major, minor = (int(part) for part in sklearn.__version__.split('.')[:2])
+    return (major, minor) < (1, 4)
+
+
+class CompiledForest:
+    """Flat-array copy of a RandomForestClassifier with identical predict_proba
+
+    All trees are concatenated into one node table. Leaves point to
+    themselves, so a fixed number of vectorized steps (the maximum tree
+    depth) walks every (sample, tree) pair to its leaf. Leaf distributions
+    are summed in estimator order, exactly like scikit-learn's sequential
+    accumulation, so probabilities match bit for bit.
+    """
+
+    def __init__(self, feature, threshold, left, right, leaf_index, leaf_values,
+                 roots, max_depth, classes, n_features_in, tree_depths=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_index = leaf_index
+        self.leaf_values = leaf_values
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_classes_ = len(classes)
+        self.n_features_in_ = int(n_features_in)
+        self.n_estimators = len(roots)
+        # Per-tree depth bounds the traversal steps needed for a chunk of trees
+        self.tree_depths = (np.asarray(tree_depths, dtype=np.int64) if tree_depths is not None
+                            else np.full(self.n_estimators, self.max_depth, dtype=np.int64))
+
+    @classmethod
+    def from_sklearn(cls, model) -> 'CompiledForest':
+        """Compile a fitted RandomForestClassifier (single output)"""
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+
+        normalize = _sklearn_normalizes_leaves()
+        n_classes = int(model.n_classes_)
+        features, thresholds, lefts, rights, leaf_indices, leaf_values, roots = [], [], [], [], [], [], []
+        tree_depths = []
+        offset = 0
+        leaf_offset = 0
+        max_depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes, dtype=np.int64)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves so extra traversal steps are no-ops
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+            values = tree.value[is_leaf, 0, :n_classes]
+            if normalize:
+                normalizer = values.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                values = values / normalizer
+            index = np.full(n_nodes, -1, dtype=np.int64)
+            index[is_leaf] = np.arange(leaf_offset, leaf_offset + len(values))
+            leaf_indices.append(index)
+            leaf_values.append(values)
+
+            roots.append(offset)
+            offset += n_nodes
+            leaf_offset += len(values)
+            max_depth = max(max_depth, tree.max_depth)
+            tree_depths.append(tree.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts)),
+            right=np.ascontiguousarray(np.concatenate(rights)),
+            leaf_index=np.ascontiguousarray(np.concatenate(leaf_indices)),
+            leaf_values=np.ascontiguousarray(np.concatenate(leaf_values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.int64),
+            max_depth=max_depth,
+            classes=np.asarray(model.classes_),
+            n_features_in=model.n_features_in_,
+            tree_depths=tree_depths
+        )
+
+    ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'leaf_index', 'leaf_values', 'roots', 'classes',
+                   'tree_depths')
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays for model_artifact.py (everything but the scalar metadata)"""
+        return {'feature': self.feature, 'threshold': self.threshold, 'left': self.left, 'right': self.right,
+                'leaf_index': self.leaf_index, 'leaf_values': self.leaf_values, 'roots': self.roots,
+                'classes': self.classes_, 'tree_depths': self.tree_depths}
+
+    def metadata(self) -> Dict:
+        return {'max_depth': self.max_depth, 'n_features_in': self.n_features_in_}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], metadata: Dict) -> 'CompiledForest':
+        """Rebuild from (possibly memory-mapped) arrays without copying them"""
+        return cls(feature=arrays['feature'], threshold=arrays['threshold'], left=arrays['left'],
+                   right=arrays['right'], leaf_index=arrays['leaf_index'], leaf_values=arrays['leaf_values'],
+                   roots=arrays['roots'], max_depth=metadata['max_depth'], classes=arrays['classes'],
+                   n_features_in=metadata['n_features_in'],
+                   # Artifacts exported before early exit existed have no per-tree depths
+                   tree_depths=arrays.get('tree_depths'))
+
+    def _walk(self, X: np.ndarray, roots: np.ndarray, depth: int) -> np.ndarray:
+        rows = np.arange(len(X))[:, np.newaxis]
+        nodes = np.broadcast_to(roots, (len(X), len(roots)))
+        for _ in range(depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def _as_input(self, X: np.ndarray) -> np.ndarray:
+        # scikit-learn compares float32 inputs against float64 thresholds
+        return np.ascontiguousarray(X, dtype=np.float32).reshape(-1, self.n_features_in_)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node id reached in every tree, shape (n_samples, n_estimators)"""
+        return self._walk(self._as_input(X), self.roots, self.max_depth)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        leaves = self.leaf_index[self.apply(X)]
+        # Reducing over the middle axis accumulates trees sequentially, in order
+        proba = self.leaf_values[leaves].sum(axis=1)
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def predict_proba_early_exit(self, X: np.ndarray, chunk_size: int = 16):
+        """Anytime predict_proba: evaluate trees in chunks, stop rows whose winner is settled
+
+        Every leaf distribution sums to 1, so the remaining r trees can add at
+        most r to any class. A row stops once its top class leads the
+        runner-up by more than r: the final argmax can no longer change, so
+        labels always match predict_proba. Stopped rows return the mean over
+        the trees evaluated, so their confidence can differ from the full
+        forest's (in either direction); rows that run to the end get exactly
+        predict_proba's values (trees are still accumulated one at a time, in
+        order). Returns (probabilities, trees evaluated per row).
+        """
+        X = self._as_input(X)
+        sums = np.zeros((len(X), self.n_classes_))
+        trees_used = np.full(len(X), self.n_estimators, dtype=np.int64)
+        active = np.arange(len(X))
+        # After k trees the lead is at most k, so no row can settle before
+        # k > n_estimators - k: the first chunk runs straight to that point
+        first_stop = min(self.n_estimators, self.n_estimators // 2 + 1)
+        stops = list(range(first_stop, self.n_estimators, chunk_size)) + [self.n_estimators]
+        start = 0
+        for stop in stops:
+            depth = int(self.tree_depths[start:stop].max())
+            leaves = self.leaf_index[self._walk(X[active], self.roots[start:stop], depth)]
+            chunk_values = self.leaf_values[leaves]
+            partial = sums[active]
+            for tree in range(stop - start):
+                partial += chunk_values[:, tree]
+            sums[active] = partial
+
+            remaining = self.n_estimators - stop
+            if remaining == 0 or self.n_classes_ < 2:
+                break
+            top_two = np.partition(partial, -2, axis=1)[:, -2:]
+            settled = (top_two[:, 1] - top_two[:, 0]) > remaining
+            if settled.any():
+                trees_used[active[settled]] = stop
+                active = active[~settled]
+                if len(active) == 0:
+                    break
+            start = stop
+
+        sums /= trees_used[:, np.newaxis]
+        return sums, trees_used
+
+    def memory_bytes(self) -> int:
+        arrays = (self.feature, self.threshold, self.left, self.right, self.leaf_index, self.leaf_values)
+        return int(sum(a.nbytes for a in arrays))
+
+
+class EarlyExitForest:
+    """Serves a CompiledForest with predict_proba_early_exit and counts trees evaluated
+
+    Each chunk costs a full set of traversal steps, which only pays off when
+    many rows share it: batches smaller than `min_rows` use the single-pass
+    predict_proba. With 1-8 rows the chunked walk is slower than one pass at
+    any chunk size, and no row can stop before half the trees, so this is for
+    large offline batches, not live 1-2 row traffic. Early-exited rows report
+    the mean over the trees evaluated, so confidences (and anything
+    thresholded on them) can differ from the full forest; labels do not.
+    Drop-in for the model API the server uses; everything else (classes_,
+    feature_spec_, memory_bytes, ...) is forwarded to the forest.
+    """
+
+    def __init__(self, forest: CompiledForest, chunk_size: int = 16, min_rows: int = 32):
+        self.forest = forest
+        self.chunk_size = max(1, chunk_size)
+        self.min_rows = min_rows
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.single_pass_rows = 0
+        self.trees_evaluated = 0
+        self.early_exits = 0
+
+    def __getattr__(self, name):
+        return getattr(self.forest, name)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        if len(X) < self.min_rows:
+            proba = self.forest.predict_proba(X)
+            trees_used = np.full(len(proba), self.forest.n_estimators)
+        else:
+            proba, trees_used = self.forest.predict_proba_early_exit(X, self.chunk_size)
+        with self._lock:
+            self.rows += len(trees_used)
+            if len(X) < self.min_rows:
+                self.single_pass_rows += len(trees_used)
+            self.trees_evaluated += int(trees_used.sum())
+            self.early_exits += int(np.count_nonzero(trees_used < self.forest.n_estimators))
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.forest.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            avg_trees = self.trees_evaluated / self.rows if self.rows else 0.0
+            return {
+                'chunk_size': self.chunk_size,
+                'min_rows': self.min_rows,
+                'n_estimators': self.forest.n_estimators,
+                'rows': self.rows,
+                # Rows in batches under min_rows: always the full forest
+                'single_pass_rows': self.single_pass_rows,
+                'avg_trees_evaluated': round(avg_trees, 1),
+                'early_exit_rate': round(self.early_exits / self.rows, 3) if self.rows else 0.0,
+                'tree_savings': round(1 - avg_trees / self.forest.n_estimators, 3) if self.rows else 0.0,
+                'note': (f"only batches of {self.min_rows}+ rows exit early (large offline batches); "
+                         f"early-exited confidences are means over fewer trees and can differ from the full forest")
+            }
+
+
+def sample_inputs(model, n_samples: int = 512, seed: int = 0) -> np.ndarray:
+    """Random inputs spanning each feature's split thresholds (when no held-out set is given)"""
+    rng = np.random.default_rng(seed)
+    n_features = model.n_features_in_
+    low = np.full(n_features, np.inf)
+    high = np.full(n_features, -np.inf)
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        split = tree.children_left != -1
+        np.minimum.at(low, tree.feature[split], tree.threshold[split])
+        np.maximum.at(high, tree.feature[split], tree.threshold[split])
+    unused = ~np.isfinite(low)
+    low[unused], high[unused] = 0.0, 1.0
+    margin = (high - low) * 0.1
+    return rng.uniform(low - margin, high + margin, size=(n_samples, n_features))
+
+
+def verify_against_sklearn(model, compiled: CompiledForest, X: np.ndarray) -> Dict:
+    """Compare compiled probabilities with model.predict_proba bit for bit
+
+    scikit-learn sums trees in completion order when n_jobs > 1, so the
+    reference is computed with n_jobs=1 (sequential, estimator order).
+    """
+    n_jobs = model.n_jobs
+    model.n_jobs = 1
+    try:
+        expected = model.predict_proba(X)
+    finally:
+        model.n_jobs = n_jobs
+    actual = compiled.predict_proba(X)
+    return {
+        'samples': int(len(X)),
+        'identical': bool(np.array_equal(expected, actual)),
+        'max_abs_diff': float(np.max(np.abs(expected - actual))) if len(X) else 0.0,
+        'label_mismatches': int(np.sum(np.argmax(expected, axis=1) != np.argmax(actual, axis=1)))
+    }
+
+
+def compile_forest(model, verify_samples: int = 256) -> Optional[CompiledForest]:
+    """Compile and self-check a forest; returns None if it cannot be used"""
+    try:
+        compiled = CompiledForest.from_sklearn(model)
+    except Exception as e:
+        print(f"[!] Forest compilation failed: {e}")
+        return None
+    if verify_samples:
+        report = verify_against_sklearn(model, compiled, sample_inputs(model, verify_samples))
+        if not report['identical']:
+            print(f"[!] Compiled forest differs from scikit-learn (max diff {report['max_abs_diff']:.3g})")
+            return None
+    return compiled
+
+
+def _time_single_row(predict, X: np.ndarray, repeats: int = 200) -> float:
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X)].reshape(1, -1)
+        start = time.perf_counter()
+        predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def _time_batch(predict, X: np.ndarray, repeats: int = 50) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a gesture RandomForest and verify it against scikit-learn")
+    parser.add_argument('model', nargs='?', default='gesture_classifier.pkl', help="Pickled RandomForestClassifier")
+    parser.add_argument('--data', help="Held-out feature matrix (.npy, or .npz with an 'X' array)")
+    parser.add_argument('--samples', type=int, default=2000, help="Random samples when --data is not given")
+    parser.add_argument('--chunk-size', type=int, default=16, help="Trees per early-exit chunk")
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+    print(f"[OK] Loaded {args.model}: {len(model.estimators_)} trees, {model.n_classes_} classes")
+
+    if args.data:
+        data = np.load(args.data)
+        X = data['X'] if hasattr(data, 'files') else data
+        if X.shape[1] != model.n_features_in_:
+            # Raw landmark dataset (gesture_landmarks.npz): derive the model's features
+            from gesture_features import LEGACY_FEATURE_SPEC, extract_features
+            X = extract_features(X, getattr(model, 'feature_spec_', LEGACY_FEATURE_SPEC))
+        print(f"[OK] Held-out set: {len(X)} samples from {args.data}")
+    else:
+        X = sample_inputs(model, args.samples)
+        print(f"[*] No held-out set given, using {len(X)} random samples")
+
+    start = time.perf_counter()
+    compiled = CompiledForest.from_sklearn(model)
+    print(f"[OK] Compiled in {(time.perf_counter() - start) * 1000:.0f}ms "
+          f"({len(compiled.feature)} nodes, {compiled.memory_bytes() / 1e6:.1f} MB, depth {compiled.max_depth})")
+
+    report = verify_against_sklearn(model, compiled, X)
+    print(f"[{'OK' if report['identical'] else 'ERR'}] Bit-for-bit identical: {report['identical']} "
+          f"(max abs diff {report['max_abs_diff']:.3g}, label mismatches {report['label_mismatches']})")
+
+    early_exit = EarlyExitForest(compiled, args.chunk_size, min_rows=0)
+    early_labels = np.argmax(early_exit.predict_proba(X), axis=1)
+    label_mismatches = int(np.sum(early_labels != np.argmax(compiled.predict_proba(X), axis=1)))
+    early_stats = early_exit.stats()
+    print(f"[{'OK' if label_mismatches == 0 else 'ERR'}] Early exit (chunks of {args.chunk_size}): "
+          f"{early_stats['avg_trees_evaluated']:.1f}/{compiled.n_estimators} trees on average, "
+          f"{early_stats['early_exit_rate'] * 100:.0f}% of rows exited early, label mismatches {label_mismatches}")
+
+    print(f"[*] Single-row latency (median): scikit-learn {_time_single_row(model.predict_proba, X):.2f}ms, "
+          f"compiled {_time_single_row(compiled.predict_proba, X):.2f}ms, "
+          f"early exit {_time_single_row(early_exit.predict_proba, X):.2f}ms")
+    batch = X[:64]
+    print(f"[*] 64-row batch latency (median): compiled {_time_batch(compiled.predict_proba, batch):.2f}ms, "
+          f"early exit {_time_batch(early_exit.predict_proba, batch):.2f}ms")
+    sys.exit(0 if report['identical'] and label_mismatches == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
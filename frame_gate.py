@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Frame-level deduplication and motion gating for streaming gesture sessions
+A cheap perceptual hash and motion energy decide whether a frame differs
+enough from the last processed one to be worth running hand detection on
+"""
+
+import threading
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+
+class FrameGateStats:
+    """Hit/miss counters shared by every session's gate"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+
+class FrameGate:
+    """Per-session gate comparing each frame with the last processed frame
+
+    A frame is "unchanged" when its 64-bit difference hash is within
+    `hamming_threshold` bits of the reference AND its motion energy - the
+    fraction of 32x24 grayscale thumbnail cells that moved by more than
+    `pixel_threshold` gray levels - is below `motion_threshold`. Counting
+    changed cells (rather than averaging) keeps a single moving finger from
+    being diluted by a static background. At most `max_reuse` consecutive
+    frames are skipped before detection is forced, so slow drift cannot go
+    unnoticed.
+    """
+
+    THUMB_SIZE = (32, 24)
+
+    def __init__(self, hamming_threshold: int = 3, motion_threshold: float = 0.002,
+                 pixel_threshold: int = 12, max_reuse: int = 8,
+                 stats: Optional[FrameGateStats] = None):
+        self.hamming_threshold = hamming_threshold
+        self.motion_threshold = motion_threshold
+        self.pixel_threshold = pixel_threshold
+        self.max_reuse = max_reuse
+        self.stats = stats or FrameGateStats()
+        self._reference_thumb = None
+        self._reference_hash = None
+        self._reused = 0
+        self.last_motion = 0.0
+        self.last_distance = 0
+
+    @classmethod
+    def _signature(cls, frame_rgb: np.ndarray):
+        thumb = cv2.resize(frame_rgb, cls.THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(thumb, cv2.COLOR_RGB2GRAY)
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        dhash = np.packbits(small[:, 1:] > small[:, :-1])
+        return gray.astype(np.int16), dhash
+
+    def is_unchanged(self, frame_rgb: np.ndarray) -> bool:
+        """True if the previous result can be reused for this frame"""
+        thumb, dhash = self._signature(frame_rgb)
+        unchanged = False
+        if self._reference_thumb is not None and self._reused < self.max_reuse:
+            self.last_distance = int(np.unpackbits(dhash ^ self._reference_hash).sum())
+            changed = np.abs(thumb - self._reference_thumb) > self.pixel_threshold
+            self.last_motion = float(changed.mean())
+            unchanged = (self.last_distance <= self.hamming_threshold
+                         and self.last_motion < self.motion_threshold)
+
+        if unchanged:
+            self._reused += 1
+        else:
+            self._reference_thumb, self._reference_hash = thumb, dhash
+            self._reused = 0
+        self.stats.record(unchanged)
+        return unchanged
+
+    def reset(self):
+        self._reference_thumb = None
+        self._reference_hash = None
+        self._reused = 0
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Server-driven adaptive frame-rate control for gesture streaming clients
+Every frame response carries the recommended delay before the next frame and
+the JPEG quality to encode it with, so clients back off under load
+"""
+
+import threading
+from typing import Dict
+
+
+class AdaptiveFrameController:
+    """Turns processing latency and queue depth into client pacing hints
+
+    pressure = frames in flight / worker count. The interval keeps each
+    client's own frames at `target_utilization` of the time it takes to
+    process one, and stretches proportionally once frames start queueing.
+    JPEG quality drops by `quality_step` per unit of excess pressure, so
+    overloaded servers also receive (and decode) smaller frames.
+    """
+
+    def __init__(self, workers: int = 1, min_interval_ms: float = 125.0, max_interval_ms: float = 1000.0,
+                 target_utilization: float = 0.8, base_quality: float = 0.7, min_quality: float = 0.4,
+                 quality_step: float = 0.1, smoothing: float = 0.2):
+        self.workers = max(1, workers)
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.target_utilization = target_utilization
+        self.base_quality = base_quality
+        self.min_quality = min_quality
+        self.quality_step = quality_step
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.latency_ms = 0.0
+
+    def begin(self):
+        """A frame was received (it may still wait for a worker)"""
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def end(self, latency_ms: float, session=None):
+        """A frame finished after latency_ms (queueing included)"""
+        with self._lock:
+            self.in_flight -= 1
+            self.latency_ms = self._smooth(self.latency_ms, latency_ms)
+        if session is not None:
+            session.latency_ms = self._smooth(session.latency_ms, latency_ms)
+
+    def _smooth(self, current: float, sample: float) -> float:
+        if current <= 0:
+            return sample
+        return (1 - self.smoothing) * current + self.smoothing * sample
+
+    def pressure(self) -> float:
+        return self.in_flight / self.workers
+
+    def recommend(self, session=None) -> Dict:
+        latency_ms = session.latency_ms if session is not None and session.latency_ms > 0 else self.latency_ms
+        pressure = self.pressure()
+        interval = max(self.min_interval_ms, latency_ms / self.target_utilization) * max(1.0, pressure)
+        interval = min(interval, self.max_interval_ms)
+        quality = self.base_quality - self.quality_step * max(0.0, pressure - 1.0)
+        return {
+            'next_frame_interval_ms': int(round(interval)),
+            'jpeg_quality': round(max(self.min_quality, quality), 2)
+        }
+
+    def stats(self, session=None) -> Dict:
+        with self._lock:
+            state = {
+                'workers': self.workers,
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'latency_ms': round(self.latency_ms, 1),
+                'min_interval_ms': self.min_interval_ms,
+                'max_interval_ms': self.max_interval_ms
+            }
+        state.update(self.recommend(session))
+        return state
@@ -14,6 +14,8 @@ import sys
 import io
 import base64
 
+from gesture_features import LEGACY_FEATURE_SPEC, extract_features
+
 # Set UTF-8 encoding
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -34,14 +36,13 @@ print("""
 landmarker = None
 gesture_model = None
 GESTURE_LABELS = []
+GESTURE_FEATURE_SPEC = LEGACY_FEATURE_SPEC
 models_loaded = False
+classifier_loaded = False
 
-def load_models():
-    """Load models only once when first request comes"""
-    global landmarker, gesture_model, GESTURE_LABELS, models_loaded
-    
-    if models_loaded:
-        return True
+def load_landmarker():
+    """Create this process's MediaPipe Hand Landmarker (not fork-safe: load after forking)"""
+    global landmarker
     
     try:
         # Import MediaPipe (only when needed)
@@ -63,6 +64,14 @@ def load_models():
     except Exception as e:
         print(f"[!] Hand Landmarker error: {e}")
         landmarker = None
+
+def load_classifier():
+    """Load the gesture classifier and labels (safe to preload before forking)"""
+    global gesture_model, GESTURE_LABELS, GESTURE_FEATURE_SPEC, classifier_loaded
+    
+    if classifier_loaded:
+        return
+    classifier_loaded = True
     
     try:
         # Load gesture classifier
@@ -70,6 +79,8 @@ def load_models():
         if os.path.exists("gesture_classifier.pkl"):
             with open("gesture_classifier.pkl", "rb") as f:
                 gesture_model = pickle.load(f)
+            # Models saved before feature specs existed were trained on raw landmarks
+            GESTURE_FEATURE_SPEC = getattr(gesture_model, 'feature_spec_', LEGACY_FEATURE_SPEC)
             
             # Load class labels
             try:
@@ -89,10 +100,40 @@ def load_models():
     except Exception as e:
         print(f"[!] Gesture Classifier error: {e}")
         gesture_model = None
+
+def load_models():
+    """Load models only once when first request comes"""
+    global models_loaded
     
+    if models_loaded:
+        return True
+    
+    load_landmarker()
+    load_classifier()
     models_loaded = True
     return landmarker is not None and gesture_model is not None
 
+# ========================================
+# PRE-FORK SERVING (GESTURE_SERVER=lite gunicorn -c gunicorn.conf.py wsgi:app)
+# ========================================
+def create_app():
+    """Application factory for WSGI servers: preloads the classifier in the master"""
+    load_classifier()
+    return app
+
+def prepare_for_fork():
+    """Master process, before each fork: no MediaPipe graph may cross the fork"""
+    global landmarker, models_loaded
+    if landmarker is not None:
+        landmarker.close()
+        landmarker = None
+    models_loaded = False
+
+def reinitialize_after_fork():
+    """Worker process, right after fork: its own Hand Landmarker"""
+    load_models()
+    print(f"[OK] Worker {os.getpid()} ready (landmarker: {landmarker is not None})")
+
 # ========================================
 # HEALTH CHECK
 # ========================================
@@ -176,10 +217,11 @@ def process_frame():
         landmarks_list = []
         for lm in landmarks:
             landmarks_list.extend([lm.x, lm.y, lm.z])
+        features = extract_features(landmarks_list, GESTURE_FEATURE_SPEC)
         
         # Predict gesture
-        prediction = gesture_model.predict([landmarks_list])
-        confidence = gesture_model.predict_proba([landmarks_list]).max()
+        prediction = gesture_model.predict(features)
+        confidence = gesture_model.predict_proba(features).max()
         
         gesture_label = GESTURE_LABELS[prediction[0]] if prediction[0] < len(GESTURE_LABELS) else "Unknown"
         
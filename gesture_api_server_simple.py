@@ -4,199 +4,539 @@
 Flask Server for Hand Gesture + Chatbot Integration with AccessAI
 Enhanced with NLP processing, sentiment analysis, and intent detection
 """
+import time
+_module_import_start = time.perf_counter()
+
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import cv2
 import numpy as np
 from werkzeug.utils import secure_filename
 import io
-from PIL import Image
-import PyPDF2
-from docx import Document
-from pptx import Presentation
 import os
 import tempfile
 import pickle
 import threading
-import time
+import gc
+import hmac
+from types import SimpleNamespace
+from collections import deque
 from pathlib import Path
 import sys
 import os
 
-# Try importing TensorFlow (optional)
-try:
-    import tensorflow as tf
-    TF_AVAILABLE = True
-except ImportError:
-    TF_AVAILABLE = False
-    print("[!] TensorFlow not available (optional)")
-
 # Set UTF-8 encoding
 if sys.stdout.encoding != 'utf-8':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-# Import NLP processor
+# WebSocket support for persistent frame streaming (optional)
 try:
-    from nlp_processor import create_nlp_processor
-    NLP_AVAILABLE = True
-    print("[✓] NLP processor imported successfully")
-except ImportError as e:
-    NLP_AVAILABLE = False
-    print(f"[!] NLP processor not available: {e}")
-
-# Import Argos Translator for local translation
-try:
-    from argos_translator import get_translator, init_translator
-    ARGOS_AVAILABLE = True
-    print("[✓] Argos Translate imported successfully")
-except ImportError as e:
-    ARGOS_AVAILABLE = False
-    print(f"[!] Argos Translate not available: {e}")
+    from flask_sock import Sock
+    SOCK_AVAILABLE = True
+except ImportError:
+    SOCK_AVAILABLE = False
+    print("[!] flask-sock not available - /api/stream disabled. Install: pip install flask-sock")
+
+from gesture_sessions import SessionManager
+from landmarker_pool import LandmarkerPool, TrackingLandmarkerPool
+from frame_decoder import FrameDecoder
+from roi_tracker import RoiTracker
+from frame_gate import FrameGate, FrameGateStats
+from frame_rate_controller import AdaptiveFrameController
+from gesture_batcher import BatchingClassifier
+from forest_engine import CompiledForest, EarlyExitForest, compile_forest
+from gesture_features import (LEGACY_FEATURE_SPEC, extract_features, extract_pair_features, feature_dim,
+                               landmarks_to_array, pair_order)
+from gesture_student import StudentClassifier
+from gesture_cascade import CascadeClassifier
+from gesture_prototypes import PrototypeClassifier
+from model_artifact import DEFAULT_LABELS, is_artifact, load_artifact, read_class_map, with_extra_labels
+from model_registry import ModelBundle, ModelRegistry
+from gesture_smoothing import GestureSmoother, StableLockStats
+from lazy_components import ComponentRegistry
 
 # MediaPipe imports - will be imported dynamically in process_frame_bytes
 
 app = Flask(__name__)
 CORS(app)
+sock = Sock(app) if SOCK_AVAILABLE else None
+
+# Pre-fork serving (wsgi.py + gunicorn.conf.py): this module is imported once in
+# the master, which must not start threads or MediaPipe graphs before forking
+PREFORK_SERVING = os.getenv('GESTURE_PREFORK') == '1'
+
+# Subsystems are imported and initialized on first use (or by warmup) instead of
+# at import, so the server accepts requests before NLP pipelines, Argos packages,
+# document parsers and the gesture model are loaded. Loaders are registered below
+components = ComponentRegistry()
+# Components loaded and warmed (run once on synthetic input) in the background
+# right after startup ('all', 'none' or a comma-separated list); a pre-forked
+# master loads them before forking, workers warm the landmarker after
+WARMUP_COMPONENTS = os.getenv('GESTURE_WARMUP_COMPONENTS', 'gesture,landmarker')
+# Components that must be warm before /api/ready answers 200 (always warmed too)
+READY_COMPONENTS = os.getenv('GESTURE_READY_COMPONENTS', WARMUP_COMPONENTS)
+ARGOS_INIT_TIMEOUT = float(os.getenv('ARGOS_INIT_TIMEOUT', '300'))  # Seconds the translate warm-up waits
+argos_init_thread = None
+
+
+def load_nlp_processor():
+    """NLP processor with optional Gemini API"""
+    from nlp_processor import create_nlp_processor
+    return create_nlp_processor(api_key=os.getenv('GEMINI_API_KEY'))
 
-# Initialize NLP processor with optional Gemini API
-nlp_processor = None
-if NLP_AVAILABLE:
-    gemini_key = os.getenv('GEMINI_API_KEY')
-    nlp_processor = create_nlp_processor(api_key=gemini_key)
-    print("[✓] NLP processor initialized")
 
-# Initialize Argos Translator (async initialization)
-translator = None
-if ARGOS_AVAILABLE:
-    try:
-        from argos_translator import init_translator
-        # Start initialization in background thread to avoid blocking Flask startup
-        def init_argos():
-            try:
-                init_translator()
-                print("[✓] Argos Translate initialized successfully")
-            except Exception as e:
-                print(f"[!] Argos Translate initialization failed: {e}")
-        
-        init_thread = threading.Thread(target=init_argos, daemon=True)
-        init_thread.start()
-        translator = get_translator()  # Get reference (will be initialized in background)
+def load_translator():
+    """Argos Translator; language packages are initialized in a background thread"""
+    global argos_init_thread
+    from argos_translator import get_translator, init_translator
+
+    def init_argos():
+        try:
+            init_translator()
+            print("[✓] Argos Translate initialized successfully")
+        except Exception as e:
+            print(f"[!] Argos Translate initialization failed: {e}")
+
+    if PREFORK_SERVING:
+        # Load once in the master; workers share the packages copy-on-write
+        init_argos()
+    else:
+        argos_init_thread = threading.Thread(target=init_argos, daemon=True)
+        argos_init_thread.start()
         print("[✓] Argos Translator background initialization started")
-    except Exception as e:
-        print(f"[!] Argos Translator import error: {e}")
-        translator = None
+    return get_translator()  # Get reference (will be initialized in background)
+
+
+def load_document_parsers():
+    """Readers for uploaded PDF, Word, PowerPoint and image files"""
+    import PyPDF2
+    from docx import Document
+    from PIL import Image
+    from pptx import Presentation
+    return SimpleNamespace(PdfReader=PyPDF2.PdfReader, Document=Document, Presentation=Presentation, Image=Image)
+
+
+def load_image_proxy():
+    """HTTP client used to proxy image generation requests"""
+    import requests
+    return requests
+
+
+def warm_nlp_processor(nlp):
+    """First calls build the NLTK / transformers pipelines"""
+    sample = "Warm-up: please translate this document for me, thanks!"
+    nlp.analyze_sentiment(sample)
+    nlp.detect_intent(sample)
+    nlp.extract_entities(sample)
+    nlp.extract_keywords(sample)
+
+
+def warm_translator(translator):
+    """Wait for the background package initialization"""
+    if argos_init_thread is not None:
+        argos_init_thread.join(ARGOS_INIT_TIMEOUT)
+    if not translator.initialized:
+        raise RuntimeError("Argos Translate packages not initialized")
+    translator.get_supported_languages()
+
+
+components.register('nlp', load_nlp_processor, imports=('nlp_processor',),
+                    description='Sentiment, intent, keywords, entities and Gemini responses',
+                    warmer=warm_nlp_processor)
+components.register('translate', load_translator, imports=('argos_translator',),
+                    description='Argos Translate offline translation', warmer=warm_translator)
+components.register('documents', load_document_parsers, imports=('PyPDF2', 'docx', 'pptx', 'PIL.Image'),
+                    description='Text extraction from uploaded files')
+components.register('image_proxy', load_image_proxy, imports=('requests',),
+                    description='Hugging Face and Z-Image generation proxy')
+
+
+def get_nlp_processor():
+    return components.get('nlp')
 
 # Global state
 latest_gesture = None
 latest_confidence = 0.0
 detection_active = False
-gesture_history = []
+# Detections from requests without a session (sessions keep their own history)
+gesture_history = deque(maxlen=50)
 cap = None
 hands = None
 mp_drawing = None
 
 # Performance optimization settings
-ENABLE_DETECTION_CACHING = False  # DISABLED - turned off to fix hand tracking
-ENABLE_CONFIDENCE_SMOOTHING = False  # DISABLED - turned off to fix hand tracking
-CONFIDENCE_SMOOTHING_BUFFER = 5
-last_detected_features_hash = None
-cached_prediction = None
-confidence_history = []
-FRAME_SKIP_INTERVAL = 2  # Process every Nth frame
-frame_counter = 0
-
-# Initialize MediaPipe Hand Landmarker once at startup
-print("[*] Initializing MediaPipe Hand Landmarker...")
+# Detection caching = per-session frame gate: frames that are effectively
+# unchanged (perceptual hash + motion energy) reuse the previous result
+ENABLE_DETECTION_CACHING = os.getenv('GESTURE_FRAME_GATE', '1') == '1'
+FRAME_GATE_HAMMING_THRESHOLD = int(os.getenv('GESTURE_GATE_HAMMING', '3'))
+FRAME_GATE_MOTION_THRESHOLD = float(os.getenv('GESTURE_GATE_MOTION', '0.002'))
+FRAME_GATE_PIXEL_THRESHOLD = int(os.getenv('GESTURE_GATE_PIXEL_DELTA', '12'))
+FRAME_GATE_MAX_REUSE = int(os.getenv('GESTURE_GATE_MAX_REUSE', '8'))
+frame_gate_stats = FrameGateStats()
+# Temporal smoothing: per-session, per-hand majority vote over the last few
+# predictions (requests without a session are not smoothed)
+ENABLE_CONFIDENCE_SMOOTHING = os.getenv('GESTURE_SMOOTHING', '1') == '1'
+CONFIDENCE_SMOOTHING_BUFFER = int(os.getenv('GESTURE_SMOOTHING_WINDOW', '5'))
+# Stable lock: a gesture held with high confidence is reused without running the
+# classifier while the hand's normalized landmarks stay within the tolerance
+ENABLE_STABLE_LOCK = os.getenv('GESTURE_STABLE_LOCK', '1') == '1'
+STABLE_LOCK_CONFIDENCE = float(os.getenv('GESTURE_LOCK_CONFIDENCE', '0.85'))
+STABLE_LOCK_FRAMES = int(os.getenv('GESTURE_LOCK_FRAMES', '3'))
+STABLE_LOCK_TOLERANCE = float(os.getenv('GESTURE_LOCK_TOLERANCE', '0.05'))
+STABLE_LOCK_MAX_FRAMES = int(os.getenv('GESTURE_LOCK_MAX_FRAMES', '30'))
+stable_lock_stats = StableLockStats()
+# Adaptive frame rate: every frame response tells the client when to send the
+# next frame and at which JPEG quality, based on latency and queue depth
+ADAPTIVE_MIN_INTERVAL_MS = float(os.getenv('GESTURE_MIN_FRAME_INTERVAL_MS', '125'))
+ADAPTIVE_MAX_INTERVAL_MS = float(os.getenv('GESTURE_MAX_FRAME_INTERVAL_MS', '1000'))
+
+# Frames are decoded straight at this scale (1/2, 1/4, 1/8 use libjpeg DCT scaling)
+FRAME_DECODE_SCALE = float(os.getenv('GESTURE_FRAME_SCALE', '0.5'))
+frame_decoder = FrameDecoder(scale=FRAME_DECODE_SCALE)
+
+# Streaming sessions (one per camera); idle sessions are evicted
+SESSION_IDLE_TIMEOUT = float(os.getenv('GESTURE_SESSION_IDLE_TIMEOUT', '60'))
+MAX_GESTURE_SESSIONS = int(os.getenv('GESTURE_MAX_SESSIONS', '64'))
+gesture_sessions = SessionManager(idle_timeout=SESSION_IDLE_TIMEOUT, max_sessions=MAX_GESTURE_SESSIONS)
+
+# MediaPipe Hand Landmarker pool: one IMAGE-mode instance per concurrent request
+print("[*] Initializing MediaPipe Hand Landmarker pool...")
 # Lazy load - only load when first request comes in
-landmarker = None
+LANDMARKER_POOL_SIZE = int(os.getenv('GESTURE_LANDMARKER_POOL_SIZE', str(os.cpu_count() or 2)))
+LANDMARKER_CHECKOUT_TIMEOUT = float(os.getenv('GESTURE_LANDMARKER_CHECKOUT_TIMEOUT', '5'))
+landmarker_pool = LandmarkerPool(size=LANDMARKER_POOL_SIZE)
+frame_controller = AdaptiveFrameController(workers=LANDMARKER_POOL_SIZE,
+                                           min_interval_ms=ADAPTIVE_MIN_INTERVAL_MS,
+                                           max_interval_ms=ADAPTIVE_MAX_INTERVAL_MS)
 LANDMARKER_INITIALIZED = False
 
 def init_landmarker():
-    global landmarker, LANDMARKER_INITIALIZED
+    """Create the first pooled landmarker; returns the pool, or None if unavailable"""
+    global LANDMARKER_INITIALIZED
     if LANDMARKER_INITIALIZED:
-        return landmarker
+        return landmarker_pool if landmarker_pool.available else None
     
-    try:
-        from mediapipe.tasks import python
-        from mediapipe.tasks.python import vision
-        
-        base_options = python.BaseOptions(model_asset_path="hand_landmarker.task")
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            running_mode=vision.RunningMode.IMAGE,
-            min_hand_detection_confidence=0.5,
-            min_hand_presence_confidence=0.5,
-            min_tracking_confidence=0.5,
-            num_hands=2
-        )
-        landmarker = vision.HandLandmarker.create_from_options(options)
-        LANDMARKER_INITIALIZED = True
-        print("[OK] Hand Landmarker initialized for dual-hand detection")
-    except Exception as e:
-        print(f"[ERR] Hand Landmarker initialization failed: {e}")
-        landmarker = None
-        LANDMARKER_INITIALIZED = True
+    if landmarker_pool.prime():
+        print(f"[OK] Hand Landmarker pool initialized for dual-hand detection (up to {landmarker_pool.size} instances)")
+    else:
+        print(f"[ERR] Hand Landmarker initialization failed: {landmarker_pool.error}")
+    LANDMARKER_INITIALIZED = True
     
-    return landmarker
-
-# Load ML models
-print("[*] Loading AI models...")
-gesture_model = None
+    return landmarker_pool if landmarker_pool.available else None
+
+def load_landmarker():
+    pool = init_landmarker()
+    if pool is None:
+        raise RuntimeError(landmarker_pool.error or "Hand Landmarker not available")
+    return pool
+
+def warm_landmarker(pool):
+    """Blank frame at the decode scale: the first detect() allocates MediaPipe's graph buffers"""
+    _run_landmarker(np.zeros((int(480 * FRAME_DECODE_SCALE), int(640 * FRAME_DECODE_SCALE), 3), dtype=np.uint8))
+
+# Loaded on the first frame or by warmup; never in a pre-fork master
+components.register('landmarker', load_landmarker, imports=('mediapipe',),
+                    description='MediaPipe Hand Landmarker pool', warmer=warm_landmarker)
+
+# Streaming sessions get their own VIDEO-mode landmarker so MediaPipe tracks
+# hands between frames and skips palm detection; sessions beyond the pool
+# size fall back to the shared IMAGE-mode landmarker
+ENABLE_HAND_TRACKING = os.getenv('GESTURE_HAND_TRACKING', '1') == '1'
+MAX_TRACKING_LANDMARKERS = int(os.getenv('GESTURE_MAX_TRACKING_LANDMARKERS', '8'))
+tracking_landmarkers = TrackingLandmarkerPool(max_instances=MAX_TRACKING_LANDMARKERS)
+
+def get_session_detector(session):
+    """Return the tracking landmarker for a session, leasing one on first use
+
+    Called with session.lock held, so a concurrent close() cannot release
+    the tracker mid-frame, and a closed session never leases a new one.
+    """
+    if session is None or not ENABLE_HAND_TRACKING or session.closed:
+        return None
+    if session.tracker is None:
+        session.tracker = tracking_landmarkers.acquire()
+    return session.tracker
+
+def _run_landmarker(frame_rgb, detector=None):
+    from mediapipe import Image as MPImage, ImageFormat
+
+    mp_image = MPImage(image_format=ImageFormat.SRGB, data=frame_rgb)
+    if detector is not None:
+        return detector.detect(mp_image)
+    with landmarker_pool.checkout(timeout=LANDMARKER_CHECKOUT_TIMEOUT) as pooled_landmarker:
+        return pooled_landmarker.detect(mp_image)
+
+# Sessions without a tracking landmarker crop each frame around the hands
+# found in their previous frame (VIDEO-mode trackers already do this internally)
+ENABLE_ROI_TRACKING = os.getenv('GESTURE_ROI_TRACKING', '1') == '1'
+ROI_PADDING = float(os.getenv('GESTURE_ROI_PADDING', '0.3'))
+ROI_REFRESH_INTERVAL = int(os.getenv('GESTURE_ROI_REFRESH_INTERVAL', '15'))
+
+def detect_hands(frame_rgb, session=None):
+    """Run hand landmark detection with the session's tracker or a pooled landmarker"""
+    detector = get_session_detector(session)
+    if detector is not None or session is None or not ENABLE_ROI_TRACKING:
+        return _run_landmarker(frame_rgb, detector)
+
+    if session.roi is None:
+        session.roi = RoiTracker(padding=ROI_PADDING, refresh_interval=ROI_REFRESH_INTERVAL)
+    roi = session.roi
+    box = roi.region(frame_rgb.shape)
+    if box is not None:
+        results = _run_landmarker(RoiTracker.crop(frame_rgb, box))
+        if results.hand_landmarks:
+            RoiTracker.map_to_frame(results.hand_landmarks, box, frame_rgb.shape)
+            roi.update(results.hand_landmarks, frame_rgb.shape, used_crop=True)
+            return results
+        roi.mark_lost()
+
+    results = _run_landmarker(frame_rgb)
+    roi.update(results.hand_landmarks, frame_rgb.shape, used_crop=False)
+    return results
+
+# Gesture model settings; the model is loaded by the 'gesture' component
 GESTURE_LABELS = []
+GESTURE_FEATURE_SPEC = LEGACY_FEATURE_SPEC
+
+# Preferred: a memory-mapped artifact directory written by model_artifact.py
+# (manifest with version, labels and feature spec; pages shared across workers)
+GESTURE_MODEL_ARTIFACT = os.getenv('GESTURE_MODEL_ARTIFACT', os.path.join('models', 'gesture_classifier'))
+# Serving model: 'forest' (default) or 'student', a compact model distilled
+# from the forest with distill_gesture_model.py that carries its own label names
+GESTURE_SERVING_MODEL = os.getenv('GESTURE_SERVING_MODEL', 'forest').lower()
+GESTURE_STUDENT_PATH = os.getenv('GESTURE_STUDENT_PATH', 'gesture_student.npz')
+# 'cascade' serves the two-stage artifact from train_cascade_classifier.py: a small
+# router forest over gesture groups plus specialists for the confusable groups
+GESTURE_CASCADE_ARTIFACT = os.getenv('GESTURE_CASCADE_ARTIFACT', os.path.join('models', 'gesture_cascade'))
+# 'prototype' serves nearest-prototype search over per-gesture k-means centroids
+# (train_prototype_classifier.py): tens of KB and a few microseconds per hand
+GESTURE_PROTOTYPE_ARTIFACT = os.getenv('GESTURE_PROTOTYPE_ARTIFACT', os.path.join('models', 'gesture_prototypes'))
+SERVING_MODEL_ARTIFACTS = {'cascade': GESTURE_CASCADE_ARTIFACT, 'prototype': GESTURE_PROTOTYPE_ARTIFACT}
+# Inference engine for pickled forests: 'compiled' flattens the RandomForest into
+# NumPy arrays (verified bit-for-bit against scikit-learn at startup), 'sklearn' uses it as is
+GESTURE_INFERENCE_ENGINE = os.getenv('GESTURE_INFERENCE_ENGINE', 'compiled').lower()
+
+if GESTURE_SERVING_MODEL in SERVING_MODEL_ARTIFACTS:
+    serving_artifact = SERVING_MODEL_ARTIFACTS[GESTURE_SERVING_MODEL]
+    if is_artifact(serving_artifact):
+        # Loaded (and hot-reloaded) through the regular artifact path below
+        GESTURE_MODEL_ARTIFACT = serving_artifact
+    else:
+        print(f"[!] {GESTURE_SERVING_MODEL.capitalize()} artifact not found ({serving_artifact}), "
+              f"serving the forest instead")
+
+# Early exit: compiled forests stop adding trees once a row's winning class can
+# no longer change, so labels always match the full forest, but confidences of
+# early-exited rows are means over fewer trees and can differ from it (which
+# moves GESTURE_JOINT_MIN_CONFIDENCE / smoothing decisions). Each chunk costs a
+# full traversal, so batches smaller than GESTURE_EARLY_EXIT_MIN_ROWS use the
+# single-pass evaluation. Off by default: live traffic batches 1-2 rows, where
+# the single pass is faster; it helps large offline batches only
+ENABLE_EARLY_EXIT = os.getenv('GESTURE_EARLY_EXIT', '0') == '1'
+EARLY_EXIT_CHUNK = int(os.getenv('GESTURE_EARLY_EXIT_CHUNK', '16'))  # Trees per margin check
+EARLY_EXIT_MIN_ROWS = int(os.getenv('GESTURE_EARLY_EXIT_MIN_ROWS', '32'))
+
+
+def serving_model(model):
+    """Wrap compiled forests for early exit; other models are served as they are"""
+    if ENABLE_EARLY_EXIT and isinstance(model, CompiledForest):
+        return EarlyExitForest(model, chunk_size=EARLY_EXIT_CHUNK, min_rows=EARLY_EXIT_MIN_ROWS)
+    return model
+
+
+# Micro-batch classifier calls from all hands and concurrent requests
+CLASSIFIER_BATCH_WINDOW_MS = float(os.getenv('GESTURE_BATCH_WINDOW_MS', '2'))
+CLASSIFIER_MAX_BATCH = int(os.getenv('GESTURE_BATCH_MAX_ROWS', '64'))
+# A pre-fork master classifies synchronously (window 0, no gesture-batcher
+# thread before the fork); workers get a batching one in reinitialize_after_fork()
+gesture_classifier = BatchingClassifier(None, window_ms=0 if PREFORK_SERVING else CLASSIFIER_BATCH_WINDOW_MS,
+                                        max_batch=CLASSIFIER_MAX_BATCH)
+
+# Hot reload: new artifacts are loaded and warmed in the background, then swapped
+# in atomically; requests keep the model snapshot they started with
+GESTURE_MODEL_WATCH_INTERVAL = float(os.getenv('GESTURE_MODEL_WATCH_INTERVAL', '5'))  # Seconds, 0 = off
+GESTURE_MODEL_WARMUP_SAMPLES = int(os.getenv('GESTURE_MODEL_WARMUP_SAMPLES', '16'))
+GESTURE_ADMIN_TOKEN = os.getenv('GESTURE_ADMIN_TOKEN')  # /api/model/reload is disabled unless set
+# /api/model/reload only accepts artifact paths inside this directory
+GESTURE_MODELS_DIR = os.getenv('GESTURE_MODELS_DIR', os.path.dirname(os.path.abspath(GESTURE_MODEL_ARTIFACT)))
+
+
+def gesture_model_installed(bundle):
+    """A server that started without a usable model becomes ready once one is installed"""
+    components.component('gesture').retry_warm()
+
+
+model_registry = ModelRegistry(GESTURE_MODEL_ARTIFACT, warmup_samples=GESTURE_MODEL_WARMUP_SAMPLES,
+                               model_wrapper=serving_model, on_install=gesture_model_installed)
+
+# Optional two-hand model: an artifact trained on both hands' features side by
+# side, left hand first (train_joint_gesture_classifier.py). Two-hand frames try
+# it first and fall back to per-hand gestures below GESTURE_JOINT_MIN_CONFIDENCE
+GESTURE_JOINT_ARTIFACT = os.getenv('GESTURE_JOINT_ARTIFACT', os.path.join('models', 'gesture_joint'))
+GESTURE_JOINT_MIN_CONFIDENCE = float(os.getenv('GESTURE_JOINT_MIN_CONFIDENCE', '0.6'))
+joint_model = None
+
+
+def load_gesture_model():
+    """Load, compile, warm up and install the gesture classifier; returns the model registry"""
+    global GESTURE_LABELS, GESTURE_FEATURE_SPEC
+    print("[*] Loading gesture model...")
+    gesture_model = None
+    gesture_model_version = None
+    gesture_model_source = None
+    active_inference_engine = 'sklearn'
+
+    if GESTURE_SERVING_MODEL == 'student':
+        try:
+            gesture_model = StudentClassifier.load(GESTURE_STUDENT_PATH)
+            GESTURE_LABELS = with_extra_labels(gesture_model.labels or DEFAULT_LABELS)
+            GESTURE_FEATURE_SPEC = gesture_model.feature_spec_
+            active_inference_engine = 'student'
+            gesture_model_source = GESTURE_STUDENT_PATH
+            details = gesture_model.describe()
+            print(f"[OK] Student model loaded: {details['type']}, {details['hidden_units']} hidden units, "
+                  f"{details['memory_bytes'] / 1e3:.0f} KB")
+        except Exception as e:
+            print(f"[!] Student model not available ({GESTURE_STUDENT_PATH}): {e}")
+            print("[!] Serving the forest instead")
 
-# Try to load improved gesture classifier first (1-6, A-Z comprehensive)
-try:
-    # First try comprehensive model (all 32 classes)
-    comprehensive_model_exists = os.path.exists("gesture_classifier_comprehensive.pkl")
-    model_file = "gesture_classifier_comprehensive.pkl" if comprehensive_model_exists else "gesture_classifier.pkl"
-    
-    if os.path.exists(model_file):
-        with open(model_file, "rb") as f:
-            gesture_model = pickle.load(f)
-        model_type = "Comprehensive (32 classes: 1-6, A-Z)" if comprehensive_model_exists else "Improved"
-        print(f"[OK] {model_type} Gesture Classifier loaded successfully")
-        
-        # Load class mapping if available
+    if gesture_model is None and is_artifact(GESTURE_MODEL_ARTIFACT):
         try:
-            class_map_file = "gesture_class_map_comprehensive.pkl" if comprehensive_model_exists else "gesture_class_map.pkl"
-            with open(class_map_file, "rb") as f:
-                class_map = pickle.load(f)
-                # Convert dict {0: '1', 1: '2', ...} to list ['1', '2', ...]
-                if isinstance(class_map, dict):
-                    GESTURE_LABELS = [class_map[i] for i in sorted(class_map.keys())]
-                else:
-                    GESTURE_LABELS = class_map
-            print(f"[OK] Class mapping loaded: {len(GESTURE_LABELS)} classes")
-            print(f"[OK] Classes: {', '.join(GESTURE_LABELS)}")
-        except Exception as map_err:
-            print(f"[!] Class mapping failed: {map_err}")
-            GESTURE_LABELS = list("123456") + list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-    else:
-        print(f"[!] gesture_classifier.pkl not found - gesture recognition disabled")
-        gesture_model = None
-except Exception as e:
-    print(f"[!] Improved model not available: {e}")
-    # Fall back to Indian gesture classifier
-    try:
-        if os.path.exists("indian_gesture_classifier.pkl"):
-            with open("indian_gesture_classifier.pkl", "rb") as f:
-                gesture_model = pickle.load(f)
-            print("[OK] Fallback: Indian Gesture Classifier loaded successfully")
-            GESTURE_LABELS = list("123456789") + list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+            load_start = time.time()
+            artifact = load_artifact(GESTURE_MODEL_ARTIFACT)
+            gesture_model = artifact.model
+            GESTURE_LABELS = artifact.labels
+            GESTURE_FEATURE_SPEC = artifact.feature_spec
+            gesture_model_version = artifact.manifest['version']
+            gesture_model_source = os.path.abspath(GESTURE_MODEL_ARTIFACT)
+            active_inference_engine = ('compiled' if artifact.manifest['model_type'] == 'compiled_forest'
+                                       else artifact.manifest['model_type'])
+            print(f"[OK] Gesture model {gesture_model_version} ({artifact.manifest['model_type']}) memory-mapped "
+                  f"from {GESTURE_MODEL_ARTIFACT} in {(time.time() - load_start) * 1000:.0f}ms")
+            if isinstance(gesture_model, CascadeClassifier):
+                details = gesture_model.describe()
+                print(f"[OK] Cascade: {details['groups']} groups, {details['specialists']} specialists, "
+                      f"router accepts at {details['accept_threshold']:.2f}")
+            elif isinstance(gesture_model, PrototypeClassifier):
+                details = gesture_model.describe()
+                print(f"[OK] Prototypes: {details['prototypes']} in {details['dimensions']} dimensions, "
+                      f"{details['index']} search")
+        except Exception as e:
+            print(f"[!] Model artifact {GESTURE_MODEL_ARTIFACT} unusable: {e}")
+            gesture_model = None
+
+    if gesture_model is None:
+        # Legacy pickles: comprehensive model (1-6, A-Z), then the improved one,
+        # then the Indian gesture classifier
+        for model_file, class_map_file, fallback_labels in (
+            ("gesture_classifier_comprehensive.pkl", "gesture_class_map_comprehensive.pkl", DEFAULT_LABELS),
+            ("gesture_classifier.pkl", "gesture_class_map.pkl", DEFAULT_LABELS),
+            ("indian_gesture_classifier.pkl", None, list("123456789") + list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")),
+        ):
+            if not os.path.exists(model_file):
+                continue
+            try:
+                with open(model_file, "rb") as f:
+                    gesture_model = pickle.load(f)
+            except Exception as e:
+                print(f"[!] {model_file} could not be loaded: {e}")
+                continue
+            print(f"[OK] Gesture classifier loaded from {model_file}")
+            gesture_model_source = model_file
+            print(f"[*] Export it with model_artifact.py for near-instant, shared-memory loading")
+
+            labels = fallback_labels
+            if class_map_file:
+                try:
+                    labels = read_class_map(class_map_file)
+                    print(f"[OK] Class mapping loaded: {len(labels)} classes")
+                except Exception as map_err:
+                    print(f"[!] Class mapping failed: {map_err}")
+            GESTURE_LABELS = with_extra_labels(labels)
+            # Models saved before feature specs existed were trained on raw landmarks
+            GESTURE_FEATURE_SPEC = getattr(gesture_model, 'feature_spec_', LEGACY_FEATURE_SPEC)
+            break
         else:
-            raise FileNotFoundError("No gesture model found")
-    except Exception as e2:
-        print(f"[!] Model loading failed: {e2}")
-        print("[!] Server will run without gesture recognition")
-        gesture_model = None
-        GESTURE_LABELS = list("123456789") + list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-
-# Ensure LOVE_YOU is included
-GESTURE_LABELS_LIST = list(GESTURE_LABELS) if not isinstance(GESTURE_LABELS, list) else GESTURE_LABELS
-if "LOVE_YOU" not in GESTURE_LABELS_LIST:
-    GESTURE_LABELS_LIST.append("LOVE_YOU")
-GESTURE_LABELS = GESTURE_LABELS_LIST
+            print(f"[!] No gesture model found - gesture recognition disabled")
+            GESTURE_LABELS = with_extra_labels(list("123456789") + list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+        if gesture_model is not None and GESTURE_INFERENCE_ENGINE == 'compiled' and hasattr(gesture_model, 'estimators_'):
+            compile_start = time.time()
+            compiled_model = compile_forest(gesture_model)
+            if compiled_model is not None:
+                gesture_model = compiled_model
+                active_inference_engine = 'compiled'
+                print(f"[OK] Compiled forest engine ready ({compiled_model.n_estimators} trees, "
+                      f"{compiled_model.memory_bytes() / 1e6:.1f} MB) in {(time.time() - compile_start) * 1000:.0f}ms")
+            else:
+                print("[!] Falling back to scikit-learn inference")
+
+    if gesture_model is not None:
+        gesture_model = serving_model(gesture_model)
+        if isinstance(gesture_model, EarlyExitForest):
+            print(f"[OK] Early-exit forest inference enabled (margin check every {EARLY_EXIT_CHUNK} trees, "
+                  f"batches of {EARLY_EXIT_MIN_ROWS}+ rows)")
+        print(f"[OK] Classes: {', '.join(GESTURE_LABELS)}")
+        print(f"[OK] Gesture feature spec: {GESTURE_FEATURE_SPEC}")
+
+    if gesture_model is not None:
+        try:
+            model_registry.install(ModelBundle(
+                model=gesture_model,
+                labels=GESTURE_LABELS,
+                feature_spec=GESTURE_FEATURE_SPEC,
+                version=gesture_model_version,
+                engine=active_inference_engine,
+                source=gesture_model_source,
+                loaded_at=time.time()
+            ))
+            print(f"[OK] Gesture model warmed up ({GESTURE_MODEL_WARMUP_SAMPLES} synthetic predictions)")
+        except Exception as e:
+            print(f"[!] Gesture model failed warm-up, gesture recognition disabled: {e}")
+    if not PREFORK_SERVING:
+        # Pre-forked workers start their own watcher in reinitialize_after_fork()
+        model_registry.watch(GESTURE_MODEL_WATCH_INTERVAL)
+    return model_registry
+
+
+def load_joint_model():
+    """Optional two-hand model; None without a usable artifact"""
+    global joint_model
+    if is_artifact(GESTURE_JOINT_ARTIFACT):
+        try:
+            joint_model = load_artifact(GESTURE_JOINT_ARTIFACT)
+            expected_features = 2 * feature_dim(joint_model.feature_spec)
+            if joint_model.model.n_features_in_ != expected_features:
+                raise ValueError(f"model takes {joint_model.model.n_features_in_} features, "
+                                 f"a hand pair gives {expected_features}")
+            print(f"[OK] Two-hand model {joint_model.manifest['version']} loaded "
+                  f"({len(joint_model.model.classes_)} signs, {expected_features} features)")
+        except Exception as e:
+            print(f"[!] Two-hand model {GESTURE_JOINT_ARTIFACT} unusable: {e}")
+            joint_model = None
+    return joint_model
+
+
+def load_gesture_component():
+    registry = load_gesture_model()
+    load_joint_model()
+    return registry
+
+
+def warm_gesture_component(registry):
+    """Synthetic hands through feature extraction, the micro-batcher and both models"""
+    if registry.active is None:
+        raise RuntimeError("no gesture model loaded")
+    hands = np.random.default_rng(0).random((2, 21, 3))
+    predict_gestures(hands)
+    if joint_model is not None:
+        gesture_classifier.predict_proba(extract_pair_features(hands[np.newaxis], joint_model.feature_spec),
+                                         model=joint_model.model)
+
+
+components.register('gesture', load_gesture_component,
+                    description='Gesture classifier (model artifact or pickles) and optional two-hand model',
+                    warmer=warm_gesture_component)
 
 # Chatbot responses
 CHATBOT_RESPONSES = {
@@ -241,14 +581,13 @@ CHATBOT_RESPONSES = {
 }
 
 def normalize_landmarks(landmarks):
-    """Extract features from landmarks (no normalization needed for RandomForest)"""
-    if landmarks is None:
+    """Model features for one hand's MediaPipe landmarks (spec the active model was trained with)"""
+    bundle = model_registry.active
+    if landmarks is None or bundle is None:
         return None
     try:
-        features = []
-        for lm in landmarks:
-            features.extend([lm.x, lm.y, lm.z])
-        return np.array(features)
+        raw = np.array([[lm.x, lm.y, lm.z] for lm in landmarks])
+        return extract_features(raw, bundle.feature_spec)[0]
     except Exception as e:
         print(f"Error extracting features: {e}")
         return None
@@ -261,137 +600,282 @@ def get_features_hash(features):
     rounded = np.round(features, 3)
     return hash(tuple(rounded.flatten()))
 
-def smooth_confidence(confidence, buffer_size=CONFIDENCE_SMOOTHING_BUFFER):
-    """Apply exponential moving average to confidence scores"""
-    global confidence_history
-    if not ENABLE_CONFIDENCE_SMOOTHING:
-        return confidence
-    
-    confidence_history.append(confidence)
-    if len(confidence_history) > buffer_size:
-        confidence_history.pop(0)
+def hand_key(results, hand_idx, used_keys):
+    """Stable per-frame key for a hand: its handedness, falling back to its index"""
+    key = f"hand{hand_idx}"
+    handedness = getattr(results, 'handedness', None)
+    if handedness and hand_idx < len(handedness) and handedness[hand_idx]:
+        key = handedness[hand_idx][0].category_name
+    if key in used_keys:
+        key = f"{key}{hand_idx}"
+    used_keys.add(key)
+    return key
+
+def get_session_smoother(session, key):
+    """The session's GestureSmoother for one hand, or None when smoothing does not apply"""
+    if session is None or not ENABLE_CONFIDENCE_SMOOTHING:
+        return None
+    smoother = session.smoothers.get(key)
+    if smoother is None:
+        smoother = GestureSmoother(window=CONFIDENCE_SMOOTHING_BUFFER, lock_enabled=ENABLE_STABLE_LOCK,
+                                   lock_confidence=STABLE_LOCK_CONFIDENCE, lock_frames=STABLE_LOCK_FRAMES,
+                                   lock_tolerance=STABLE_LOCK_TOLERANCE, max_lock_frames=STABLE_LOCK_MAX_FRAMES,
+                                   stats=stable_lock_stats)
+        session.smoothers[key] = smoother
+    return smoother
+
+def predict_gestures(features_batch):
+    """Predict gestures for an (n_hands, 21, 3) or (n_hands, 63) raw landmark array in one classifier call.
+
+    Rows are converted with the model's feature spec first. Returns a list of
+    (gesture, confidence) pairs, one per row. The label is the argmax of
+    predict_proba, so the forest is traversed once per batch. Features,
+    model and labels all come from one registry snapshot, so a model swap
+    mid-request cannot mix versions.
+    """
+    bundle = model_registry.active
+    if bundle is None or features_batch is None or len(features_batch) == 0:
+        return []
     
-    # Return exponential moving average
-    if len(confidence_history) == 0:
-        return confidence
-    weights = np.exp(np.linspace(-1, 0, len(confidence_history)))
-    weights /= weights.sum()
-    return float(np.sum(np.array(confidence_history) * weights))
-
-def reduce_frame_resolution(frame_array, scale_factor=0.6):
-    """Reduce frame resolution for faster processing"""
     try:
-        height, width = frame_array.shape[:2]
-        new_width = int(width * scale_factor)
-        new_height = int(height * scale_factor)
-        resized = cv2.resize(frame_array, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
-        return resized, (scale_factor, scale_factor)
+        model_features = extract_features(features_batch, bundle.feature_spec)
+        probabilities = gesture_classifier.predict_proba(model_features, model=bundle.model)
+        best = np.argmax(probabilities, axis=1)
+        predictions = bundle.model.classes_[best]
+        return [
+            (bundle.labels[int(prediction)], float(probabilities[row, column]))
+            for row, (prediction, column) in enumerate(zip(predictions, best))
+        ]
     except Exception as e:
-        print(f"Error reducing frame resolution: {e}")
-        return frame_array, (1.0, 1.0)
+        print(f"Error predicting: {e}")
+        return [(None, 0.0)] * len(features_batch)
 
-def predict_gesture(landmarks):
-    """Predict gesture using RandomForest classifier"""
-    if gesture_model is None or landmarks is None:
-        return None, 0.0
-    
+def handedness_names(results):
+    """MediaPipe's Left/Right label per detected hand (None when it did not report them)"""
+    handedness = getattr(results, 'handedness', None)
+    if not handedness or len(handedness) != len(results.hand_landmarks) or not all(handedness):
+        return None
+    return [categories[0].category_name for categories in handedness]
+
+def predict_joint_gesture(results, hands):
+    """(gesture, confidence) from the two-hand model, or None if it is missing or not confident enough"""
+    if joint_model is None:
+        return None
     try:
-        features = landmarks.reshape(1, -1)
-        prediction = gesture_model.predict(features)[0]
-        probabilities = gesture_model.predict_proba(features)[0]
-        confidence = float(np.max(probabilities))
-        gesture = GESTURE_LABELS[int(prediction)]
-        return gesture, confidence
+        pair = hands[pair_order(hands, handedness_names(results))]
+        features = extract_pair_features(pair, joint_model.feature_spec)
+        probabilities = gesture_classifier.predict_proba(features, model=joint_model.model)[0]
+        best = int(np.argmax(probabilities))
+        confidence = float(probabilities[best])
+        if confidence < GESTURE_JOINT_MIN_CONFIDENCE:
+            return None
+        return joint_model.labels[int(joint_model.model.classes_[best])], confidence
     except Exception as e:
-        print(f"Error predicting: {e}")
+        print(f"Error predicting two-hand gesture: {e}")
+        return None
+
+def predict_gesture(landmarks):
+    """Predict gesture for a single hand's 63-feature vector"""
+    if landmarks is None:
         return None, 0.0
+    predictions = predict_gestures(np.asarray(landmarks).reshape(1, -1))
+    return predictions[0] if predictions else (None, 0.0)
+
+# Content types accepted as a raw (non-JSON) frame body
+BINARY_FRAME_CONTENT_TYPES = ('application/octet-stream', 'image/jpeg', 'image/png', 'image/webp')
+MIN_FRAME_BYTES = 50
+
+def decode_json_frame(data):
+    """Decode the base64 'frame' field (optionally a data URI) of a JSON frame message
+
+    Returns (frame_bytes, error_message); exactly one of them is None.
+    """
+    import base64
+    import binascii
+
+    if not isinstance(data, dict):
+        return None, 'JSON frame message must be an object'
+    frame_data = data.get('frame')
+    if not frame_data:
+        return None, 'No frame data in JSON'
+    if not isinstance(frame_data, str):
+        return None, 'Frame data must be a base64 string'
+    if frame_data.startswith('data:'):
+        frame_data = frame_data.split(',', 1)[-1]
+    try:
+        return base64.b64decode(frame_data), None
+    except (binascii.Error, ValueError):
+        return None, 'Frame data is not valid base64'
+
+def read_frame_from_request():
+    """Extract raw encoded image bytes from the current request.
+
+    Supports three transports:
+      - raw body with Content-Type application/octet-stream or image/*
+      - multipart/form-data with the image in the 'frame' file field
+      - JSON body {"frame": "<base64>"} (legacy, optionally a data URI)
+
+    Returns (frame_bytes, error_message); exactly one of them is None.
+    """
+    content_type = (request.mimetype or '').lower()
+
+    if content_type in BINARY_FRAME_CONTENT_TYPES:
+        frame_bytes = request.get_data(cache=False)
+    elif content_type == 'multipart/form-data':
+        upload = request.files.get('frame')
+        if upload is None:
+            return None, "No 'frame' file in multipart body"
+        frame_bytes = upload.read()
+    elif request.is_json:
+        data = request.get_json(force=True, silent=True)
+        if data is None:
+            return None, 'No JSON data'
+        frame_bytes, error = decode_json_frame(data)
+        if error:
+            return None, error
+    else:
+        return None, 'Content-Type must be application/json, application/octet-stream, image/* or multipart/form-data'
+
+    if len(frame_bytes) < MIN_FRAME_BYTES:
+        return None, 'Frame data too small'
+    return frame_bytes, None
+
+def get_request_session():
+    """Return the streaming session named by the request, if any.
+
+    Clients link consecutive frames with an X-Session-Id header or a
+    session_id query parameter; unknown ids create a new session.
+    """
+    session_id = request.headers.get('X-Session-Id') or request.args.get('session_id')
+    if not session_id:
+        return None
+    return gesture_sessions.get_or_create(session_id)
 
-def process_frame_bytes(frame_bytes):
-    """Process frame bytes and detect gesture"""
-    global latest_gesture, latest_confidence, gesture_history
+def build_frame_result(gesture, confidence, landmark_points, session=None):
+    """Response payload shared by the HTTP and WebSocket frame endpoints"""
+    result = {
+        'status': 'success',
+        'gesture': gesture,
+        'confidence': float(confidence) if confidence else 0,
+        'landmarks': landmark_points
+    }
+    result.update(frame_controller.recommend(session))
+    if session is not None:
+        result['session_id'] = session.session_id
+    return result
+
+def process_frame_bytes(frame_bytes, session=None):
+    """Process encoded image bytes (JPEG/PNG) and detect gesture
+
+    When a streaming session is given, its frames are processed in order
+    and the session keeps the latest result.
+    """
+    frame_controller.begin()
+    start = time.perf_counter()
+    try:
+        if session is not None:
+            with session.lock:
+                result = _process_frame_bytes(frame_bytes, session)
+                session.record_result(result)
+                return result
+        return _process_frame_bytes(frame_bytes, session)
+    finally:
+        frame_controller.end((time.perf_counter() - start) * 1000, session)
+
+def _process_frame_bytes(frame_bytes, session=None):
+    global latest_gesture, latest_confidence
     
     start_time = time.time()
     
-    # Initialize landmarker on first use
-    current_landmarker = init_landmarker()
-    
-    if current_landmarker is None:
+    # Load the gesture model and the landmarker pool on first use
+    components.get('gesture')
+    if components.get('landmarker') is None:
         print("[!] Landmarker not available")
         return None, 0, None
     
     try:
-        # Decode frame
-        import base64
-        import io
-        from PIL import Image
-
-        # Decode base64 frame
-        decode_start = time.time()
-        frame_data = base64.b64decode(frame_bytes)
-        image = Image.open(io.BytesIO(frame_data))
-        decode_time = time.time() - decode_start
+        # Decode frame directly at the processing scale into an RGB buffer
+        decoded = frame_decoder.decode(frame_bytes)
+        if decoded is None:
+            print("[ERR] Frame could not be decoded as an image")
+            return None, 0, []
+        frame_rgb = decoded.rgb
+
+        # Skip detection entirely when the session's frame has not changed
+        if session is not None and ENABLE_DETECTION_CACHING:
+            if session.gate is None:
+                session.gate = FrameGate(hamming_threshold=FRAME_GATE_HAMMING_THRESHOLD,
+                                         motion_threshold=FRAME_GATE_MOTION_THRESHOLD,
+                                         pixel_threshold=FRAME_GATE_PIXEL_THRESHOLD,
+                                         max_reuse=FRAME_GATE_MAX_REUSE, stats=frame_gate_stats)
+            if session.gate.is_unchanged(frame_rgb) and session.last_result is not None:
+                return session.last_result
 
         gesture_detected = None
         confidence_val = 0
         landmark_points = []  # Default to empty list, not None
 
-        # Get hand landmarks using pre-initialized MediaPipe landmarker
+        # Get hand landmarks using a pooled (or session tracking) MediaPipe landmarker
         try:
-            from mediapipe import Image as MPImage, ImageFormat
-
-            frame_array = np.array(image)
-            
-            # Optimize: Reduce frame resolution for faster processing
-            frame_array, scale_factor = reduce_frame_resolution(frame_array, scale_factor=0.6)
-            
-            frame_rgb = cv2.cvtColor(frame_array, cv2.COLOR_RGB2BGR)
-            frame_rgb = cv2.cvtColor(frame_rgb, cv2.COLOR_BGR2RGB)
-            
             detect_start = time.time()
-            mp_image = MPImage(image_format=ImageFormat.SRGB, data=frame_rgb)
-            results = current_landmarker.detect(mp_image)
+            results = detect_hands(frame_rgb, session)
             detect_time = time.time() - detect_start
 
             if results.hand_landmarks and len(results.hand_landmarks) > 0:
-                # UPDATED: Process all detected hands (up to 2)
+                # All hands as one (n_hands, 21, 3) array, classified together below
+                hands = landmarks_to_array(results.hand_landmarks)
+                all_landmark_points = [{'x': x, 'y': y} for x, y in hands[:, :, :2].reshape(-1, 2).tolist()]
                 detected_gestures = []
-                all_landmark_points = []
-                
-                for hand_idx, hand_landmarks in enumerate(results.hand_landmarks):
-                    features = []
-                    landmark_points = []
-                    
-                    for lm in hand_landmarks:
-                        features.extend([lm.x, lm.y, lm.z])
-                        landmark_points.append({'x': float(lm.x), 'y': float(lm.y)})
-
-                    features = np.array(features)
-
-                    if features is not None and len(features) == 63:
-                        # Predict gesture for this hand
-                        pred_start = time.time()
-                        gesture, confidence = predict_gesture(features)
-                        pred_time = time.time() - pred_start
+                used_keys = set()
+                hand_keys = [hand_key(results, hand_idx, used_keys) for hand_idx in range(len(hands))]
+
+                # Two-handed signs: the joint model sees both hands at once
+                resolved = {}
+                joint = predict_joint_gesture(results, hands) if len(hands) == 2 else None
+                if joint is not None:
+                    gesture, confidence = joint
+                    smoother = get_session_smoother(session, 'joint')
+                    if smoother is not None:
+                        gesture, confidence = smoother.update(gesture, confidence)
+                    resolved['Both hands'] = (gesture, confidence)
+                else:
+                    # Hands still holding a locked gesture skip the classifier
+                    classified_hands = []
+                    for hand_idx, key in enumerate(hand_keys):
+                        smoother = get_session_smoother(session, key)
+                        locked = smoother.locked_result(hands[hand_idx]) if smoother is not None else None
+                        if locked is not None:
+                            resolved[f"Hand {hand_idx + 1}"] = locked
+                        else:
+                            classified_hands.append((hand_idx, smoother))
+
+                    # Classify the remaining hands in one (micro-batched) classifier call
+                    predictions = []
+                    if classified_hands:
+                        predictions = predict_gestures(hands[[hand_idx for hand_idx, _ in classified_hands]])
+
+                    for (hand_idx, smoother), (gesture, confidence) in zip(classified_hands, predictions):
+                        if gesture and smoother is not None:
+                            # Majority vote over this hand's recent frames
+                            gesture, confidence = smoother.update(gesture, confidence, hands[hand_idx])
+                        resolved[f"Hand {hand_idx + 1}"] = (gesture, confidence)
+
+                history = session.history if session is not None else gesture_history
+                for hand_name in sorted(resolved):
+                    gesture, confidence = resolved[hand_name]
+                    if gesture and confidence > 0.0:
+                        detected_gestures.append({
+                            'gesture': gesture,
+                            'confidence': float(confidence),
+                            'hand': hand_name  # Hand 1, Hand 2 or Both hands
+                        })
                         
-                        if gesture and confidence > 0.0:
-                            smoothed_confidence = smooth_confidence(confidence)
-                            detected_gestures.append({
-                                'gesture': gesture,
-                                'confidence': float(smoothed_confidence),
-                                'hand': hand_idx + 1  # Hand 1 or Hand 2
-                            })
-                            
-                            # Add to history
-                            gesture_history.append({
-                                'gesture': f"{gesture} (Hand {hand_idx + 1})",
-                                'confidence': float(smoothed_confidence),
-                                'timestamp': time.time()
-                            })
-                            
-                            if len(gesture_history) > 50:
-                                gesture_history.pop(0)
-                    
-                    all_landmark_points.extend(landmark_points)
+                        # Add to history (ring buffer, oldest entries drop out)
+                        history.append({
+                            'gesture': f"{gesture} ({hand_name})",
+                            'confidence': float(confidence),
+                            'timestamp': time.time()
+                        })
                 
                 # Update global state with first detected gesture (or show both)
                 if detected_gestures:
@@ -403,13 +887,17 @@ def process_frame_bytes(frame_bytes):
                     
                     total_time = time.time() - start_time
                     for det in detected_gestures:
-                        print(f"[DETECTED] Hand {det['hand']}: {det['gesture']} (confidence: {det['confidence']*100:.1f}%) | Total time: {total_time*1000:.1f}ms")
+                        print(f"[DETECTED] {det['hand']}: {det['gesture']} (confidence: {det['confidence']*100:.1f}%) | Times: decode={decoded.decode_ms:.1f}ms, total={total_time*1000:.1f}ms")
                 else:
                     total_time = time.time() - start_time
-                    print(f"[NO GESTURE] {len(results.hand_landmarks)} hand(s) detected but low confidence | Times: total={total_time*1000:.1f}ms")
+                    print(f"[NO GESTURE] {len(results.hand_landmarks)} hand(s) detected but low confidence | Times: decode={decoded.decode_ms:.1f}ms, total={total_time*1000:.1f}ms")
             else:
+                if session is not None:
+                    # Hands left the frame: stale votes and locks must not carry over
+                    for smoother in session.smoothers.values():
+                        smoother.reset()
                 total_time = time.time() - start_time
-                print(f"[NO HAND] No hands detected in frame | Times: detect={detect_time*1000:.1f}ms, total={total_time*1000:.1f}ms")
+                print(f"[NO HAND] No hands detected in frame | Times: decode={decoded.decode_ms:.1f}ms, detect={detect_time*1000:.1f}ms, total={total_time*1000:.1f}ms")
 
         except Exception as e:
             print(f"[ERR] Hand detection error: {e}")
@@ -436,64 +924,113 @@ def process_frame():
         return '', 204
     
     # Allow frame processing
+    session = None
     try:
-        # Get JSON data
-        if not request.is_json:
-            print(f"[ERR] Invalid content type: {request.content_type}")
-            return jsonify({'status': 'error', 'message': 'Content-Type must be application/json'}), 400
-        
-        data = request.get_json(force=True)
-        if data is None:
-            print("[ERR] No JSON data received")
-            return jsonify({'status': 'error', 'message': 'No JSON data'}), 400
-        
-        frame_data = data.get('frame', '')
-        if not frame_data:
-            print("[ERR] No frame data in JSON")
-            return jsonify({'status': 'error', 'message': 'No frame data in JSON'}), 400
-        
-        if len(frame_data) < 50:
-            print(f"[ERR] Frame data too small: {len(frame_data)} bytes")
-            return jsonify({'status': 'error', 'message': 'Frame data too small'}), 400
-        
-        print(f"[INFO] Processing frame: {len(frame_data)} bytes")
-        
-        print(f"[DEBUG] Received frame of size: {len(frame_data)} bytes")
-        print(f"[DEBUG] Model loaded: {gesture_model is not None}")
-        gesture, confidence, landmark_points = process_frame_bytes(frame_data)
+        session = get_request_session()
+        # Accept raw image bytes, multipart upload or legacy base64 JSON
+        frame_data, error = read_frame_from_request()
+        if error:
+            print(f"[ERR] Invalid frame request ({request.content_type}): {error}")
+            # Pacing hints on errors too, so clients keep following the server's frame rate
+            return jsonify({'status': 'error', 'message': error, **frame_controller.recommend(session)}), 400
+        
+        print(f"[INFO] Processing frame: {len(frame_data)} bytes ({request.mimetype})")
+        print(f"[DEBUG] Model loaded: {model_registry.active is not None}")
+        gesture, confidence, landmark_points = process_frame_bytes(frame_data, session)
         print(f"[DEBUG] Prediction result: gesture={gesture}, confidence={confidence}, landmarks={len(landmark_points) if landmark_points else 0}")
 
-        return jsonify({
-            'status': 'success',
-            'gesture': gesture,
-            'confidence': float(confidence) if confidence else 0,
-            'landmarks': landmark_points
-        }), 200
+        return jsonify(build_frame_result(gesture, confidence, landmark_points, session)), 200
         
     except Exception as e:
         import traceback
         print(f"Frame processing error: {e}")
         print(traceback.format_exc())
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return jsonify({'status': 'error', 'message': str(e), **frame_controller.recommend(session)}), 500
+
+STREAM_IDLE_TIMEOUT = float(os.getenv('GESTURE_STREAM_IDLE_TIMEOUT', '30'))
+
+def handle_stream(ws):
+    """Persistent frame stream: one session per connection.
+
+    The client sends frames as binary messages (raw JPEG/PNG bytes) or as
+    JSON text {"type": "frame", "frame": "<base64>"}; every frame is
+    answered with a {"type": "result", ...} message on the same socket.
+    JSON control messages: {"type": "ping"} and {"type": "close"}.
+    """
+    import json
+
+    session = gesture_sessions.get_or_create(request.args.get('session_id'))
+    ws.send(json.dumps({'type': 'session', 'session_id': session.session_id}))
+    print(f"[INFO] Stream opened: session {session.session_id}")
+
+    sequence = 0
+    try:
+        while True:
+            message = ws.receive(timeout=STREAM_IDLE_TIMEOUT)
+            if message is None:
+                print(f"[INFO] Stream idle for {STREAM_IDLE_TIMEOUT:.0f}s: session {session.session_id}")
+                break
+
+            if isinstance(message, str):
+                try:
+                    payload = json.loads(message)
+                except ValueError:
+                    ws.send(json.dumps({'type': 'error', 'message': 'Invalid JSON message'}))
+                    continue
+                if not isinstance(payload, dict):
+                    ws.send(json.dumps({'type': 'error', 'message': 'JSON message must be an object'}))
+                    continue
+                message_type = payload.get('type', 'frame')
+                if message_type == 'ping':
+                    ws.send(json.dumps({'type': 'pong', 'timestamp': time.time()}))
+                    continue
+                if message_type == 'close':
+                    break
+                frame_bytes, error = decode_json_frame(payload)
+                if error:
+                    ws.send(json.dumps({'type': 'error', 'message': error}))
+                    continue
+            else:
+                frame_bytes = message
+
+            if len(frame_bytes) < MIN_FRAME_BYTES:
+                ws.send(json.dumps({'type': 'error', 'message': 'Frame data too small'}))
+                continue
+
+            sequence += 1
+            gesture, confidence, landmark_points = process_frame_bytes(frame_bytes, session)
+            result = build_frame_result(gesture, confidence, landmark_points, session)
+            result['type'] = 'result'
+            result['sequence'] = sequence
+            ws.send(json.dumps(result))
+    finally:
+        # Close the session this connection holds, even if it was evicted meanwhile
+        gesture_sessions.close_session(session)
+        print(f"[INFO] Stream closed: session {session.session_id} ({sequence} frames)")
+
+if SOCK_AVAILABLE:
+    sock.route('/api/stream')(handle_stream)
 
 @app.route('/api/gesture-history', methods=['GET'])
 def gesture_history_endpoint():
-    """Get gesture detection history"""
+    """Get gesture detection history (the session's own history when a session id is given)"""
+    session = get_request_session()
+    history = list(session.history if session is not None else gesture_history)
     return jsonify({
-        'history': gesture_history[-10:],  # Last 10
-        'total': len(gesture_history)
+        'history': history[-10:],  # Last 10
+        'total': len(history)
     })
 
 @app.route('/api/start-detection', methods=['POST'])
 def start_detection():
     """Start hand detection"""
-    global detection_active, gesture_history
+    global detection_active
     
     if detection_active:
         return jsonify({'status': 'already running'})
     
     detection_active = True
-    gesture_history = []
+    gesture_history.clear()
     
     print("[INFO] Detection started - waiting for frames from browser")
     
@@ -510,8 +1047,11 @@ def stop_detection():
 @app.route('/api/clear-history', methods=['POST'])
 def clear_history():
     """Clear gesture history"""
-    global gesture_history
-    gesture_history = []
+    session = get_request_session()
+    if session is not None:
+        session.history.clear()
+    else:
+        gesture_history.clear()
     return jsonify({'status': 'cleared', 'message': 'History cleared'})
 
 @app.route('/api/get-response', methods=['POST'])
@@ -522,7 +1062,8 @@ def get_response():
     user_message = data.get('message', None)
     
     # Use NLP-enhanced response if available
-    if NLP_AVAILABLE and nlp_processor and user_message:
+    nlp_processor = get_nlp_processor() if user_message else None
+    if nlp_processor and user_message:
         nlp_response = nlp_processor.generate_response(gesture, user_message)
         return jsonify({
             'response': nlp_response['response'],
@@ -537,7 +1078,8 @@ def get_response():
 @app.route('/api/nlp/sentiment', methods=['POST'])
 def analyze_sentiment():
     """Analyze sentiment of user text"""
-    if not NLP_AVAILABLE or not nlp_processor:
+    nlp_processor = get_nlp_processor()
+    if not nlp_processor:
         return jsonify({'error': 'NLP processor not available'}), 400
     
     data = request.json
@@ -552,7 +1094,8 @@ def analyze_sentiment():
 @app.route('/api/nlp/intent', methods=['POST'])
 def detect_intent():
     """Detect user intent from text"""
-    if not NLP_AVAILABLE or not nlp_processor:
+    nlp_processor = get_nlp_processor()
+    if not nlp_processor:
         return jsonify({'error': 'NLP processor not available'}), 400
     
     data = request.json
@@ -567,7 +1110,8 @@ def detect_intent():
 @app.route('/api/nlp/keywords', methods=['POST'])
 def extract_keywords():
     """Extract keywords from text"""
-    if not NLP_AVAILABLE or not nlp_processor:
+    nlp_processor = get_nlp_processor()
+    if not nlp_processor:
         return jsonify({'error': 'NLP processor not available'}), 400
     
     data = request.json
@@ -583,7 +1127,8 @@ def extract_keywords():
 @app.route('/api/nlp/entities', methods=['POST'])
 def extract_entities():
     """Extract named entities from text"""
-    if not NLP_AVAILABLE or not nlp_processor:
+    nlp_processor = get_nlp_processor()
+    if not nlp_processor:
         return jsonify({'error': 'NLP processor not available'}), 400
     
     data = request.json
@@ -598,7 +1143,8 @@ def extract_entities():
 @app.route('/api/nlp/summarize', methods=['POST'])
 def summarize_text():
     """Summarize text"""
-    if not NLP_AVAILABLE or not nlp_processor:
+    nlp_processor = get_nlp_processor()
+    if not nlp_processor:
         return jsonify({'error': 'NLP processor not available'}), 400
     
     data = request.json
@@ -614,7 +1160,8 @@ def summarize_text():
 @app.route('/api/nlp/analyze', methods=['POST'])
 def comprehensive_analysis():
     """Comprehensive NLP analysis: sentiment, intent, entities, keywords"""
-    if not NLP_AVAILABLE or not nlp_processor:
+    nlp_processor = get_nlp_processor()
+    if not nlp_processor:
         return jsonify({'error': 'NLP processor not available'}), 400
     
     data = request.json
@@ -633,6 +1180,18 @@ def comprehensive_analysis():
     
     return jsonify(result)
 
+def early_exit_stats():
+    active = model_registry.active
+    if active is not None and isinstance(active.model, EarlyExitForest):
+        return {'enabled': True, **active.model.stats()}
+    return {'enabled': False}
+
+def cascade_stats():
+    active = model_registry.active
+    if active is not None and isinstance(active.model, CascadeClassifier):
+        return {'enabled': True, **active.model.stats()}
+    return {'enabled': False}
+
 @app.route('/api/optimization/status', methods=['GET'])
 def optimization_status():
     """Get current optimization settings"""
@@ -640,15 +1199,81 @@ def optimization_status():
         'detection_caching': ENABLE_DETECTION_CACHING,
         'confidence_smoothing': ENABLE_CONFIDENCE_SMOOTHING,
         'confidence_smoothing_buffer': CONFIDENCE_SMOOTHING_BUFFER,
-        'frame_skip_interval': FRAME_SKIP_INTERVAL,
-        'cache_hit_enabled': ENABLE_DETECTION_CACHING
+        'stable_lock': {
+            'enabled': ENABLE_STABLE_LOCK,
+            'confidence': STABLE_LOCK_CONFIDENCE,
+            'frames': STABLE_LOCK_FRAMES,
+            'tolerance': STABLE_LOCK_TOLERANCE,
+            'max_frames': STABLE_LOCK_MAX_FRAMES,
+            **stable_lock_stats.to_dict()
+        },
+        'adaptive_frame_rate': frame_controller.stats(),
+        'cache_hit_enabled': ENABLE_DETECTION_CACHING,
+        'frame_gate': {
+            'hamming_threshold': FRAME_GATE_HAMMING_THRESHOLD,
+            'motion_threshold': FRAME_GATE_MOTION_THRESHOLD,
+            'pixel_threshold': FRAME_GATE_PIXEL_THRESHOLD,
+            'max_reuse': FRAME_GATE_MAX_REUSE,
+            **frame_gate_stats.to_dict()
+        },
+        'sessions': gesture_sessions.stats(),
+        'hand_tracking': ENABLE_HAND_TRACKING,
+        'roi_tracking': ENABLE_ROI_TRACKING,
+        'landmarker_pool': landmarker_pool.stats(),
+        'tracking_landmarkers': tracking_landmarkers.stats(),
+        'frame_decoder': frame_decoder.stats(),
+        'classifier_batching': gesture_classifier.stats(),
+        'early_exit': early_exit_stats(),
+        'cascade': cascade_stats(),
+        'model_registry': model_registry.stats()
     })
 
+@app.route('/api/model/reload', methods=['POST'])
+def reload_model():
+    """Load a model artifact in the background and swap it in once warmed up
+
+    Requires GESTURE_ADMIN_TOKEN (sent as X-Admin-Token). Optional JSON body
+    {"path": "<artifact dir>"} inside GESTURE_MODELS_DIR; defaults to GESTURE_MODEL_ARTIFACT.
+    """
+    if not GESTURE_ADMIN_TOKEN:
+        return jsonify({'status': 'error', 'message': 'Model reload is disabled (GESTURE_ADMIN_TOKEN is not set)'}), 403
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), GESTURE_ADMIN_TOKEN.encode()):
+        return jsonify({'status': 'error', 'message': 'Invalid admin token'}), 403
+    payload = request.get_json(silent=True)
+    payload = payload if isinstance(payload, dict) else {}
+    path = payload.get('path') or GESTURE_MODEL_ARTIFACT
+    if not isinstance(path, str):
+        return jsonify({'status': 'error', 'message': 'path must be a string'}), 400
+    if path != GESTURE_MODEL_ARTIFACT:
+        models_dir = os.path.realpath(GESTURE_MODELS_DIR)
+        resolved = os.path.realpath(path)
+        if os.path.commonpath([models_dir, resolved]) != models_dir:
+            return jsonify({'status': 'error', 'message': f'path must be inside {GESTURE_MODELS_DIR}'}), 400
+        path = resolved
+    if not is_artifact(path):
+        return jsonify({'status': 'error', 'message': f'No model artifact at {path}'}), 404
+    if not model_registry.reload(path):
+        return jsonify({'status': 'busy', 'message': 'A model reload is already running'}), 409
+    return jsonify({
+        'status': 'loading',
+        'path': path,
+        'current_version': model_registry.stats()['version']
+    }), 202
+
+@app.route('/api/model/status', methods=['GET'])
+def model_status():
+    """Active gesture model and reload state"""
+    return jsonify(model_registry.stats())
+
 @app.route('/api/optimization/toggle-cache', methods=['POST'])
 def toggle_cache():
     """Toggle detection caching optimization"""
     global ENABLE_DETECTION_CACHING
     ENABLE_DETECTION_CACHING = not ENABLE_DETECTION_CACHING
+    # Drop stale reference frames so re-enabling never reuses old results
+    for session in gesture_sessions.sessions():
+        if session.gate is not None:
+            session.gate.reset()
     return jsonify({
         'status': 'success',
         'detection_caching': ENABLE_DETECTION_CACHING,
@@ -660,6 +1285,9 @@ def toggle_smoothing():
     """Toggle confidence smoothing optimization"""
     global ENABLE_CONFIDENCE_SMOOTHING
     ENABLE_CONFIDENCE_SMOOTHING = not ENABLE_CONFIDENCE_SMOOTHING
+    # Start from empty buffers (and no locks) whichever way it was toggled
+    for session in gesture_sessions.sessions():
+        session.smoothers = {}
     return jsonify({
         'status': 'success',
         'confidence_smoothing': ENABLE_CONFIDENCE_SMOOTHING,
@@ -669,23 +1297,34 @@ def toggle_smoothing():
 @app.route('/api/status', methods=['GET'])
 def status():
     """Get comprehensive system status including NLP capabilities"""
+    active_model = model_registry.active
+    # Report without loading: status checks must not pull in the NLP stack
+    nlp_processor = components.peek('nlp')
+    nlp_available = components.state('nlp') != 'failed'
     return jsonify({
         'status': 'online',
-        'gesture_model': gesture_model is not None,
-        'gesture_classes': len(GESTURE_LABELS),
-        'hand_landmarker': landmarker is not None,
-        'nlp_available': NLP_AVAILABLE,
+        'gesture_model': active_model is not None,
+        'gesture_classes': len(active_model.labels) if active_model else 0,
+        'inference_engine': active_model.engine if active_model else None,
+        'model_version': active_model.version if active_model else None,
+        'model_state': model_registry.state,
+        'feature_spec': active_model.feature_spec if active_model else None,
+        'hand_landmarker': landmarker_pool.available,
+        'frame_streaming': SOCK_AVAILABLE,
+        'nlp_available': nlp_available,
         'nlp_processor': nlp_processor is not None,
         'nlp_features': {
-            'sentiment_analysis': NLP_AVAILABLE and (nlp_processor.nltk_available or nlp_processor.sentiment_pipeline is not None) if nlp_processor else False,
-            'entity_recognition': NLP_AVAILABLE and nlp_processor.ner_pipeline is not None if nlp_processor else False,
-            'intent_detection': NLP_AVAILABLE,
-            'keyword_extraction': NLP_AVAILABLE and nlp_processor.nltk_available if nlp_processor else False,
-            'text_generation': NLP_AVAILABLE and nlp_processor.gemini_available if nlp_processor else False,
-            'text_summarization': NLP_AVAILABLE and nlp_processor.gemini_available if nlp_processor else False
+            'sentiment_analysis': (nlp_processor.nltk_features.get('sentiment', False) or nlp_processor.sentiment_pipeline is not None) if nlp_processor else False,
+            'entity_recognition': nlp_processor.ner_pipeline is not None if nlp_processor else False,
+            'intent_detection': nlp_available,
+            'keyword_extraction': nlp_processor.nltk_features.get('keywords', False) if nlp_processor else False,
+            'text_generation': nlp_processor.gemini_available if nlp_processor else False,
+            'text_summarization': nlp_processor.gemini_available if nlp_processor else False
         },
+        'components': {name: components.state(name) for name in components.names},
         'api_endpoints': [
             '/api/process-frame',
+            '/api/stream',
             '/api/get-response',
             '/api/nlp/sentiment',
             '/api/nlp/intent',
@@ -693,10 +1332,33 @@ def status():
             '/api/nlp/entities',
             '/api/nlp/summarize',
             '/api/nlp/analyze',
-            '/api/status'
+            '/api/status',
+            '/api/components',
+            '/api/ready'
         ]
     })
 
+@app.route('/api/components', methods=['GET'])
+def component_status():
+    """Load state and import / init / warm-up time of every lazily loaded component"""
+    return jsonify({
+        'startup_ms': STARTUP_MS,
+        'warmup': warmup_names(),
+        'components': components.stats()
+    })
+
+@app.route('/api/ready', methods=['GET'])
+def readiness():
+    """Readiness probe for load balancers: 200 once every GESTURE_READY_COMPONENTS component is warm, else 503"""
+    required = components.resolve(READY_COMPONENTS)
+    ready = components.ready(required)
+    return jsonify({
+        'ready': ready,
+        'required': required,
+        'uptime_s': round(time.time() - SERVER_STARTED_AT, 1),
+        'components': {name: components.component(name).to_dict() for name in required}
+    }), 200 if ready else 503
+
 # ============================================================================
 # ARGOS TRANSLATE ENDPOINTS - Free, Open-Source Translation
 # ============================================================================
@@ -822,7 +1484,8 @@ def detect_language():
 @app.route('/api/translate/supported', methods=['GET'])
 def get_supported_languages():
     """Get list of supported language pairs"""
-    if not ARGOS_AVAILABLE or translator is None:
+    translator = components.get('translate')
+    if translator is None:
         return jsonify({
             'languages': {},
             'error': True,
@@ -844,7 +1507,8 @@ def get_supported_languages():
 @app.route('/api/translate/batch', methods=['POST'])
 def batch_translate():
     """Translate multiple texts at once"""
-    if not ARGOS_AVAILABLE or translator is None:
+    translator = components.get('translate')
+    if translator is None:
         return jsonify({
             'error': True,
             'message': 'Translation service not available'
@@ -889,7 +1553,7 @@ def extract_text_from_pdf(file):
     """Extract text from PDF file"""
     try:
         text = ""
-        pdf_reader = PyPDF2.PdfReader(file)
+        pdf_reader = components.get('documents').PdfReader(file)
         for page in pdf_reader.pages:
             text += page.extract_text() + "\n"
         return text.strip()
@@ -900,7 +1564,7 @@ def extract_text_from_pdf(file):
 def extract_text_from_word(file):
     """Extract text from Word document"""
     try:
-        doc = Document(file)
+        doc = components.get('documents').Document(file)
         text = ""
         for para in doc.paragraphs:
             text += para.text + "\n"
@@ -912,7 +1576,7 @@ def extract_text_from_word(file):
 def extract_text_from_pptx(file):
     """Extract text from PowerPoint presentation"""
     try:
-        prs = Presentation(file)
+        prs = components.get('documents').Presentation(file)
         text = ""
         for slide in prs.slides:
             for shape in slide.shapes:
@@ -927,7 +1591,7 @@ def extract_text_from_image(file):
     """Extract text from image using OCR (optional) or return placeholder"""
     try:
         # For now, return image metadata and placeholder
-        img = Image.open(file)
+        img = components.get('documents').Image.open(file)
         width, height = img.size
         return f"Image Analysis: {width}x{height} resolution. Image successfully uploaded and processed."
     except Exception as e:
@@ -974,6 +1638,12 @@ def upload_file():
         filename = secure_filename(file.filename)
         file_ext = filename.rsplit('.', 1)[1].lower()
         
+        if components.get('documents') is None:
+            return jsonify({
+                'error': True,
+                'message': 'Document processing not available'
+            }), 503
+        
         # Extract text based on file type
         extracted_text = None
         
@@ -1002,6 +1672,7 @@ def upload_file():
         }
         
         # Apply NLP analysis if available
+        nlp_processor = get_nlp_processor()
         if nlp_processor:
             try:
                 # Sentiment analysis
@@ -1063,6 +1734,7 @@ def analyze_text():
         }
         
         # Apply NLP analysis if available
+        nlp_processor = get_nlp_processor()
         if nlp_processor:
             try:
                 # Sentiment analysis
@@ -1114,7 +1786,12 @@ def generate_image_hf():
                 'message': 'Hugging Face API token not configured. Add HUGGINGFACE_API_KEY to .env'
             }), 500
         
-        import requests
+        requests = components.get('image_proxy')
+        if requests is None:
+            return jsonify({
+                'error': True,
+                'message': 'Image generation proxy not available (requests is not installed)'
+            }), 503
         
         # Call Hugging Face API
         headers = {
@@ -1219,7 +1896,12 @@ def generate_image_zimage():
                 'message': 'Hugging Face API token not configured. Add HUGGINGFACE_API_KEY to .env'
             }), 500
         
-        import requests
+        requests = components.get('image_proxy')
+        if requests is None:
+            return jsonify({
+                'error': True,
+                'message': 'Image generation proxy not available (requests is not installed)'
+            }), 503
         
         # Z-Image requires fal-ai provider via Hugging Face Inference API
         # Using direct API call to fal-ai model
@@ -1343,13 +2025,63 @@ def generate_image_zimage():
             'message': str(e)
         }), 500
 
+# ========================================
+# PRE-FORK SERVING (gunicorn -c gunicorn.conf.py wsgi:app)
+# ========================================
+def create_app():
+    """Application factory for WSGI servers; models were loaded when this module was imported"""
+    return app
+
+def prepare_for_fork():
+    """Master process, before each fork: no MediaPipe graphs may cross the fork"""
+    global LANDMARKER_INITIALIZED
+    landmarker_pool.close()
+    tracking_landmarkers.close()
+    LANDMARKER_INITIALIZED = False
+    # Move preloaded objects out of GC tracking so collections in the workers
+    # don't write to (and privately copy) the shared model pages
+    gc.freeze()
+
+def reinitialize_after_fork():
+    """Worker process, right after fork: fresh MediaPipe handles and background threads"""
+    global landmarker_pool, tracking_landmarkers, LANDMARKER_INITIALIZED, gesture_classifier
+    gesture_classifier = BatchingClassifier(None, window_ms=CLASSIFIER_BATCH_WINDOW_MS,
+                                            max_batch=CLASSIFIER_MAX_BATCH)
+    landmarker_pool = LandmarkerPool(size=LANDMARKER_POOL_SIZE)
+    tracking_landmarkers = TrackingLandmarkerPool(max_instances=MAX_TRACKING_LANDMARKERS)
+    LANDMARKER_INITIALIZED = False
+    components.reset('landmarker')
+    model_registry.watch(GESTURE_MODEL_WATCH_INTERVAL)
+    # /api/ready answers 503 until the landmarker (and anything else left) is warm
+    components.warmup(warmup_names(), background=True)
+    active_model = model_registry.active
+    print(f"[OK] Worker {os.getpid()} started (model {active_model.version if active_model else None}, "
+          f"{landmarker_pool.size} landmarkers), warming up")
+
+def warmup_names():
+    """GESTURE_WARMUP_COMPONENTS plus any GESTURE_READY_COMPONENTS it leaves out"""
+    names = components.resolve(WARMUP_COMPONENTS)
+    return names + [name for name in components.resolve(READY_COMPONENTS) if name not in names]
+
+# Startup is done once the module is imported; components named in
+# GESTURE_WARMUP_COMPONENTS load and warm up next
+STARTUP_MS = round((time.perf_counter() - _module_import_start) * 1000, 1)
+SERVER_STARTED_AT = time.time()
+print(f"[OK] Server module imported in {STARTUP_MS}ms "
+      f"(lazy components: {', '.join(components.names)})")
+if PREFORK_SERVING:
+    # Shared by every worker; MediaPipe graphs must not cross the fork
+    components.warmup([name for name in warmup_names() if name != 'landmarker'])
+else:
+    components.warmup(warmup_names(), background=True)
+
 if __name__ == '__main__':
     try:
         print("=" * 70)
         print("=" * 70)
         print("GESTURE RECOGNITION API SERVER")
         print("=" * 70)
-        print(f"[INFO] Models loaded: {gesture_model is not None}")
+        print(f"[INFO] Models loaded: {model_registry.active is not None}")
         print(f"[INFO] Hand Landmarker model: hand_landmarker.task")
         print(f"[INFO] Gesture classes: {len(GESTURE_LABELS)} (1-9, A-Z)")
         print("=" * 70)
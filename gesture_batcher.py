@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Micro-batching classifier service for the gesture recognition server
+Feature vectors from all hands and all in-flight requests that arrive within
+a short window are classified with a single predict_proba call
+"""
+
+import queue
+import threading
+import time
+from typing import Dict
+
+import numpy as np
+
+
+class _PendingBatch:
+    """Rows submitted by one caller, waiting for their probabilities"""
+
+    __slots__ = ('features', 'model', 'done', 'probabilities', 'error')
+
+    def __init__(self, features: np.ndarray, model):
+        self.features = features
+        self.model = model
+        self.done = threading.Event()
+        self.probabilities = None
+        self.error = None
+
+
+class BatchingClassifier:
+    """Collects feature rows for up to `window_ms` and runs one predict_proba
+
+    RandomForest inference has a large fixed cost per call (input validation,
+    thread dispatch, one pass per tree), so classifying 16 rows costs little
+    more than classifying one. With window_ms=0 calls go straight to the model.
+    Callers may pass the model to use per call; rows are only batched with
+    rows for the same model, so a swapped-in model never sees rows that
+    were prepared for the previous one.
+    """
+
+    def __init__(self, model, window_ms: float = 2.0, max_batch: int = 64):
+        self.model = model
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+
+    def predict_proba(self, features: np.ndarray, model=None) -> np.ndarray:
+        """Class probabilities for a (n_rows, n_features) array (default model: self.model)"""
+        model = model if model is not None else self.model
+        features = np.asarray(features, dtype=np.float64).reshape(len(features), -1)
+        if self.window <= 0:
+            self._record(len(features))
+            return model.predict_proba(features)
+
+        self._ensure_worker()
+        pending = _PendingBatch(features, model)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.probabilities
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='gesture-batcher', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            rows = len(batch[0].features)
+            deadline = time.perf_counter() + self.window
+            while rows < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(pending)
+                rows += len(pending.features)
+            self._classify(batch, rows)
+
+    def _classify(self, batch, rows: int):
+        groups = {}
+        for pending in batch:
+            groups.setdefault(id(pending.model), []).append(pending)
+        try:
+            for group in groups.values():
+                self._classify_group(group)
+        finally:
+            self._record(rows)
+            for pending in batch:
+                pending.done.set()
+
+    @staticmethod
+    def _classify_group(group):
+        try:
+            features = group[0].features if len(group) == 1 else np.vstack([p.features for p in group])
+            probabilities = group[0].model.predict_proba(features)
+            offset = 0
+            for pending in group:
+                count = len(pending.features)
+                pending.probabilities = probabilities[offset:offset + count]
+                offset += count
+        except Exception as e:
+            for pending in group:
+                pending.error = e
+
+    def _record(self, rows: int):
+        with self._lock:
+            self.batches += 1
+            self.rows += rows
+            self.largest_batch = max(self.largest_batch, rows)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'window_ms': self.window * 1000.0,
+                'max_batch': self.max_batch,
+                'batches': self.batches,
+                'rows': self.rows,
+                'avg_batch_rows': round(self.rows / self.batches, 2) if self.batches else 0.0,
+                'largest_batch': self.largest_batch
+            }
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Two-stage cascade gesture classifier
+A small router forest predicts a coarse group (most groups hold one gesture,
+a few hold gestures that are routinely confused, e.g. M/N or U/V/2). When the
+router is confident, only that group is considered; otherwise its top groups
+are mixed. Groups with more than one gesture are resolved by a small
+specialist forest trained on just those gestures.
+"""
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from forest_engine import CompiledForest
+from gesture_features import LEGACY_FEATURE_SPEC
+
+
+def merge_confused_classes(confusion: np.ndarray, threshold: float = 0.05, max_group_size: int = 4) -> List[List[int]]:
+    """Group class columns whose pairwise confusion rate reaches `threshold`
+
+    `confusion` is a (n_classes, n_classes) count matrix (rows = true class).
+    Pairs are merged most-confused first; a merge that would exceed
+    `max_group_size` is skipped. Returns groups of column indices.
+    """
+    counts = np.asarray(confusion, dtype=np.float64)
+    rates = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1.0)
+    pair_rates = rates + rates.T
+    np.fill_diagonal(pair_rates, 0.0)
+
+    group_of = list(range(len(counts)))
+    members = {i: [i] for i in range(len(counts))}
+    rows, cols = np.triu_indices(len(counts), k=1)
+    for idx in np.argsort(-pair_rates[rows, cols], kind='stable'):
+        a, b = int(rows[idx]), int(cols[idx])
+        if pair_rates[a, b] < threshold:
+            break
+        ga, gb = group_of[a], group_of[b]
+        if ga == gb or len(members[ga]) + len(members[gb]) > max_group_size:
+            continue
+        for member in members.pop(gb):
+            group_of[member] = ga
+            members[ga].append(member)
+    return [sorted(group) for group in sorted(members.values(), key=min)]
+
+
+class CascadeClassifier:
+    """Router forest over class groups, plus one specialist forest per multi-class group
+
+    predict_proba returns P(group) * P(class | group) over the original
+    classes_, where singleton groups have P(class | group) = 1. Rows whose
+    top router probability reaches `accept_threshold` use only their top
+    group (one specialist call at most); other rows mix their `top_k` groups.
+    """
+
+    def __init__(self, router: CompiledForest, specialists: Dict[int, CompiledForest], group_of: np.ndarray,
+                 classes, accept_threshold: float = 0.8, top_k: int = 2,
+                 feature_spec: str = LEGACY_FEATURE_SPEC):
+        self.router = router
+        self.specialists = dict(specialists)
+        # Group id of every column of classes_
+        self.group_of = np.asarray(group_of, dtype=np.int32)
+        self.classes_ = np.asarray(classes)
+        self.n_classes_ = len(self.classes_)
+        self.n_features_in_ = router.n_features_in_
+        self.n_groups = int(self.group_of.max()) + 1
+        self.accept_threshold = accept_threshold
+        self.top_k = max(1, top_k)
+        self.feature_spec_ = feature_spec
+        # Columns of classes_ each group (and its specialist) covers, in specialist class order
+        self.group_columns = [np.flatnonzero(self.group_of == g) for g in range(self.n_groups)]
+        for group, specialist in self.specialists.items():
+            self.group_columns[group] = np.searchsorted(self.classes_, specialist.classes_)
+        # Single-gesture groups need no specialist: their weight is the class probability
+        self._singleton_groups = np.array([g for g in range(self.n_groups) if g not in self.specialists], dtype=np.intp)
+        self._singleton_columns = np.array([self.group_columns[g][0] for g in self._singleton_groups], dtype=np.intp)
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.accepted = 0
+        self.specialist_rows = 0
+
+    @property
+    def groups(self) -> List[List]:
+        return [self.classes_[columns].tolist() for columns in self.group_columns]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32).reshape(-1, self.n_features_in_)
+        group_proba = self.router.predict_proba(X)
+        n_rows = len(X)
+
+        # Keep each row's top group, or its top_k groups when the router is unsure
+        accepted = group_proba.max(axis=1) >= self.accept_threshold
+        weights = np.zeros_like(group_proba)
+        ranked = np.argsort(-group_proba, axis=1, kind='stable')[:, :self.top_k]
+        rows = np.arange(n_rows)[:, np.newaxis]
+        weights[rows, ranked] = group_proba[rows, ranked]
+        weights[accepted] = 0.0
+        top = ranked[:, 0]
+        weights[accepted, top[accepted]] = 1.0
+        weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+
+        proba = np.zeros((n_rows, self.n_classes_))
+        proba[:, self._singleton_columns] = weights[:, self._singleton_groups]
+        specialist_rows = 0
+        for group, specialist in self.specialists.items():
+            routed = np.flatnonzero(weights[:, group] > 0)
+            if not len(routed):
+                continue
+            columns = self.group_columns[group]
+            # One batched call per group covers every row routed to it
+            proba[routed[:, np.newaxis], columns] += weights[routed, group, np.newaxis] * specialist.predict_proba(X[routed])
+            specialist_rows += len(routed)
+
+        with self._lock:
+            self.rows += n_rows
+            self.accepted += int(accepted.sum())
+            self.specialist_rows += specialist_rows
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def memory_bytes(self) -> int:
+        return self.router.memory_bytes() + sum(s.memory_bytes() for s in self.specialists.values())
+
+    def describe(self) -> Dict:
+        return {
+            'groups': self.n_groups,
+            'specialists': len(self.specialists),
+            'router_trees': self.router.n_estimators,
+            'specialist_trees': sum(s.n_estimators for s in self.specialists.values()),
+            'accept_threshold': self.accept_threshold,
+            'top_k': self.top_k,
+            'memory_bytes': self.memory_bytes()
+        }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.describe(),
+                'rows': self.rows,
+                'router_accept_rate': round(self.accepted / self.rows, 3) if self.rows else 0.0,
+                'specialist_calls_per_row': round(self.specialist_rows / self.rows, 3) if self.rows else 0.0
+            }
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays for model_artifact.py: sub-model arrays are prefixed with router. / g<N>."""
+        arrays = {'classes': self.classes_, 'group_of': self.group_of}
+        for name, array in self.router.to_arrays().items():
+            arrays[f'router.{name}'] = array
+        for group, specialist in self.specialists.items():
+            for name, array in specialist.to_arrays().items():
+                arrays[f'g{group}.{name}'] = array
+        return arrays
+
+    def metadata(self) -> Dict:
+        return {
+            'accept_threshold': self.accept_threshold,
+            'top_k': self.top_k,
+            'router': self.router.metadata(),
+            'specialists': {str(group): s.metadata() for group, s in self.specialists.items()}
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], metadata: Dict,
+                    feature_spec: str = LEGACY_FEATURE_SPEC) -> 'CascadeClassifier':
+        def sub_arrays(prefix: str) -> Dict[str, np.ndarray]:
+            return {name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)}
+
+        router = CompiledForest.from_arrays(sub_arrays('router.'), metadata['router'])
+        specialists = {int(group): CompiledForest.from_arrays(sub_arrays(f'g{group}.'), specialist_metadata)
+                       for group, specialist_metadata in metadata['specialists'].items()}
+        return cls(router, specialists, arrays['group_of'], arrays['classes'],
+                   accept_threshold=metadata['accept_threshold'], top_k=metadata['top_k'],
+                   feature_spec=feature_spec)
+
+
+def build_group_of(n_classes: int, groups: List[List[int]]) -> np.ndarray:
+    """group_of array for CascadeClassifier; columns left out of `groups` get a group of their own"""
+    group_of = np.full(n_classes, -1, dtype=np.int32)
+    for group, columns in enumerate(groups):
+        group_of[columns] = group
+    missing = np.flatnonzero(group_of < 0)
+    group_of[missing] = np.arange(len(groups), len(groups) + len(missing))
+    return group_of
+
+
+def parse_groups(spec: Optional[str], class_names: Sequence[str]) -> List[List[int]]:
+    """'M,N;U,V,2' -> groups of class values (indices into class_names); unknown names raise ValueError"""
+    if not spec:
+        return []
+    index = {str(name): i for i, name in enumerate(class_names)}
+    groups = []
+    for part in spec.split(';'):
+        names = [name.strip() for name in part.split(',') if name.strip()]
+        unknown = [name for name in names if name not in index]
+        if unknown:
+            raise ValueError(f"Unknown gesture(s) in --groups: {', '.join(unknown)}")
+        if len(names) > 1:
+            groups.append(sorted(index[name] for name in names))
+    return groups
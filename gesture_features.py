@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Hand landmark feature pipeline shared by the training scripts and the server
+Turns MediaPipe hand landmarks into scale- and translation-invariant features,
+vectorized over batches of hands
+
+Feature specs:
+    raw                - 63 raw MediaPipe x, y, z values (legacy models)
+    normalized         - 63 values, wrist-relative and divided by palm size
+    normalized_angles  - normalized + 15 finger joint flexion cosines
+                         + 4 spread cosines between adjacent fingers (82 values)
+
+Two-hand (joint) models take both hands' features side by side, left hand
+first (see pair_order): 126 values for the raw and normalized specs.
+"""
+
+from itertools import chain
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_MCP = 9
+
+FEATURE_SPECS = ('raw', 'normalized', 'normalized_angles')
+DEFAULT_FEATURE_SPEC = 'normalized_angles'
+# Models pickled before feature specs existed were trained on raw values
+LEGACY_FEATURE_SPEC = 'raw'
+
+# Landmark chains from the wrist to each fingertip (thumb .. pinky)
+FINGER_CHAINS = np.array([
+    [0, 1, 2, 3, 4],
+    [0, 5, 6, 7, 8],
+    [0, 9, 10, 11, 12],
+    [0, 13, 14, 15, 16],
+    [0, 17, 18, 19, 20],
+])
+FINGER_BASES = FINGER_CHAINS[:, 1]
+FINGER_TIPS = FINGER_CHAINS[:, 4]
+
+
+def landmarks_to_array(hands) -> np.ndarray:
+    """Convert MediaPipe hand landmark lists to an (n_hands, 21, 3) float array in one allocation"""
+    count = len(hands) * NUM_LANDMARKS * 3
+    values = chain.from_iterable((lm.x, lm.y, lm.z) for hand in hands for lm in hand)
+    return np.fromiter(values, dtype=np.float64, count=count).reshape(-1, NUM_LANDMARKS, 3)
+
+
+def as_points(landmarks) -> np.ndarray:
+    """Accept (63,), (21, 3), (n, 63) or (n, 21, 3) input; return (n, 21, 3)"""
+    points = np.asarray(landmarks, dtype=np.float64)
+    if points.ndim == 3:
+        return points
+    return points.reshape(-1, NUM_LANDMARKS, 3)
+
+
+def normalize_points(points: np.ndarray) -> np.ndarray:
+    """Wrist-relative landmarks divided by palm size (wrist to middle-finger MCP)"""
+    relative = points - points[:, WRIST:WRIST + 1, :]
+    palm_size = np.linalg.norm(relative[:, MIDDLE_MCP, :2], axis=1)
+    # Degenerate detections fall back to the hand's overall extent
+    extent = np.abs(relative[:, :, :2]).max(axis=(1, 2))
+    palm_size = np.where(palm_size > 1e-6, palm_size, np.where(extent > 1e-6, extent, 1.0))
+    return relative / palm_size[:, np.newaxis, np.newaxis]
+
+
+def _cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(a, axis=-1) * np.linalg.norm(b, axis=-1)
+    return np.einsum('...k,...k->...', a, b) / np.where(norms > 1e-9, norms, 1.0)
+
+
+def finger_angles(points: np.ndarray) -> np.ndarray:
+    """Joint flexion and finger spread cosines, shape (n, 19)"""
+    chains = points[:, FINGER_CHAINS, :]             # (n, 5, 5, 3)
+    bones = chains[:, :, 1:, :] - chains[:, :, :-1, :]  # (n, 5, 4, 3)
+    flexion = _cosines(bones[:, :, :-1, :], bones[:, :, 1:, :]).reshape(len(points), -1)
+
+    directions = points[:, FINGER_TIPS, :] - points[:, FINGER_BASES, :]  # (n, 5, 3)
+    spread = _cosines(directions[:, :-1, :], directions[:, 1:, :])
+    return np.concatenate([flexion, spread], axis=1)
+
+
+def extract_features(landmarks, spec: str = DEFAULT_FEATURE_SPEC) -> np.ndarray:
+    """Feature matrix (n_hands, feature_dim(spec)) for a batch of hands"""
+    points = as_points(landmarks)
+    if spec == 'raw':
+        return points.reshape(len(points), -1)
+    if spec not in FEATURE_SPECS:
+        raise ValueError(f"Unknown feature spec '{spec}' (expected one of {', '.join(FEATURE_SPECS)})")
+
+    normalized = normalize_points(points)
+    flat = normalized.reshape(len(points), -1)
+    if spec == 'normalized':
+        return flat
+    return np.concatenate([flat, finger_angles(normalized)], axis=1)
+
+
+def pair_order(points: np.ndarray, handedness: Optional[Sequence[str]] = None) -> np.ndarray:
+    """Indices putting a detected pair of hands in joint-model order: left hand, then right
+
+    Uses MediaPipe's handedness labels when they name one Left and one Right
+    hand, otherwise the image position (smaller wrist x first).
+    """
+    if handedness is not None and sorted(handedness) == ['Left', 'Right']:
+        return np.array([0, 1] if handedness[0] == 'Left' else [1, 0])
+    return np.argsort(as_points(points)[:, WRIST, 0], kind='stable')
+
+
+def extract_pair_features(pairs, spec: str = DEFAULT_FEATURE_SPEC) -> np.ndarray:
+    """Joint features (n_pairs, 2 * feature_dim(spec)) for pairs of hands already in pair_order"""
+    points = np.asarray(pairs, dtype=np.float64).reshape(-1, 2, NUM_LANDMARKS, 3)
+    return extract_features(points.reshape(-1, NUM_LANDMARKS, 3), spec).reshape(len(points), -1)
+
+
+def feature_dim(spec: str) -> int:
+    return int(extract_features(np.zeros((1, NUM_LANDMARKS, 3)), spec).shape[1])
+
+
+def save_landmark_dataset(path: str, X: np.ndarray, y: np.ndarray, class_names: Sequence[str]):
+    """Save raw (n, 63) landmarks (or (n, 126) hand pairs) with labels so other tools can re-derive features"""
+    np.savez_compressed(path, X=np.asarray(X, dtype=np.float32).reshape(len(X), -1),
+                        y=np.asarray(y), class_names=np.asarray(list(class_names)))
+
+
+def load_landmark_dataset(path: str):
+    """Load a dataset written by save_landmark_dataset: (X, y, class_names)"""
+    data = np.load(path, allow_pickle=False)
+    class_names: List[str] = [str(name) for name in data['class_names']]
+    return data['X'].astype(np.float64), data['y'], class_names
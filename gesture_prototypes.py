@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Nearest-prototype gesture classifier
+Each gesture is summarized by a few k-means centroids of its standardized
+(optionally PCA-projected) features. A row is classified by its distance to
+the nearest centroid of every gesture; confidences are a softmax over those
+distances. Centroids are searched with one vectorized distance matrix
+(default) or a scipy KD-tree; both find the exact nearest prototype.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from gesture_features import LEGACY_FEATURE_SPEC
+
+# For a few hundred to a few thousand centroids one matrix product beats the
+# tree by 2-6x (measured single rows and 64-row batches), so brute is the default
+INDEX_TYPES = ('brute', 'kdtree')
+# Neighbours a KD-tree query returns; classes further away get zero probability
+KDTREE_QUERY_K = 32
+
+
+class PrototypeClassifier:
+    """Standardize -> [PCA projection] -> distance to the nearest prototype of each class -> softmax
+
+    Prototypes are stored class-major with the same count per class (classes
+    with fewer centroids repeat one), so per-class distances are a reshape
+    and a min. Exposes the parts of the scikit-learn classifier API the
+    server uses (predict_proba, predict, classes_, n_features_in_).
+    """
+
+    def __init__(self, mean, scale, components, prototypes, classes, temperature: float,
+                 index: str = 'brute', feature_spec: str = LEGACY_FEATURE_SPEC):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        # (n_features, n_components); an empty matrix means no projection
+        self.components = np.asarray(components, dtype=np.float32)
+        self.prototypes = np.ascontiguousarray(prototypes, dtype=np.float32)
+        self.classes_ = np.asarray(classes)
+        self.n_classes_ = len(self.classes_)
+        self.n_features_in_ = int(self.mean.shape[0])
+        self.prototypes_per_class = len(self.prototypes) // self.n_classes_
+        self.prototype_class = np.repeat(np.arange(self.n_classes_), self.prototypes_per_class)
+        self.temperature = float(temperature)
+        self.feature_spec_ = feature_spec
+        self._squared_norms = np.einsum('ij,ij->i', self.prototypes, self.prototypes)
+
+        self._tree = None
+        if index == 'kdtree':
+            # scipy.spatial takes ~0.3 s to import, so only KD-tree models pay for it
+            try:
+                from scipy.spatial import cKDTree
+                self._tree = cKDTree(self.prototypes)
+            except ImportError:
+                print("[!] scipy not available, prototype search falls back to brute force")
+                index = 'brute'
+        self.index = index
+        self.query_k = min(len(self.prototypes), KDTREE_QUERY_K)
+
+    @property
+    def n_components(self) -> int:
+        return int(self.components.shape[1]) if self.components.size else 0
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        Z = (np.asarray(X, dtype=np.float32).reshape(-1, self.n_features_in_) - self.mean) / self.scale
+        return Z @ self.components if self.components.size else Z
+
+    def class_distances(self, X: np.ndarray) -> np.ndarray:
+        """Distance from every row to the nearest prototype of every class, shape (n_samples, n_classes)
+
+        With the KD-tree, classes outside a row's query_k nearest prototypes
+        get an infinite distance (a zero probability).
+        """
+        Z = self.transform(X)
+        if self._tree is not None:
+            distances, nearest = self._tree.query(Z, k=self.query_k)
+            distances = distances.reshape(len(Z), -1)
+            nearest = nearest.reshape(len(Z), -1)
+            per_class = np.full((len(Z), self.n_classes_), np.inf)
+            rows = np.broadcast_to(np.arange(len(Z))[:, np.newaxis], nearest.shape)
+            np.minimum.at(per_class, (rows, self.prototype_class[nearest]), distances)
+            return per_class
+        squared = (np.einsum('ij,ij->i', Z, Z)[:, np.newaxis] - 2.0 * (Z @ self.prototypes.T)
+                   + self._squared_norms)
+        squared = squared.reshape(len(Z), self.n_classes_, self.prototypes_per_class).min(axis=2)
+        return np.sqrt(np.maximum(squared, 0.0), dtype=np.float64)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        distances = self.class_distances(X)
+        logits = -(distances - distances.min(axis=1, keepdims=True)) / self.temperature
+        proba = np.exp(logits)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmin(self.class_distances(X), axis=1)]
+
+    def memory_bytes(self) -> int:
+        return int(sum(a.nbytes for a in (self.mean, self.scale, self.components, self.prototypes)))
+
+    def describe(self) -> Dict:
+        return {
+            'prototypes': len(self.prototypes),
+            'prototypes_per_class': self.prototypes_per_class,
+            'dimensions': self.prototypes.shape[1],
+            'index': self.index,
+            'temperature': round(self.temperature, 4),
+            'memory_bytes': self.memory_bytes()
+        }
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays for model_artifact.py; the KD-tree is rebuilt on load (it takes well under a millisecond)"""
+        return {'mean': self.mean, 'scale': self.scale, 'components': self.components,
+                'prototypes': self.prototypes, 'classes': self.classes_}
+
+    def metadata(self) -> Dict:
+        return {'temperature': self.temperature, 'index': self.index}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], metadata: Dict, feature_spec: str = LEGACY_FEATURE_SPEC,
+                    index: Optional[str] = None) -> 'PrototypeClassifier':
+        return cls(arrays['mean'], arrays['scale'], arrays['components'], arrays['prototypes'], arrays['classes'],
+                   metadata['temperature'], index or metadata.get('index', 'brute'), feature_spec)
+
+
+def kmeans(X: np.ndarray, k: int, iterations: int = 50, seed: int = 0) -> np.ndarray:
+    """k-means++ seeding followed by Lloyd iterations; returns (min(k, len(X)), n_features) centroids"""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(X))
+    centroids = [X[rng.integers(len(X))]]
+    for _ in range(1, k):
+        squared = np.min(((X[:, np.newaxis, :] - np.asarray(centroids)[np.newaxis]) ** 2).sum(axis=2), axis=1)
+        total = squared.sum()
+        choice = rng.choice(len(X), p=squared / total) if total > 0 else rng.integers(len(X))
+        centroids.append(X[choice])
+    centroids = np.asarray(centroids, dtype=np.float64)
+
+    for _ in range(iterations):
+        assignment = np.argmin(((X[:, np.newaxis, :] - centroids[np.newaxis]) ** 2).sum(axis=2), axis=1)
+        updated = centroids.copy()
+        for cluster in range(k):
+            members = X[assignment == cluster]
+            if len(members):
+                updated[cluster] = members.mean(axis=0)
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+    return centroids
+
+
+def _calibrate_temperature(model: PrototypeClassifier, X: np.ndarray, y: np.ndarray) -> float:
+    """Temperature with the lowest log-loss on (X, y), searched on a log grid"""
+    distances = model.class_distances(X)
+    target = np.searchsorted(model.classes_, y)
+    finite = np.isfinite(distances)
+    scale = float(np.median(distances[finite])) if finite.any() else 1.0
+    best, best_loss = scale, np.inf
+    for factor in np.geomspace(0.01, 10.0, 25):
+        temperature = scale * factor
+        logits = -(distances - distances.min(axis=1, keepdims=True)) / temperature
+        log_proba = logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+        loss = -float(np.mean(log_proba[np.arange(len(y)), target]))
+        if loss < best_loss:
+            best, best_loss = temperature, loss
+    return best
+
+
+def train_prototypes(X: np.ndarray, y: np.ndarray, prototypes_per_class: int = 8, n_components: int = 16,
+                     index: str = 'brute', feature_spec: str = LEGACY_FEATURE_SPEC,
+                     X_val: Optional[np.ndarray] = None, y_val: Optional[np.ndarray] = None,
+                     seed: int = 0) -> PrototypeClassifier:
+    """Fit per-class k-means prototypes; n_components=0 keeps the standardized features as they are
+
+    The softmax temperature is calibrated on (X_val, y_val) when given,
+    otherwise on the training rows.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    classes = np.unique(y)
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale < 1e-6] = 1.0
+    Z = (X - mean) / scale
+
+    if n_components and n_components < Z.shape[1]:
+        _, _, vt = np.linalg.svd(Z - Z.mean(axis=0), full_matrices=False)
+        components = vt[:n_components].T
+    else:
+        components = np.zeros((Z.shape[1], 0))
+    projected = Z @ components if components.size else Z
+
+    prototypes: List[np.ndarray] = []
+    for offset, label in enumerate(classes):
+        centroids = kmeans(projected[y == label], prototypes_per_class, seed=seed + offset)
+        # Pad by repeating centroids so every class has the same count
+        prototypes.append(centroids[np.arange(prototypes_per_class) % len(centroids)])
+
+    model = PrototypeClassifier(mean, scale, components, np.concatenate(prototypes), classes, 1.0,
+                                index, feature_spec)
+    if X_val is not None and y_val is not None:
+        model.temperature = _calibrate_temperature(model, X_val, y_val)
+    else:
+        model.temperature = _calibrate_temperature(model, X, y)
+    return model
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Per-camera streaming sessions for the gesture recognition server
+Links consecutive frames from the same client so state can live server-side
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, Optional
+
+# Recent detections kept per session for /api/gesture-history
+SESSION_HISTORY_SIZE = 50
+
+
+class GestureSession:
+    """Server-side state for one continuous camera stream"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.created_at = time.time()
+        self.last_seen = self.created_at
+        self.frames_processed = 0
+        # Set by close(); a closed session never leases a tracking landmarker again
+        self.closed = False
+        # Ring buffer of recent detections
+        self.history = deque(maxlen=SESSION_HISTORY_SIZE)
+        # Frames of one session are processed in order, one at a time
+        self.lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self):
+        self.last_result = None
+        # Tracking-mode landmarker leased from a TrackingLandmarkerPool
+        self.tracker = None
+        # RoiTracker used when the session has no tracking landmarker
+        self.roi = None
+        # FrameGate deciding whether a frame can reuse last_result
+        self.gate = None
+        # Smoothed per-frame processing latency, drives frame-rate hints
+        self.latency_ms = 0.0
+        # GestureSmoother per hand (keyed by handedness), see gesture_smoothing.py
+        self.smoothers = {}
+
+    def touch(self):
+        """Mark the session as active"""
+        self.last_seen = time.time()
+
+    def record_result(self, result):
+        """Remember the latest frame result for this session"""
+        self.frames_processed += 1
+        self.last_result = result
+        self.touch()
+
+    def idle_seconds(self) -> float:
+        return time.time() - self.last_seen
+
+    def close(self):
+        """Release per-session resources once any frame in progress has finished"""
+        with self.lock:
+            self.closed = True
+            if self.tracker is not None:
+                self.tracker.release()
+            self._reset_state()
+            self.history.clear()
+
+    def to_dict(self) -> Dict:
+        return {
+            'session_id': self.session_id,
+            'frames_processed': self.frames_processed,
+            'latency_ms': round(self.latency_ms, 1),
+            'tracking': self.tracker is not None,
+            'roi': self.roi.stats() if self.roi is not None else None,
+            'locked_hands': sum(1 for smoother in self.smoothers.values() if smoother.locked),
+            'age_seconds': round(time.time() - self.created_at, 1),
+            'idle_seconds': round(self.idle_seconds(), 1)
+        }
+
+
+class SessionManager:
+    """Thread-safe registry of streaming sessions with idle eviction"""
+
+    def __init__(self, idle_timeout: float = 60.0, max_sessions: int = 64,
+                 session_factory=GestureSession):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.session_factory = session_factory
+        self._sessions: Dict[str, GestureSession] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self.evicted = 0
+
+    def get_or_create(self, session_id: Optional[str] = None) -> GestureSession:
+        """Return the session with this id, creating it if needed"""
+        self._maybe_evict()
+        evicted = None
+        with self._lock:
+            session = self._sessions.get(session_id) if session_id else None
+            if session is None:
+                if len(self._sessions) >= self.max_sessions:
+                    evicted = self._evict_oldest_locked()
+                session = self.session_factory(session_id or uuid.uuid4().hex)
+                self._sessions[session.session_id] = session
+            session.touch()
+        # Closing waits for the evicted session's current frame, so not under the registry lock
+        if evicted is not None:
+            evicted.close()
+        return session
+
+    def get(self, session_id: str) -> Optional[GestureSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def close(self, session_id: str) -> bool:
+        """Remove a session and release its resources"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def close_session(self, session: GestureSession):
+        """Close a session object, whether or not it is still registered (e.g. after eviction)"""
+        with self._lock:
+            if self._sessions.get(session.session_id) is session:
+                del self._sessions[session.session_id]
+        session.close()
+
+    def evict_idle(self) -> int:
+        """Close every session idle for longer than idle_timeout"""
+        with self._lock:
+            expired = [s for s in self._sessions.values() if s.idle_seconds() > self.idle_timeout]
+            for session in expired:
+                del self._sessions[session.session_id]
+            self._last_sweep = time.time()
+        for session in expired:
+            session.close()
+        self.evicted += len(expired)
+        if expired:
+            print(f"[*] Evicted {len(expired)} idle gesture session(s)")
+        return len(expired)
+
+    def _maybe_evict(self):
+        # Sweep at most a few times per idle period to keep lookups cheap
+        if time.time() - self._last_sweep > min(self.idle_timeout / 4, 15.0):
+            self.evict_idle()
+
+    def _evict_oldest_locked(self) -> GestureSession:
+        """Unregister the least recently seen session; the caller closes it after releasing the lock"""
+        oldest = min(self._sessions.values(), key=lambda s: s.last_seen)
+        del self._sessions[oldest.session_id]
+        self.evicted += 1
+        return oldest
+
+    def sessions(self) -> List[GestureSession]:
+        with self._lock:
+            return list(self._sessions.values())
+
+    def stats(self) -> Dict:
+        sessions = self.sessions()
+        return {
+            'active': len(sessions),
+            'max_sessions': self.max_sessions,
+            'idle_timeout_seconds': self.idle_timeout,
+            'evicted': self.evicted,
+            'frames_processed': sum(s.frames_processed for s in sessions)
+        }
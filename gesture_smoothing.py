@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Per-session temporal smoothing for gesture predictions
+Each tracked hand keeps fixed-size ring buffers of its recent labels and
+confidences and reports their majority vote. Once a gesture has been held
+with high confidence it is "locked": later frames whose landmarks barely
+moved reuse the locked label without running the classifier.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from gesture_features import as_points, normalize_points
+
+
+class StableLockStats:
+    """Classifier calls saved by stable locks, shared by every session"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.classified = 0
+        self.locks = 0
+        self.unlocks = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.classified += 1
+
+    def record_lock(self, locked: bool):
+        with self._lock:
+            if locked:
+                self.locks += 1
+            else:
+                self.unlocks += 1
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.classified
+            return {
+                'hits': self.hits,
+                'classified': self.classified,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'locks': self.locks,
+                'unlocks': self.unlocks
+            }
+
+
+class GestureSmoother:
+    """Majority vote over one hand's last `window` predictions, plus a stable lock
+
+    The vote picks the most frequent recent label (ties go to the label with
+    the higher summed confidence); its confidence is the recency-weighted mean
+    of that label's confidences. The lock engages once the vote has returned
+    the same label for `lock_frames` frames at `lock_confidence` or more. While
+    locked, a frame whose palm-normalized landmarks are within
+    `lock_tolerance` of the locked pose reuses the label; at most
+    `max_lock_frames` frames in a row, after which the classifier re-checks.
+    """
+
+    def __init__(self, window: int = 5, lock_enabled: bool = True, lock_confidence: float = 0.85,
+                 lock_frames: int = 3, lock_tolerance: float = 0.05, max_lock_frames: int = 30,
+                 stats: Optional[StableLockStats] = None):
+        self.window = max(1, window)
+        self.lock_enabled = lock_enabled
+        self.lock_confidence = lock_confidence
+        self.lock_frames = max(1, lock_frames)
+        self.lock_tolerance = lock_tolerance
+        self.max_lock_frames = max_lock_frames
+        self.stats = stats or StableLockStats()
+        self.labels = deque(maxlen=self.window)
+        self.confidences = deque(maxlen=self.window)
+        # Recency weights for a full buffer (oldest first), as the old global smoother used
+        self._weights = np.exp(np.linspace(-1, 0, self.window))
+        self._streak_label = None
+        self._streak = 0
+        self._locked: Optional[Tuple[str, float]] = None
+        self._locked_pose = None
+        self._locked_for = 0
+
+    @staticmethod
+    def _pose(landmarks) -> np.ndarray:
+        return normalize_points(as_points(landmarks))[0, :, :2]
+
+    @property
+    def locked(self) -> bool:
+        return self._locked is not None
+
+    def locked_result(self, landmarks) -> Optional[Tuple[str, float]]:
+        """The locked (label, confidence) if this frame's hand still matches the locked pose"""
+        if self._locked is None:
+            return None
+        drift = float(np.abs(self._pose(landmarks) - self._locked_pose).max())
+        if drift > self.lock_tolerance or self._locked_for >= self.max_lock_frames:
+            self.unlock()
+            return None
+        self._locked_for += 1
+        label, confidence = self._locked
+        self.labels.append(label)
+        self.confidences.append(confidence)
+        self.stats.record(True)
+        return self._locked
+
+    def update(self, label: str, confidence: float, landmarks=None) -> Tuple[str, float]:
+        """Add a classifier prediction and return the smoothed (label, confidence)"""
+        self.stats.record(False)
+        self.labels.append(label)
+        self.confidences.append(float(confidence))
+        voted_label, voted_confidence = self.vote()
+
+        if voted_label == self._streak_label:
+            self._streak += 1
+        else:
+            self._streak_label, self._streak = voted_label, 1
+
+        if (self.lock_enabled and landmarks is not None and self._locked is None
+                and self._streak >= self.lock_frames and voted_confidence >= self.lock_confidence
+                and label == voted_label):
+            self._locked = (voted_label, voted_confidence)
+            self._locked_pose = self._pose(landmarks)
+            self._locked_for = 0
+            self.stats.record_lock(True)
+        return voted_label, voted_confidence
+
+    def vote(self) -> Tuple[Optional[str], float]:
+        if not self.labels:
+            return None, 0.0
+        labels = list(self.labels)
+        confidences = np.fromiter(self.confidences, dtype=np.float64, count=len(labels))
+        weights = self._weights[-len(labels):]
+
+        counts: Dict[str, int] = {}
+        totals: Dict[str, float] = {}
+        for label, confidence in zip(labels, confidences):
+            counts[label] = counts.get(label, 0) + 1
+            totals[label] = totals.get(label, 0.0) + confidence
+        winner = max(counts, key=lambda name: (counts[name], totals[name]))
+
+        mask = np.fromiter((label == winner for label in labels), dtype=bool, count=len(labels))
+        confidence = float(np.sum(confidences[mask] * weights[mask]) / np.sum(weights[mask]))
+        return winner, confidence
+
+    def unlock(self):
+        if self._locked is not None:
+            self.stats.record_lock(False)
+        self._locked = None
+        self._locked_pose = None
+        self._locked_for = 0
+
+    def reset(self):
+        self.labels.clear()
+        self.confidences.clear()
+        self._streak_label, self._streak = None, 0
+        self.unlock()
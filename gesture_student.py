@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Compact student classifier distilled from the gesture RandomForest
+A one-hidden-layer NumPy MLP (or a multinomial linear model) trained on the
+forest's soft labels, stored as a small .npz and served without scikit-learn
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from gesture_features import LEGACY_FEATURE_SPEC
+
+STUDENT_FORMAT_VERSION = 1
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+class StudentClassifier:
+    """Standardize -> [dense + ReLU] -> dense -> softmax
+
+    Exposes the parts of the scikit-learn classifier API the server uses
+    (predict_proba, predict, classes_, n_features_in_, feature_spec_), so it
+    can be served in place of the forest. With no hidden layer it is a
+    multinomial logistic regression on the engineered features.
+    """
+
+    def __init__(self, mean, scale, weights, biases, classes, feature_spec: str = LEGACY_FEATURE_SPEC,
+                 labels: Optional[List[str]] = None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.classes_ = np.asarray(classes)
+        self.n_classes_ = len(self.classes_)
+        self.n_features_in_ = int(self.mean.shape[0])
+        self.feature_spec_ = feature_spec
+        # Label names indexed by class value, so a student can be served without a class map
+        self.labels = list(labels) if labels is not None else []
+
+    @property
+    def hidden_units(self) -> int:
+        return int(self.weights[0].shape[1]) if len(self.weights) > 1 else 0
+
+    def _forward(self, X: np.ndarray) -> np.ndarray:
+        hidden = (np.asarray(X, dtype=np.float32).reshape(-1, self.n_features_in_) - self.mean) / self.scale
+        for weights, bias in zip(self.weights[:-1], self.biases[:-1]):
+            hidden = np.maximum(hidden @ weights + bias, 0.0)
+        return hidden @ self.weights[-1] + self.biases[-1]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return _softmax(self._forward(X)).astype(np.float64)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self._forward(X), axis=1)]
+
+    def memory_bytes(self) -> int:
+        arrays = [self.mean, self.scale] + self.weights + self.biases
+        return int(sum(a.nbytes for a in arrays))
+
+    def describe(self) -> Dict:
+        return {
+            'type': 'mlp' if self.hidden_units else 'linear',
+            'hidden_units': self.hidden_units,
+            'features': self.n_features_in_,
+            'classes': self.n_classes_,
+            'feature_spec': self.feature_spec_,
+            'memory_bytes': self.memory_bytes()
+        }
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays for model_artifact.py (everything but the scalar metadata)"""
+        arrays = {'mean': self.mean, 'scale': self.scale, 'classes': self.classes_}
+        for i, (weights, bias) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'W{i}'] = weights
+            arrays[f'b{i}'] = bias
+        return arrays
+
+    def metadata(self) -> Dict:
+        return {'n_layers': len(self.weights), 'hidden_units': self.hidden_units}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], metadata: Dict, feature_spec: str = LEGACY_FEATURE_SPEC,
+                    labels: Optional[List[str]] = None) -> 'StudentClassifier':
+        n_layers = int(metadata['n_layers'])
+        return cls(arrays['mean'], arrays['scale'],
+                   [arrays[f'W{i}'] for i in range(n_layers)],
+                   [arrays[f'b{i}'] for i in range(n_layers)],
+                   arrays['classes'], feature_spec, labels)
+
+    def save(self, path: str):
+        arrays = {'mean': self.mean, 'scale': self.scale, 'classes': self.classes_,
+                  'feature_spec': np.asarray(self.feature_spec_),
+                  'format_version': np.asarray(STUDENT_FORMAT_VERSION),
+                  'n_layers': np.asarray(len(self.weights)),
+                  'labels': np.asarray(self.labels, dtype=str)}
+        for i, (weights, bias) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'W{i}'] = weights
+            arrays[f'b{i}'] = bias
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'StudentClassifier':
+        data = np.load(path, allow_pickle=False)
+        version = int(data['format_version'])
+        if version > STUDENT_FORMAT_VERSION:
+            raise ValueError(f"{path} uses student format {version}, this server supports {STUDENT_FORMAT_VERSION}")
+        n_layers = int(data['n_layers'])
+        return cls(data['mean'], data['scale'],
+                   [data[f'W{i}'] for i in range(n_layers)],
+                   [data[f'b{i}'] for i in range(n_layers)],
+                   data['classes'], str(data['feature_spec']),
+                   [str(label) for label in data['labels']])
+
+
+def train_student(X: np.ndarray, soft_targets: np.ndarray, classes, feature_spec: str = LEGACY_FEATURE_SPEC,
+                  hidden_units: int = 64, epochs: int = 200, batch_size: int = 256,
+                  learning_rate: float = 0.005, weight_decay: float = 1e-4, seed: int = 0,
+                  X_val: Optional[np.ndarray] = None, y_val: Optional[np.ndarray] = None,
+                  labels: Optional[List[str]] = None, verbose: bool = True) -> StudentClassifier:
+    """Fit a student to the teacher's class probabilities with soft cross-entropy (Adam)
+
+    soft_targets columns follow `classes`. hidden_units=0 trains a linear
+    softmax model. When a validation set is given, the weights from the
+    epoch with the best validation accuracy are kept.
+    """
+    rng = np.random.default_rng(seed)
+    X = np.asarray(X, dtype=np.float64)
+    targets = np.asarray(soft_targets, dtype=np.float64)
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale < 1e-6] = 1.0
+    Z = (X - mean) / scale
+
+    sizes = [X.shape[1]] + ([hidden_units] if hidden_units else []) + [targets.shape[1]]
+    # He initialization for ReLU layers
+    weights = [rng.normal(0.0, np.sqrt(2.0 / n_in), (n_in, n_out)) for n_in, n_out in zip(sizes[:-1], sizes[1:])]
+    biases = [np.zeros(n_out) for n_out in sizes[1:]]
+    params = weights + biases
+    moments = [np.zeros_like(p) for p in params]
+    velocities = [np.zeros_like(p) for p in params]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+
+    def snapshot():
+        return StudentClassifier(mean, scale, weights, biases, classes, feature_spec, labels)
+
+    best, best_accuracy = None, -1.0
+    for epoch in range(epochs):
+        order = rng.permutation(len(Z))
+        epoch_loss = 0.0
+        for start in range(0, len(Z), batch_size):
+            rows = order[start:start + batch_size]
+            activations = [Z[rows]]
+            for W, b in zip(weights[:-1], biases[:-1]):
+                activations.append(np.maximum(activations[-1] @ W + b, 0.0))
+            proba = _softmax(activations[-1] @ weights[-1] + biases[-1])
+            target = targets[rows]
+            epoch_loss -= np.sum(target * np.log(proba + 1e-12))
+
+            grad = (proba - target) / len(rows)
+            grad_w, grad_b = [None] * len(weights), [None] * len(biases)
+            for layer in range(len(weights) - 1, -1, -1):
+                grad_w[layer] = activations[layer].T @ grad + weight_decay * weights[layer]
+                grad_b[layer] = grad.sum(axis=0)
+                if layer:
+                    grad = (grad @ weights[layer].T) * (activations[layer] > 0)
+
+            step += 1
+            for param, gradient, m, v in zip(params, grad_w + grad_b, moments, velocities):
+                m *= beta1
+                m += (1 - beta1) * gradient
+                v *= beta2
+                v += (1 - beta2) * gradient ** 2
+                m_hat = m / (1 - beta1 ** step)
+                v_hat = v / (1 - beta2 ** step)
+                param -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+
+        if X_val is not None and y_val is not None:
+            accuracy = float(np.mean(snapshot().predict(X_val) == y_val))
+            if accuracy > best_accuracy:
+                best_accuracy = accuracy
+                best = snapshot()
+        if verbose and (epoch + 1) % max(1, epochs // 10) == 0:
+            message = f"  Epoch {epoch + 1}/{epochs}: loss {epoch_loss / len(Z):.4f}"
+            if best is not None:
+                message += f", best val accuracy {best_accuracy * 100:.2f}%"
+            print(message)
+
+    return best if best is not None else snapshot()
@@ -0,0 +1,38 @@
+"""
+Gunicorn configuration for the gesture API servers
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+preload_app loads the models once in the master; workers are forked from it
+and share those pages copy-on-write. MediaPipe graphs are not fork-safe, so
+the master drops them before forking and every worker creates its own.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('GESTURE_WORKERS', str(os.cpu_count() or 2)))
+# Threads per worker serve concurrent frames and WebSocket streams (flask-sock)
+worker_class = 'gthread'
+threads = int(os.getenv('GESTURE_WORKER_THREADS', '4'))
+preload_app = True
+timeout = int(os.getenv('GESTURE_WORKER_TIMEOUT', '120'))
+graceful_timeout = 30
+
+# Read by the server module while it is preloaded
+os.environ.setdefault('GESTURE_PREFORK', '1')
+# One IMAGE-mode landmarker per worker thread (the default is one per CPU, per process)
+os.environ.setdefault('GESTURE_LANDMARKER_POOL_SIZE', str(threads))
+
+
+def _server_module():
+    import wsgi  # Already imported by preload_app
+    return wsgi.load_server_module()
+
+
+def pre_fork(server, worker):
+    _server_module().prepare_for_fork()
+
+
+def post_fork(server, worker):
+    _server_module().reinitialize_after_fork()
+    server.log.info(f"Worker {worker.pid} initialized")
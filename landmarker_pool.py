@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+MediaPipe Hand Landmarker factory and pools for the gesture server
+IMAGE-mode landmarkers are checked out per request so concurrent frames
+run in parallel; tracking-mode (VIDEO) landmarkers are leased to streaming
+sessions so MediaPipe can follow hands between frames instead of re-running
+palm detection on every frame
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+HAND_LANDMARKER_TASK = "hand_landmarker.task"
+
+
+def create_hand_landmarker(running_mode: str = 'IMAGE', model_path: str = HAND_LANDMARKER_TASK,
+                           num_hands: int = 2):
+    """Create a MediaPipe HandLandmarker in the given running mode (IMAGE or VIDEO)"""
+    from mediapipe.tasks import python
+    from mediapipe.tasks.python import vision
+
+    base_options = python.BaseOptions(model_asset_path=model_path)
+    options = vision.HandLandmarkerOptions(
+        base_options=base_options,
+        running_mode=getattr(vision.RunningMode, running_mode),
+        min_hand_detection_confidence=0.5,
+        min_hand_presence_confidence=0.5,
+        min_tracking_confidence=0.5,
+        num_hands=num_hands
+    )
+    return vision.HandLandmarker.create_from_options(options)
+
+
+class LandmarkerPool:
+    """Fixed-size pool of IMAGE-mode landmarkers shared by request threads
+
+    A HandLandmarker instance must not be used by two threads at once, so
+    each request checks one out and returns it when done. Instances are
+    created lazily up to `size`; callers wait when all are busy.
+    """
+
+    def __init__(self, size: int = 2, model_path: str = HAND_LANDMARKER_TASK):
+        self.size = max(1, size)
+        self.model_path = model_path
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.total_wait_ms = 0.0
+        self.error = None
+
+    @property
+    def available(self) -> bool:
+        """True once at least one landmarker exists (see prime())"""
+        return self._created > 0
+
+    def prime(self) -> bool:
+        """Create the first landmarker so model errors surface at startup"""
+        with self._lock:
+            if self._created:
+                return True
+        landmarker = self._create()
+        if landmarker is None:
+            return False
+        self._idle.put(landmarker)
+        return True
+
+    def _create(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            return create_hand_landmarker('IMAGE', self.model_path)
+        except Exception as e:
+            with self._lock:
+                self._created -= 1
+            self.error = str(e)
+            print(f"[ERR] Hand Landmarker creation failed: {e}")
+            return None
+
+    @contextmanager
+    def checkout(self, timeout: float = 5.0):
+        """Borrow a landmarker for the duration of the with-block"""
+        try:
+            landmarker = self._idle.get_nowait()
+        except queue.Empty:
+            landmarker = self._create()
+            if landmarker is None:
+                wait_start = time.perf_counter()
+                try:
+                    landmarker = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No hand landmarker free after {timeout:.1f}s") from None
+                with self._lock:
+                    self.waits += 1
+                    self.total_wait_ms += (time.perf_counter() - wait_start) * 1000
+
+        with self._lock:
+            self.checkouts += 1
+        try:
+            yield landmarker
+        finally:
+            self._idle.put(landmarker)
+
+    def close(self):
+        """Close idle landmarkers (in-use ones are closed by their owners)"""
+        while True:
+            try:
+                landmarker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                landmarker.close()
+            except Exception as e:
+                print(f"[!] Error closing hand landmarker: {e}")
+            with self._lock:
+                self._created -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'idle': self._idle.qsize(),
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'avg_wait_ms': round(self.total_wait_ms / self.waits, 2) if self.waits else 0.0
+            }
+
+
+class TrackingLandmarker:
+    """VIDEO-mode landmarker fed with monotonically increasing timestamps"""
+
+    def __init__(self, landmarker, pool=None):
+        self.landmarker = landmarker
+        self.pool = pool
+        self.last_timestamp_ms = -1
+
+    def detect(self, mp_image):
+        """Detect hands, tracking them from the previous frame when possible"""
+        timestamp_ms = int(time.monotonic() * 1000)
+        if timestamp_ms <= self.last_timestamp_ms:
+            timestamp_ms = self.last_timestamp_ms + 1
+        self.last_timestamp_ms = timestamp_ms
+        return self.landmarker.detect_for_video(mp_image, timestamp_ms)
+
+    def release(self):
+        """Return this landmarker to its pool (or close it if it has none)"""
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            self.close()
+
+    def close(self):
+        try:
+            self.landmarker.close()
+        except Exception as e:
+            print(f"[!] Error closing tracking landmarker: {e}")
+
+
+class TrackingLandmarkerPool:
+    """Bounded pool of VIDEO-mode landmarkers leased to streaming sessions
+
+    Released landmarkers are kept for reuse by the next session, which
+    skips the model load cost. Timestamps stay monotonic per instance.
+    """
+
+    def __init__(self, max_instances: int = 8, model_path: str = HAND_LANDMARKER_TASK):
+        self.max_instances = max_instances
+        self.model_path = model_path
+        self._idle: List[TrackingLandmarker] = []
+        self._leased = 0
+        self._lock = threading.Lock()
+        self.created = 0
+        self.rejected = 0
+
+    def acquire(self) -> Optional[TrackingLandmarker]:
+        """Lease a tracking landmarker, or None when the pool is exhausted"""
+        with self._lock:
+            if self._idle:
+                self._leased += 1
+                return self._idle.pop()
+            if self._leased >= self.max_instances:
+                self.rejected += 1
+                return None
+            self._leased += 1
+
+        try:
+            tracker = TrackingLandmarker(create_hand_landmarker('VIDEO', self.model_path), pool=self)
+        except Exception as e:
+            print(f"[ERR] Tracking landmarker creation failed: {e}")
+            with self._lock:
+                self._leased -= 1
+                self.rejected += 1
+            return None
+
+        with self._lock:
+            self.created += 1
+        return tracker
+
+    def release(self, tracker: TrackingLandmarker):
+        with self._lock:
+            self._leased -= 1
+            self._idle.append(tracker)
+
+    def close(self):
+        """Close all idle landmarkers"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for tracker in idle:
+            tracker.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'max_instances': self.max_instances,
+                'leased': self._leased,
+                'idle': len(self._idle),
+                'created': self.created,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Lazily loaded server components
+Each subsystem (gesture model, hand landmarker, NLP, translation, document
+parsing, image proxy) registers the modules it imports, a loader and
+optionally a warm-up call. Nothing is imported until the first request that
+needs it or an explicit warmup; warmup also runs each component once on
+synthetic input, so the first real request does not pay for lazy
+initialization. Import, init and warm-up times are recorded per component.
+"""
+
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class Component:
+    """One subsystem: its imports, its loader, an optional warm-up call and the loaded value
+
+    States: idle -> loading -> loaded -> warming -> ready, or failed. Requests
+    only need a loaded component; warm() additionally runs `warmer(value)`
+    once (e.g. a blank frame through the landmarker) and is what makes a
+    component ready. Loading and warming each happen at most once;
+    concurrent callers wait for the first one. A failure (missing package,
+    broken model, warm-up error) is final and reported in to_dict(), the
+    same as an optional import failing at startup; only a failed warm-up
+    can be run again with retry_warm() once what it lacked has arrived.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], imports: Sequence[str] = (), description: str = '',
+                 warmer: Optional[Callable[[Any], Any]] = None):
+        self.name = name
+        self.loader = loader
+        self.imports = tuple(imports)
+        self.description = description
+        self.warmer = warmer
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self.state = 'idle'
+        self.value = None
+        self.error = None
+        self.import_ms = None
+        self.init_ms = None
+        self.warm_ms = None
+        self.loaded_at = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.state not in ('idle', 'loading')
+
+    @property
+    def ready(self) -> bool:
+        return self.state == 'ready'
+
+    def load(self) -> Any:
+        """The loaded value (loading it now if needed); None if loading failed"""
+        if self.loaded:
+            return self.value
+        with self._lock:
+            if self.loaded:
+                return self.value
+            self.state = 'loading'
+            start = time.perf_counter()
+            try:
+                for module in self.imports:
+                    importlib.import_module(module)
+                imported = time.perf_counter()
+                self.import_ms = round((imported - start) * 1000, 1)
+                value = self.loader()
+                self.init_ms = round((time.perf_counter() - imported) * 1000, 1)
+                self.value = value
+                self.state = 'loaded'
+                print(f"[OK] Component '{self.name}' loaded: import {self.import_ms}ms, init {self.init_ms}ms")
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                self.state = 'failed'
+                print(f"[!] Component '{self.name}' unavailable: {self.error}")
+            self.loaded_at = time.time()
+            return self.value
+
+    def warm(self) -> bool:
+        """Load, then run the warm-up call once; True when the component is ready"""
+        self.load()
+        with self._warm_lock:
+            if self.state != 'loaded':
+                return self.ready
+            self.state = 'warming'
+            start = time.perf_counter()
+            try:
+                if self.warmer is not None:
+                    self.warmer(self.value)
+                self.warm_ms = round((time.perf_counter() - start) * 1000, 1)
+                self.state = 'ready'
+                if self.warmer is not None:
+                    print(f"[OK] Component '{self.name}' warmed up in {self.warm_ms}ms")
+            except Exception as e:
+                # The loaded value stays usable; the component just never reports ready
+                self.error = f"warm-up failed: {type(e).__name__}: {e}"
+                self.state = 'failed'
+                print(f"[!] Component '{self.name}' {self.error}")
+            return self.ready
+
+    def retry_warm(self) -> bool:
+        """Run the warm-up again if it failed after a successful load; True when the component is ready"""
+        with self._warm_lock:
+            # init_ms is only set by a successful load
+            if self.state != 'failed' or self.init_ms is None:
+                return self.ready
+            self.state = 'loaded'
+            self.error = None
+        return self.warm()
+
+    def reset(self):
+        """Forget the loaded value (e.g. handles that did not survive a fork); the next use loads again"""
+        with self._lock, self._warm_lock:
+            self._clear()
+
+    def to_dict(self) -> Dict:
+        return {
+            'state': self.state,
+            'ready': self.ready,
+            'description': self.description,
+            'imports': list(self.imports),
+            'import_ms': self.import_ms,
+            'init_ms': self.init_ms,
+            'warm_ms': self.warm_ms,
+            'error': self.error
+        }
+
+
+class ComponentRegistry:
+    """Named components, loaded on first get() or loaded and warmed by warmup()"""
+
+    def __init__(self):
+        self._components: Dict[str, Component] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], imports: Sequence[str] = (),
+                 description: str = '', warmer: Optional[Callable[[Any], Any]] = None) -> Component:
+        component = Component(name, loader, imports, description, warmer)
+        self._components[name] = component
+        return component
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._components)
+
+    def component(self, name: str) -> Component:
+        return self._components[name]
+
+    def get(self, name: str) -> Any:
+        """The loaded component (loading it now if needed); None if it failed to load"""
+        return self._components[name].load()
+
+    def peek(self, name: str) -> Any:
+        """The component if it is already loaded, without triggering a load"""
+        component = self._components[name]
+        return component.value if component.loaded else None
+
+    def state(self, name: str) -> str:
+        return self._components[name].state
+
+    def ready(self, names: Optional[Sequence[str]] = None) -> bool:
+        """Whether every named component (default: all) is loaded and warmed"""
+        names = names if names is not None else self.names
+        return all(self._components[name].ready for name in names)
+
+    def reset(self, name: str):
+        self._components[name].reset()
+
+    def resolve(self, spec: Optional[str]) -> List[str]:
+        """'all', '' / 'none', or a comma-separated list of names -> registered component names"""
+        spec = (spec or '').strip().lower()
+        if spec in ('', 'none'):
+            return []
+        if spec == 'all':
+            return self.names
+        names = [name.strip() for name in spec.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self._components]
+        if unknown:
+            print(f"[!] Unknown component(s) ignored: {', '.join(unknown)}")
+        return [name for name in names if name in self._components]
+
+    def warmup(self, names: Optional[Sequence[str]] = None, background: bool = False) -> Optional[threading.Thread]:
+        """Load and warm `names` (default: every component) in order, optionally in a daemon thread"""
+        names = list(names) if names is not None else self.names
+
+        def run():
+            start = time.perf_counter()
+            for name in names:
+                self._components[name].warm()
+            if names:
+                ready = [name for name in names if self._components[name].ready]
+                print(f"[OK] Warmup finished in {(time.perf_counter() - start) * 1000:.0f}ms "
+                      f"({len(ready)}/{len(names)} ready)")
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name='component-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict:
+        return {name: component.to_dict() for name, component in self._components.items()}
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Versioned, memory-mappable gesture model artifacts
+An artifact is a directory with one uncompressed .npy file per model array and
+a manifest.json holding the format version, model version, model type, label
+list and feature spec. Arrays are opened with np.load(mmap_mode='r'), so loading
+is near-instant and every worker process shares the same page-cache pages
+instead of holding a private unpickled copy.
+
+Each save writes a new version subdirectory and then switches the CURRENT
+pointer file to it with os.replace, so the live version never disappears
+(also on Windows, where mapped files cannot be renamed). Directories with the
+manifest at the top level (the original flat layout) are still readable.
+
+Usage:
+    python model_artifact.py export gesture_classifier.pkl --class-map gesture_class_map.pkl \\
+        --output models/gesture_classifier
+    python model_artifact.py inspect models/gesture_classifier
+    python model_artifact.py verify models/gesture_classifier
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+import uuid
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from forest_engine import CompiledForest, compile_forest
+from gesture_cascade import CascadeClassifier
+from gesture_features import LEGACY_FEATURE_SPEC
+from gesture_prototypes import PrototypeClassifier
+from gesture_student import StudentClassifier
+
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+# Pointer file in the artifact directory naming the live version subdirectory
+POINTER_NAME = 'CURRENT'
+# Superseded version subdirectories kept after a save (a running server may still map them)
+KEEP_OLD_VERSIONS = 1
+# Labels the server always exposes, even when the trained model has no such class
+EXTRA_LABELS = ('LOVE_YOU',)
+# Labels used when a legacy model comes without a readable class map
+DEFAULT_LABELS = list("123456") + list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+MODEL_TYPES = {
+    'compiled_forest': CompiledForest,
+    'student': StudentClassifier,
+    'cascade': CascadeClassifier,
+    'prototype': PrototypeClassifier,
+}
+
+
+class LoadedArtifact(NamedTuple):
+    model: object
+    labels: List[str]
+    feature_spec: str
+    manifest: Dict
+
+
+def labels_from_class_map(class_map) -> List[str]:
+    """Label list indexed by class value from any class-map format the training scripts write
+
+    Accepts {idx: name}, {'class_to_idx': ..., 'idx_to_class': ...} and plain lists.
+    """
+    if isinstance(class_map, dict) and 'idx_to_class' in class_map:
+        class_map = class_map['idx_to_class']
+    if isinstance(class_map, dict):
+        return [str(class_map[i]) for i in sorted(class_map.keys())]
+    return [str(label) for label in class_map]
+
+
+def with_extra_labels(labels: List[str]) -> List[str]:
+    labels = list(labels)
+    for extra in EXTRA_LABELS:
+        if extra not in labels:
+            labels.append(extra)
+    return labels
+
+
+def read_class_map(path: str) -> List[str]:
+    with open(path, 'rb') as f:
+        return labels_from_class_map(pickle.load(f))
+
+
+def _model_type(model) -> str:
+    for name, cls in MODEL_TYPES.items():
+        if isinstance(model, cls):
+            return name
+    raise TypeError(f"Cannot export {type(model).__name__}; compile forests with forest_engine first")
+
+
+def _content_version(arrays: Dict[str, np.ndarray], manifest: Dict) -> str:
+    """Hash of everything that changes predictions: the arrays plus type, labels, feature spec and metadata"""
+    digest = hashlib.sha256()
+    for name in sorted(arrays):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    described = {key: manifest[key] for key in ('model_type', 'feature_spec', 'labels', 'metadata')}
+    digest.update(json.dumps(described, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:12]
+
+
+def resolve_artifact(path: str) -> str:
+    """Directory holding the live manifest: the version CURRENT points to, else `path` itself"""
+    try:
+        with open(os.path.join(path, POINTER_NAME), 'r', encoding='utf-8') as f:
+            name = f.read().strip()
+    except OSError:
+        return path
+    return os.path.join(path, name) if name else path
+
+
+def _prune_versions(path: str, live: str):
+    """Best effort: drop old version subdirectories and files of the flat layout"""
+    versions = [entry for entry in os.scandir(path)
+                if entry.is_dir() and entry.name != live and os.path.isfile(os.path.join(entry.path, MANIFEST_NAME))]
+    versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in versions[KEEP_OLD_VERSIONS:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+    flat_manifest = os.path.join(path, MANIFEST_NAME)
+    if os.path.isfile(flat_manifest):
+        try:
+            with open(flat_manifest, 'r', encoding='utf-8') as f:
+                files = [spec['file'] for spec in json.load(f).get('arrays', {}).values()]
+            for name in files + [MANIFEST_NAME]:
+                os.remove(os.path.join(path, name))
+        except (OSError, ValueError, KeyError):
+            pass
+
+
+def save_artifact(model, path: str, labels: List[str], feature_spec: Optional[str] = None,
+                  version: Optional[str] = None, source: Optional[str] = None) -> Dict:
+    """Write `model` (any MODEL_TYPES class) as a new version of the artifact at `path`
+
+    The version is written to its own subdirectory, then the CURRENT pointer is
+    replaced atomically, so a reader never sees a half-written artifact and
+    the previous version stays in place until it is pruned. Returns the manifest.
+    """
+    model_type = _model_type(model)
+    arrays = model.to_arrays()
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'version': version,
+        'model_type': model_type,
+        'feature_spec': feature_spec or getattr(model, 'feature_spec_', LEGACY_FEATURE_SPEC),
+        'labels': with_extra_labels(labels),
+        'n_classes': int(len(model.classes_)),
+        'n_features_in': int(model.n_features_in_),
+        'metadata': model.metadata(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'source': source,
+        'arrays': {}
+    }
+    if manifest['version'] is None:
+        manifest['version'] = _content_version(arrays, manifest)
+
+    path = os.path.normpath(path)
+    live = f"{manifest['version']}-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    target = os.path.join(path, live)
+    os.makedirs(target)
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        np.save(os.path.join(target, f"{name}.npy"), array, allow_pickle=False)
+        manifest['arrays'][name] = {
+            'file': f"{name}.npy",
+            'dtype': str(array.dtype),
+            'shape': list(array.shape),
+            'sha256': hashlib.sha256(array.tobytes()).hexdigest()
+        }
+    with open(os.path.join(target, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    pointer = os.path.join(path, f"{POINTER_NAME}.tmp-{os.getpid()}")
+    with open(pointer, 'w', encoding='utf-8') as f:
+        f.write(live)
+    os.replace(pointer, os.path.join(path, POINTER_NAME))
+    _prune_versions(path, live)
+    return manifest
+
+
+def read_manifest(path: str) -> Dict:
+    path = resolve_artifact(path)
+    with open(os.path.join(path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format_version', 0) > ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"{path} uses artifact format {manifest['format_version']}, "
+                         f"this server supports {ARTIFACT_FORMAT_VERSION}")
+    if manifest.get('model_type') not in MODEL_TYPES:
+        raise ValueError(f"{path} has unknown model type '{manifest.get('model_type')}'")
+    return manifest
+
+
+def is_artifact(path: str) -> bool:
+    return os.path.isfile(os.path.join(resolve_artifact(path), MANIFEST_NAME))
+
+
+def load_artifact(path: str, mmap: bool = True) -> LoadedArtifact:
+    """Open an artifact; with mmap=True arrays stay in the page cache, shared across processes"""
+    path = resolve_artifact(path)
+    manifest = read_manifest(path)
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        array = np.load(os.path.join(path, spec['file']), mmap_mode='r' if mmap else None, allow_pickle=False)
+        if list(array.shape) != spec['shape'] or str(array.dtype) != spec['dtype']:
+            raise ValueError(f"{path}/{spec['file']} does not match the manifest")
+        # Plain ndarray view of the mapping: no memmap subclass overhead during inference
+        arrays[name] = np.asarray(array)
+
+    cls = MODEL_TYPES[manifest['model_type']]
+    if cls is StudentClassifier:
+        model = cls.from_arrays(arrays, manifest['metadata'], manifest['feature_spec'], manifest['labels'])
+    elif cls in (CascadeClassifier, PrototypeClassifier):
+        model = cls.from_arrays(arrays, manifest['metadata'], manifest['feature_spec'])
+    else:
+        model = cls.from_arrays(arrays, manifest['metadata'])
+    model.feature_spec_ = manifest['feature_spec']
+    return LoadedArtifact(model, list(manifest['labels']), manifest['feature_spec'], manifest)
+
+
+def verify_artifact(path: str) -> List[str]:
+    """Check every array against its manifest checksum; returns the names that differ"""
+    path = resolve_artifact(path)
+    manifest = read_manifest(path)
+    mismatched = []
+    for name, spec in manifest['arrays'].items():
+        array = np.load(os.path.join(path, spec['file']), mmap_mode='r', allow_pickle=False)
+        if hashlib.sha256(np.ascontiguousarray(array).tobytes()).hexdigest() != spec['sha256']:
+            mismatched.append(name)
+    return mismatched
+
+
+def export_model(model, path: str, labels: List[str], source: Optional[str] = None) -> Optional[Dict]:
+    """Export a fitted RandomForestClassifier or a student; forests are compiled and self-checked first"""
+    feature_spec = getattr(model, 'feature_spec_', LEGACY_FEATURE_SPEC)
+    if hasattr(model, 'estimators_'):
+        model = compile_forest(model)
+        if model is None:
+            return None
+    return save_artifact(model, path, labels, feature_spec=feature_spec, source=source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export, inspect and verify gesture model artifacts")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Convert a pickled forest or a student .npz into an artifact")
+    export.add_argument('model', help="gesture_classifier*.pkl or gesture_student.npz")
+    export.add_argument('--class-map', help="Pickled class map (default: labels stored in the student, or 1-6 A-Z)")
+    export.add_argument('--output', default=os.path.join('models', 'gesture_classifier'))
+
+    inspect = commands.add_parser('inspect', help="Print an artifact's manifest")
+    inspect.add_argument('path')
+
+    verify = commands.add_parser('verify', help="Check array checksums")
+    verify.add_argument('path')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        if args.model.endswith('.npz'):
+            model = StudentClassifier.load(args.model)
+            labels = model.labels
+        else:
+            with open(args.model, 'rb') as f:
+                model = pickle.load(f)
+            labels = DEFAULT_LABELS
+        if args.class_map:
+            labels = read_class_map(args.class_map)
+        start = time.perf_counter()
+        manifest = export_model(model, args.output, labels, source=os.path.basename(args.model))
+        if manifest is None:
+            print("[ERR] Export failed")
+            sys.exit(1)
+        print(f"[OK] Exported {args.model} -> {args.output} in {(time.perf_counter() - start) * 1000:.0f}ms")
+        print(f"[OK] Version {manifest['version']}, {manifest['model_type']}, {len(manifest['labels'])} labels, "
+              f"features '{manifest['feature_spec']}'")
+
+        start = time.perf_counter()
+        load_artifact(args.output)
+        print(f"[*] Memory-mapped load: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    elif args.command == 'inspect':
+        manifest = read_manifest(args.path)
+        summary = {key: value for key, value in manifest.items() if key != 'arrays'}
+        summary['arrays'] = {name: f"{spec['dtype']}{tuple(spec['shape'])}" for name, spec in manifest['arrays'].items()}
+        print(json.dumps(summary, indent=2))
+
+    elif args.command == 'verify':
+        mismatched = verify_artifact(args.path)
+        if mismatched:
+            print(f"[ERR] Checksum mismatch: {', '.join(mismatched)}")
+            sys.exit(1)
+        print(f"[OK] {args.path}: all arrays match the manifest")
+
+
+if __name__ == '__main__':
+    main()
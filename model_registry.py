@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Hot-reloadable gesture model registry
+Loads new model artifacts in the background, warms them with synthetic
+predictions and swaps them in atomically. Requests take one snapshot of the
+active model, so in-flight frames finish on the model they started with.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from gesture_features import NUM_LANDMARKS, extract_features
+from model_artifact import MANIFEST_NAME, is_artifact, load_artifact, read_manifest, resolve_artifact
+
+
+class ModelBundle(NamedTuple):
+    """Everything needed to classify with one model version (never mutated)"""
+    model: object
+    labels: List[str]
+    feature_spec: str
+    version: Optional[str]
+    engine: str
+    source: str
+    loaded_at: float
+
+
+def warm_up(bundle: ModelBundle, samples: int = 16, seed: int = 0) -> float:
+    """Run synthetic predictions through a bundle and sanity-check the output; returns ms
+
+    Touches every code path a request uses (feature extraction, predict_proba,
+    label lookup) and, for memory-mapped artifacts, faults in the pages.
+    """
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    landmarks = rng.uniform(0.2, 0.8, size=(samples, NUM_LANDMARKS, 3))
+    features = extract_features(landmarks, bundle.feature_spec)
+    for row in range(samples):
+        # Single rows first: the shape live traffic mostly has
+        bundle.model.predict_proba(features[row:row + 1])
+    probabilities = bundle.model.predict_proba(features)
+
+    if probabilities.shape != (samples, len(bundle.model.classes_)):
+        raise ValueError(f"predict_proba returned shape {probabilities.shape}")
+    if not np.all(np.isfinite(probabilities)):
+        raise ValueError("predict_proba returned non-finite values")
+    largest_class = int(np.max(bundle.model.classes_))
+    if largest_class >= len(bundle.labels):
+        raise ValueError(f"label list has {len(bundle.labels)} entries, model predicts class {largest_class}")
+    return (time.perf_counter() - start) * 1000
+
+
+class ModelRegistry:
+    """Holds the active ModelBundle and replaces it without a restart
+
+    Reloads come from `reload()` (admin endpoint) or from `watch()`, which
+    polls the artifact directory's manifest version. A new bundle is only
+    installed after it loaded and passed warm-up; on any error the current
+    model keeps serving and the error is reported in stats().
+    """
+
+    def __init__(self, artifact_path: str, warmup_samples: int = 16,
+                 model_wrapper: Optional[Callable[[object], object]] = None,
+                 on_install: Optional[Callable[[ModelBundle], None]] = None):
+        self.artifact_path = artifact_path
+        self.warmup_samples = warmup_samples
+        # Applied to every freshly loaded model, e.g. to serve forests with early exit
+        self.model_wrapper = model_wrapper
+        # Called after a bundle becomes active, e.g. to mark the server ready once a first model arrives
+        self.on_install = on_install
+        self._active: Optional[ModelBundle] = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self.state = 'empty'
+        self.reloads = 0
+        self.last_error = None
+        self.last_reload_ms = None
+        self.watch_interval = 0.0
+
+    @property
+    def active(self) -> Optional[ModelBundle]:
+        return self._active
+
+    def install(self, bundle: ModelBundle, warm: bool = True):
+        """Warm a bundle (raising if it fails) and make it the active model"""
+        if warm:
+            warm_up(bundle, self.warmup_samples)
+        with self._lock:
+            previous = self._active
+            # A single reference assignment: readers see the old or the new bundle, never a mix
+            self._active = bundle
+            self.state = 'ready'
+            if previous is not None:
+                self.reloads += 1
+        if self.on_install is not None:
+            self.on_install(bundle)
+        return previous
+
+    def load_bundle(self, path: Optional[str] = None) -> ModelBundle:
+        path = path or self.artifact_path
+        artifact = load_artifact(path)
+        manifest = artifact.manifest
+        model = artifact.model
+        if self.model_wrapper is not None:
+            model = self.model_wrapper(model)
+        return ModelBundle(
+            model=model,
+            labels=artifact.labels,
+            feature_spec=artifact.feature_spec,
+            version=manifest['version'],
+            engine='compiled' if manifest['model_type'] == 'compiled_forest' else manifest['model_type'],
+            source=os.path.abspath(path),
+            loaded_at=time.time()
+        )
+
+    def reload(self, path: Optional[str] = None, background: bool = True) -> bool:
+        """Load, warm and swap in the artifact at `path`; False if a reload is already running"""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        if background:
+            threading.Thread(target=self._reload, args=(path,), name='model-reload', daemon=True).start()
+        else:
+            self._reload(path)
+        return True
+
+    def _reload(self, path: Optional[str]):
+        start = time.perf_counter()
+        self.state = 'loading'
+        try:
+            bundle = self.load_bundle(path)
+            previous = self.install(bundle)
+            self.last_error = None
+            self.last_reload_ms = round((time.perf_counter() - start) * 1000, 1)
+            old_version = previous.version if previous else None
+            print(f"[OK] Gesture model swapped: {old_version} -> {bundle.version} ({self.last_reload_ms}ms)")
+        except Exception as e:
+            self.last_error = str(e)
+            self.state = 'ready' if self._active is not None else 'empty'
+            print(f"[!] Gesture model reload failed, keeping the current model: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def watch(self, interval: float):
+        """Poll the artifact manifest every `interval` seconds and reload when its version changes"""
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self.watch_interval = interval
+        self._watcher = threading.Thread(target=self._watch, name='model-watcher', daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        last_stamp = None
+        while not self._stop.wait(self.watch_interval):
+            # Follows the CURRENT pointer, so switching versions counts as a change
+            manifest_path = os.path.join(resolve_artifact(self.artifact_path), MANIFEST_NAME)
+            try:
+                stamp = (manifest_path, os.path.getmtime(manifest_path))
+            except OSError:
+                continue
+            if stamp == last_stamp or not is_artifact(self.artifact_path):
+                continue
+            try:
+                version = read_manifest(self.artifact_path)['version']
+            except Exception as e:
+                self.last_error = f"Unreadable manifest: {e}"
+                continue
+            active = self._active
+            if active is None or active.version != version:
+                # Busy (an admin reload is running) or failed: look again on the next poll
+                if self._reload_lock.locked():
+                    continue
+                print(f"[*] New gesture model {version} found in {self.artifact_path}, reloading...")
+                if not self.reload(background=False):
+                    continue
+                active = self._active
+                if active is None or active.version != version:
+                    continue
+            last_stamp = stamp
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        active = self._active
+        return {
+            'state': self.state,
+            'version': active.version if active else None,
+            'engine': active.engine if active else None,
+            'source': active.source if active else None,
+            'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(active.loaded_at)) if active else None,
+            'classes': len(active.labels) if active else 0,
+            'feature_spec': active.feature_spec if active else None,
+            'reloads': self.reloads,
+            'last_reload_ms': self.last_reload_ms,
+            'last_error': self.last_error,
+            'artifact_path': self.artifact_path,
+            'watch_interval_s': self.watch_interval
+        }
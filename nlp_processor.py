@@ -25,28 +25,15 @@ except ImportError:
 try:
     import nltk
     from nltk.tokenize import word_tokenize, sent_tokenize
-    from nltk.corpus import stopwords
-    from nltk.sentiment import SentimentIntensityAnalyzer
+    from nltk_resources import bootstrap_nltk_data, get_sentiment_analyzer, get_stopwords
     
-    # Download required NLTK data
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt', quiet=True)
-    
-    try:
-        nltk.data.find('sentiment/vader_lexicon')
-    except LookupError:
-        nltk.download('vader_lexicon', quiet=True)
-    
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords', quiet=True)
-    
-    NLTK_AVAILABLE = True
-    sia = SentimentIntensityAnalyzer()
+    # Data comes from the project-local nltk_data directory (python nltk_resources.py download);
+    # nothing is downloaded here, and the VADER lexicon loads on the first sentiment call.
+    # Feature -> whether its data is present (sentiment, keywords, sentences)
+    NLTK_FEATURES = bootstrap_nltk_data()
+    NLTK_AVAILABLE = any(NLTK_FEATURES.values())
 except ImportError:
+    NLTK_FEATURES = {}
     NLTK_AVAILABLE = False
     print("[!] NLTK not available. Install: pip install nltk")
 
@@ -58,6 +45,7 @@ class NLPProcessor:
         self.gemini_available = False
         self.transformers_available = TRANSFORMERS_AVAILABLE
         self.nltk_available = NLTK_AVAILABLE
+        self.nltk_features = dict(NLTK_FEATURES)
         
         # Initialize Gemini if available
         if GEMINI_AVAILABLE and gemini_api_key:
@@ -95,9 +83,9 @@ class NLPProcessor:
         }
         
         # Method 1: VADER Sentiment (NLTK)
-        if self.nltk_available:
+        if self.nltk_features.get('sentiment'):
             try:
-                scores = sia.polarity_scores(text)
+                scores = get_sentiment_analyzer().polarity_scores(text)
                 result['methods']['vader'] = {
                     'sentiment': 'positive' if scores['compound'] > 0.05 else 'negative' if scores['compound'] < -0.05 else 'neutral',
                     'score': scores['compound'],
@@ -205,14 +193,14 @@ class NLPProcessor:
     
     def extract_keywords(self, text: str, top_k: int = 5) -> List[str]:
         """Extract top keywords from text"""
-        if not self.nltk_available:
+        if not self.nltk_features.get('keywords'):
             # Fallback: simple word extraction
             words = re.findall(r'\b[a-z]{3,}\b', text.lower())
             return list(set(words))[:top_k]
         
         try:
             tokens = word_tokenize(text.lower())
-            stop_words = set(stopwords.words('english'))
+            stop_words = get_stopwords('english')
             keywords = [w for w in tokens if w.isalnum() and w not in stop_words and len(w) > 2]
             return list(set(keywords))[:top_k]
         except Exception as e:
@@ -263,7 +251,7 @@ Keep it brief (1-2 sentences) and positive.
         """Summarize text using Gemini"""
         if not self.gemini_available:
             # Fallback: return first sentence or truncate
-            sentences = sent_tokenize(text) if self.nltk_available else text.split('.')
+            sentences = sent_tokenize(text) if self.nltk_features.get('sentences') else text.split('.')
             return sentences[0][:max_length] if sentences else text[:max_length]
         
         try:
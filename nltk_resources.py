@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+NLTK data for the NLP processor, resolved from a project-local directory
+The tokenizer, stopword and VADER resources are downloaded once into
+NLTK_DATA_DIR by this script (at setup / build time). Servers only look them
+up: a missing resource disables the NLTK features with a message saying how
+to install it, instead of downloading (and stalling) on every worker boot.
+Resources are checked per feature, so e.g. a missing VADER lexicon only
+disables sentiment. The VADER lexicon and the stopword list are loaded on
+first use.
+
+Usage:
+    python nltk_resources.py download   # once, with network access
+    python nltk_resources.py check      # exit code 1 if anything is missing
+"""
+
+import argparse
+import os
+import re
+import sys
+import threading
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+# Project-local NLTK data, searched before NLTK's default locations
+NLTK_DATA_DIR = os.getenv('NLTK_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data'))
+# Raise at import instead of running without the NLTK features when data is missing
+NLTK_DATA_REQUIRED = os.getenv('NLTK_DATA_REQUIRED', '0') == '1'
+
+# Downloader package -> resource path checked with nltk.data.find
+# (punkt_tab is what word_tokenize / sent_tokenize load in NLTK 3.8.2+)
+REQUIRED_RESOURCES: Dict[str, str] = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+}
+# Stands for whichever of punkt / punkt_tab the installed NLTK loads
+TOKENIZER = 'tokenizer'
+# NLP feature -> downloader packages it needs
+FEATURE_RESOURCES: Dict[str, Sequence[str]] = {
+    'sentiment': ('vader_lexicon',),
+    'keywords': (TOKENIZER, 'stopwords'),
+    'sentences': (TOKENIZER,),
+}
+
+_lock = threading.Lock()
+_sentiment_analyzer = None
+_stopwords: Dict[str, FrozenSet[str]] = {}
+
+
+def use_local_data(data_dir: str = NLTK_DATA_DIR):
+    """Search data_dir first for every NLTK resource lookup"""
+    import nltk
+
+    if data_dir in nltk.data.path:
+        nltk.data.path.remove(data_dir)
+    nltk.data.path.insert(0, data_dir)
+
+
+def tokenizer_package() -> str:
+    """punkt_tab for NLTK 3.8.2+ (what word_tokenize / sent_tokenize load there), punkt before"""
+    import nltk
+
+    version = tuple(int(part) for part in re.findall(r'\d+', nltk.__version__)[:3])
+    return 'punkt_tab' if version >= (3, 8, 2) else 'punkt'
+
+
+def feature_packages(feature: str) -> List[str]:
+    return [tokenizer_package() if package == TOKENIZER else package for package in FEATURE_RESOURCES[feature]]
+
+
+def missing_resources(packages: Optional[Sequence[str]] = None) -> List[str]:
+    """Packages (default: every one a feature needs with this NLTK) that nltk.data.find cannot locate"""
+    import nltk
+
+    if packages is None:
+        packages = sorted({package for feature in FEATURE_RESOURCES for package in feature_packages(feature)})
+    missing = []
+    for package in packages:
+        try:
+            nltk.data.find(REQUIRED_RESOURCES[package])
+        except LookupError:
+            missing.append(package)
+    return missing
+
+
+def bootstrap_nltk_data(data_dir: str = NLTK_DATA_DIR) -> Dict[str, bool]:
+    """Point NLTK at data_dir and check each feature's resources; never downloads
+
+    Returns {feature: available}. Features with missing data are reported
+    (with how to fix it) and disabled, or RuntimeError is raised if
+    NLTK_DATA_REQUIRED is set.
+    """
+    use_local_data(data_dir)
+    missing = set(missing_resources())
+    features = {feature: not missing.intersection(feature_packages(feature)) for feature in FEATURE_RESOURCES}
+    if not missing:
+        return features
+    disabled = [feature for feature, available in features.items() if not available]
+    message = (f"NLTK data missing: {', '.join(sorted(missing))}, disabling {', '.join(disabled)} "
+               f"(looked in {data_dir} first). Run: python nltk_resources.py download")
+    if NLTK_DATA_REQUIRED:
+        raise RuntimeError(message)
+    print(f"[ERR] {message}")
+    return features
+
+
+def get_sentiment_analyzer():
+    """VADER analyzer, built (and its lexicon read) on the first sentiment call"""
+    global _sentiment_analyzer
+    if _sentiment_analyzer is None:
+        with _lock:
+            if _sentiment_analyzer is None:
+                from nltk.sentiment import SentimentIntensityAnalyzer
+                _sentiment_analyzer = SentimentIntensityAnalyzer()
+    return _sentiment_analyzer
+
+
+def get_stopwords(language: str = 'english') -> FrozenSet[str]:
+    """Stopword set, read from disk once per language"""
+    words = _stopwords.get(language)
+    if words is None:
+        from nltk.corpus import stopwords
+
+        words = _stopwords[language] = frozenset(stopwords.words(language))
+    return words
+
+
+def download(data_dir: str = NLTK_DATA_DIR) -> bool:
+    import nltk
+
+    os.makedirs(data_dir, exist_ok=True)
+    ok = True
+    for package in REQUIRED_RESOURCES:
+        print(f"[*] Downloading {package} to {data_dir}...")
+        if not nltk.download(package, download_dir=data_dir, quiet=True, raise_on_error=False):
+            print(f"[ERR] {package} could not be downloaded")
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Install or check the NLTK data used by nlp_processor.py")
+    parser.add_argument('command', choices=('download', 'check'))
+    parser.add_argument('--data-dir', default=NLTK_DATA_DIR, help="Project-local NLTK data directory")
+    args = parser.parse_args()
+
+    if args.command == 'download' and not download(args.data_dir):
+        sys.exit(1)
+    use_local_data(args.data_dir)
+    missing = missing_resources()
+    if missing:
+        print(f"[ERR] Missing: {', '.join(missing)}")
+        sys.exit(1)
+    print(f"[OK] NLTK data ready in {args.data_dir}: {', '.join(sorted(FEATURE_RESOURCES))} "
+          f"(tokenizer: {tokenizer_package()})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Region-of-interest tracking for streaming gesture sessions
+Crops each frame to a padded box around the hands found in the previous
+frame, so hand detection runs on a fraction of the pixels
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]  # x0, y0, x1, y1 in pixels
+
+
+class RoiTracker:
+    """Per-session crop box derived from the previous frame's landmarks
+
+    The box is a padded square around all hands, clamped to the frame and
+    never smaller than `min_fraction` of the shorter frame side. A full
+    frame is processed when there is no box, when the hand was lost, and
+    every `refresh_interval` frames so newly entering hands are found.
+    """
+
+    def __init__(self, padding: float = 0.3, min_fraction: float = 0.4, refresh_interval: int = 15):
+        self.padding = padding
+        self.min_fraction = min_fraction
+        self.refresh_interval = refresh_interval
+        self.box: Optional[Box] = None
+        self.frames_since_full = 0
+        self.crop_frames = 0
+        self.full_frames = 0
+        self.lost = 0
+
+    def region(self, frame_shape) -> Optional[Box]:
+        """Box to crop the next frame to, or None to process the full frame"""
+        if self.box is None or self.frames_since_full >= self.refresh_interval:
+            return None
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = self.box
+        if x1 > width or y1 > height:
+            # Frame size changed since the box was computed
+            return None
+        return self.box
+
+    @staticmethod
+    def crop(frame: np.ndarray, box: Box) -> np.ndarray:
+        x0, y0, x1, y1 = box
+        return np.ascontiguousarray(frame[y0:y1, x0:x1])
+
+    @staticmethod
+    def map_to_frame(hand_landmarks, box: Box, frame_shape):
+        """Convert landmarks detected in a crop to full-frame normalized coordinates (in place)"""
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = box
+        scale_x = (x1 - x0) / width
+        scale_y = (y1 - y0) / height
+        offset_x = x0 / width
+        offset_y = y0 / height
+        for hand in hand_landmarks:
+            for lm in hand:
+                lm.x = offset_x + lm.x * scale_x
+                lm.y = offset_y + lm.y * scale_y
+                # z shares the x scale (normalized by image width)
+                lm.z = lm.z * scale_x
+
+    def update(self, hand_landmarks, frame_shape, used_crop: bool):
+        """Record this frame's outcome and compute the box for the next one"""
+        if used_crop:
+            self.crop_frames += 1
+            self.frames_since_full += 1
+        else:
+            self.full_frames += 1
+            self.frames_since_full = 0
+
+        if not hand_landmarks:
+            self.box = None
+            return
+
+        height, width = frame_shape[:2]
+        xs = np.array([lm.x for hand in hand_landmarks for lm in hand]) * width
+        ys = np.array([lm.y for hand in hand_landmarks for lm in hand]) * height
+        center_x = (xs.min() + xs.max()) / 2
+        center_y = (ys.min() + ys.max()) / 2
+        side = max(xs.max() - xs.min(), ys.max() - ys.min()) * (1 + 2 * self.padding)
+        side = min(max(side, self.min_fraction * min(width, height)), min(width, height))
+
+        x0 = int(np.clip(center_x - side / 2, 0, width - side))
+        y0 = int(np.clip(center_y - side / 2, 0, height - side))
+        self.box = (x0, y0, min(width, x0 + int(side)), min(height, y0 + int(side)))
+
+    def mark_lost(self):
+        """The hand was not found inside the crop; fall back to the full frame"""
+        self.lost += 1
+        self.box = None
+
+    def stats(self) -> Dict:
+        return {
+            'crop_frames': self.crop_frames,
+            'full_frames': self.full_frames,
+            'lost': self.lost,
+            'box': self.box
+        }
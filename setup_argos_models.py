@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Offline Argos Translate setup
+Pins the Argos package index and the .argosmodel files the server needs in
+a local directory, and installs them at build time, so the translator can
+run with ARGOS_OFFLINE=1 (no index update at startup, no downloads during
+requests, air-gapped hosts included).
+
+Usage:
+    # Once, with network access: pin the index and fetch the packages
+    python setup_argos_models.py snapshot --pairs en_es,es_en,en_hi,hi_en
+    # At build time (offline): install every local package that is missing
+    python setup_argos_models.py install
+    python setup_argos_models.py status
+"""
+
+import argparse
+import os
+import shutil
+import sys
+
+import argostranslate.package
+import argostranslate.settings
+
+from argos_translator import (ARGOS_INDEX_SNAPSHOT, ARGOS_MODEL_DIR, installed_pairs, load_index_snapshot,
+                              local_package_files, package_filename)
+
+
+def parse_pairs(spec):
+    """'en_es,es_en' -> [('en', 'es'), ('es', 'en')]; None or 'all' -> None"""
+    if not spec or spec == 'all':
+        return None
+    pairs = []
+    for item in spec.split(','):
+        codes = item.strip().split('_')
+        if len(codes) != 2 or not all(codes):
+            raise ValueError(f"Bad language pair '{item}' (expected e.g. en_es)")
+        pairs.append(tuple(codes))
+    return pairs
+
+
+def snapshot(args):
+    """Pin the current package index and download the requested packages (needs network)"""
+    os.makedirs(args.model_dir, exist_ok=True)
+    print("[*] Updating the Argos package index...")
+    argostranslate.package.update_package_index()
+    shutil.copyfile(argostranslate.settings.local_package_index, args.index)
+    packages = load_index_snapshot(args.index)
+    print(f"[OK] Index with {len(packages)} packages pinned to {args.index}")
+
+    by_pair = {(pkg.from_code, pkg.to_code): pkg for pkg in packages}
+    wanted = args.pairs or list(by_pair)
+    missing = [pair for pair in wanted if pair not in by_pair]
+    if missing:
+        print(f"[ERR] Not in the index: {', '.join('_'.join(pair) for pair in missing)}")
+        return 1
+    for from_code, to_code in wanted:
+        target = os.path.join(args.model_dir, package_filename(from_code, to_code))
+        if os.path.exists(target) and not args.force:
+            print(f"[*] {target} already present")
+            continue
+        print(f"[*] Downloading {from_code} -> {to_code}...")
+        shutil.copyfile(by_pair[(from_code, to_code)].download(), target)
+        print(f"[OK] {target} ({os.path.getsize(target) / 1e6:.0f} MB)")
+    return 0
+
+
+def install(args):
+    """Install local packages that are not installed yet (no network)"""
+    files = local_package_files(args.model_dir)
+    wanted = args.pairs or list(files)
+    missing = [pair for pair in wanted if pair not in files]
+    if missing:
+        print(f"[ERR] No local package for: {', '.join('_'.join(pair) for pair in missing)} "
+              f"(run 'snapshot' where the network is available)")
+        return 1
+    installed = installed_pairs()
+    for pair in wanted:
+        if pair in installed and not args.force:
+            print(f"[*] {pair[0]} -> {pair[1]} already installed")
+            continue
+        argostranslate.package.install_from_path(files[pair])
+        print(f"[OK] Installed {pair[0]} -> {pair[1]} from {files[pair]}")
+    return 0
+
+
+def status(args):
+    files = local_package_files(args.model_dir)
+    installed = installed_pairs()
+    if os.path.exists(args.index):
+        print(f"[OK] Index snapshot: {args.index} ({len(load_index_snapshot(args.index))} packages)")
+    else:
+        print(f"[!] No index snapshot at {args.index}")
+    print(f"{'Pair':<10}{'Local file':>12}{'Installed':>12}")
+    for pair in sorted(set(files) | installed):
+        print(f"{'_'.join(pair):<10}{'yes' if pair in files else '-':>12}{'yes' if pair in installed else '-':>12}")
+    not_installed = [pair for pair in files if pair not in installed]
+    if not_installed:
+        print(f"[!] {len(not_installed)} local package(s) not installed; run 'install'")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pin and install Argos Translate packages for offline serving")
+    parser.add_argument('command', choices=('snapshot', 'install', 'status'))
+    parser.add_argument('--pairs', help="Comma-separated language pairs, e.g. en_es,es_en (default: all)")
+    parser.add_argument('--model-dir', default=ARGOS_MODEL_DIR, help="Directory of .argosmodel files")
+    parser.add_argument('--index', help="Pinned package index snapshot (default: index.json in the model directory)")
+    parser.add_argument('--force', action='store_true', help="Download / install again even if present")
+    args = parser.parse_args()
+    if args.index is None:
+        args.index = (ARGOS_INDEX_SNAPSHOT if args.model_dir == ARGOS_MODEL_DIR
+                      else os.path.join(args.model_dir, 'index.json'))
+    try:
+        args.pairs = parse_pairs(args.pairs)
+    except ValueError as e:
+        print(f"[ERR] {e}")
+        sys.exit(1)
+
+    commands = {'snapshot': snapshot, 'install': install, 'status': status}
+    sys.exit(commands[args.command](args))
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,9 @@ const GestureRecognition = ({ onGestureDetected }) => {
   const streamRef = useRef(null);
   const processingRef = useRef(false);
   const lastDetectionTimeRef = useRef(0);
+  // Pacing hints returned by the server with every frame (adaptive frame rate)
+  const frameIntervalRef = useRef(250);
+  const jpegQualityRef = useRef(0.7);
   const GESTURE_COOLDOWN = 4500; // 4.5 seconds cooldown between gesture detections
   
   // Performance optimization configuration
@@ -183,7 +186,7 @@ const GestureRecognition = ({ onGestureDetected }) => {
     
     const processFrame = async () => {
       const now = Date.now();
-      const shouldSendFrame = (now - lastFrameTime) >= 250;  // Optimized 250ms interval for faster detection
+      const shouldSendFrame = (now - lastFrameTime) >= frameIntervalRef.current;  // Server-recommended interval (250ms until the first response)
       
       // Update cooldown display
       const timeSinceLastDetection = now - lastDetectionTimeRef.current;
@@ -252,18 +255,26 @@ const GestureRecognition = ({ onGestureDetected }) => {
           processingRef.current = true;
           lastFrameTime = now;
 
-          // Original JPEG quality for reliability
-          const frameDataUri = canvas.toDataURL('image/jpeg', 0.7);
-          const frameData = frameDataUri.split(',')[1] || frameDataUri;
+          // Server-recommended JPEG quality; sent as raw bytes (no base64/JSON overhead)
+          const frameBlob = await new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', jpegQualityRef.current));
+          if (!frameBlob) {
+            processingRef.current = false;
+            animationId = requestAnimationFrame(processFrame);
+            return;
+          }
 
           const response = await fetch(`${API_BASE}/process-frame`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ frame: frameData })
+            headers: { 'Content-Type': 'application/octet-stream' },
+            body: frameBlob
           });
 
           if (response.ok) {
             const data = await response.json();
+
+            // Back off (or speed up) as the server recommends
+            if (data.next_frame_interval_ms) frameIntervalRef.current = data.next_frame_interval_ms;
+            if (data.jpeg_quality) jpegQualityRef.current = data.jpeg_quality;
             
             if (data.status === 'success') {
               if (data.gesture) {
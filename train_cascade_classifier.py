@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Train the two-stage cascade gesture classifier
+A small router forest learns coarse groups of gestures (confusable gestures
+share a group, found from a cross-validated confusion matrix or given with
+--groups), and a small specialist forest per multi-gesture group separates
+its members. The cascade is written as a model artifact for the server
+(GESTURE_SERVING_MODEL=cascade).
+
+Usage:
+    python train_cascade_classifier.py --data gesture_landmarks.npz
+    python train_cascade_classifier.py --groups "M,N;U,V,2" --baseline gesture_classifier.pkl
+"""
+
+import argparse
+import os
+import pickle
+import sys
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import confusion_matrix
+from sklearn.model_selection import cross_val_predict, train_test_split
+
+from distill_gesture_model import latency_percentiles
+from forest_engine import CompiledForest, compile_forest
+from gesture_cascade import CascadeClassifier, build_group_of, merge_confused_classes, parse_groups
+from gesture_features import DEFAULT_FEATURE_SPEC, FEATURE_SPECS, extract_features, load_landmark_dataset
+from model_artifact import save_artifact
+
+
+def train_forest(X: np.ndarray, y: np.ndarray, n_estimators: int, max_depth: int) -> CompiledForest:
+    forest = RandomForestClassifier(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        max_features='sqrt',
+        class_weight='balanced',
+        random_state=42,
+        n_jobs=-1
+    )
+    forest.fit(X, y)
+    compiled = compile_forest(forest)
+    if compiled is None:
+        print("[ERR] Compiled forest does not match scikit-learn")
+        sys.exit(1)
+    return compiled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the two-stage cascade gesture classifier")
+    parser.add_argument('--data', default='gesture_landmarks.npz', help="Raw landmark dataset saved by training")
+    parser.add_argument('--output', default=os.path.join('models', 'gesture_cascade'), help="Artifact directory")
+    parser.add_argument('--feature-spec', default=DEFAULT_FEATURE_SPEC, choices=FEATURE_SPECS)
+    parser.add_argument('--groups', help="Confusable gestures, e.g. 'M,N;U,V,2' (default: from a confusion matrix)")
+    parser.add_argument('--confusion-threshold', type=float, default=0.05,
+                        help="Pairwise confusion rate at which two gestures share a group")
+    parser.add_argument('--max-group-size', type=int, default=4)
+    parser.add_argument('--router-trees', type=int, default=40)
+    parser.add_argument('--router-depth', type=int, default=12)
+    parser.add_argument('--specialist-trees', type=int, default=40)
+    parser.add_argument('--specialist-depth', type=int, default=16)
+    parser.add_argument('--accept-threshold', type=float, default=0.8,
+                        help="Router confidence at which only the top group is considered")
+    parser.add_argument('--top-k', type=int, default=2, help="Groups mixed when the router is unsure")
+    parser.add_argument('--baseline', help="Pickled single forest to compare against")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    args = parser.parse_args()
+
+    X_raw, y, class_names = load_landmark_dataset(args.data)
+    print(f"[OK] Dataset {args.data}: {len(X_raw)} samples, {len(class_names)} classes")
+    X = extract_features(X_raw, args.feature_spec)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=args.test_size, random_state=42, stratify=y
+    )
+    classes = np.unique(y_train)
+
+    try:
+        groups = [list(np.searchsorted(classes, group)) for group in parse_groups(args.groups, class_names)]
+    except ValueError as e:
+        print(f"[ERR] {e}")
+        sys.exit(1)
+    if not args.groups:
+        print("[*] Finding confusable gestures (3-fold cross-validation of a small forest)...")
+        probe = RandomForestClassifier(n_estimators=args.router_trees, max_depth=args.router_depth,
+                                       max_features='sqrt', class_weight='balanced', random_state=42, n_jobs=-1)
+        predicted = cross_val_predict(probe, X_train, y_train, cv=3)
+        confusion = confusion_matrix(y_train, predicted, labels=classes)
+        groups = [group for group in merge_confused_classes(confusion, args.confusion_threshold, args.max_group_size)
+                  if len(group) > 1]
+    group_of = build_group_of(len(classes), groups)
+    names = [class_names[int(c)] for c in classes]
+    for group in groups:
+        print(f"[*] Group: {' / '.join(names[column] for column in group)}")
+    print(f"[OK] {int(group_of.max()) + 1} groups, {len(groups)} with a specialist")
+
+    train_columns = np.searchsorted(classes, y_train)
+    print(f"[*] Training router: {args.router_trees} trees, depth {args.router_depth}")
+    router = train_forest(X_train, group_of[train_columns], args.router_trees, args.router_depth)
+
+    specialists = {}
+    for group in np.unique(group_of):
+        members = np.flatnonzero(group_of == group)
+        if len(members) < 2:
+            continue
+        rows = np.isin(train_columns, members)
+        specialists[int(group)] = train_forest(X_train[rows], y_train[rows],
+                                               args.specialist_trees, args.specialist_depth)
+    print(f"[OK] {len(specialists)} specialists trained ({args.specialist_trees} trees, depth {args.specialist_depth})")
+
+    cascade = CascadeClassifier(router, specialists, group_of, classes, accept_threshold=args.accept_threshold,
+                                top_k=args.top_k, feature_spec=args.feature_spec)
+
+    candidates = [("Cascade", cascade.predict, cascade.memory_bytes())]
+    if args.baseline:
+        with open(args.baseline, 'rb') as f:
+            baseline = pickle.load(f)
+        if getattr(baseline, 'feature_spec_', None) != args.feature_spec:
+            print(f"[!] {args.baseline} uses different features, skipping the comparison")
+        else:
+            compiled = CompiledForest.from_sklearn(baseline)
+            candidates.insert(0, ("Forest (compiled)", compiled.predict, compiled.memory_bytes()))
+
+    print(f"\n{'Model':<24}{'Accuracy':>10}{'Grouped':>10}{'p50 ms':>9}{'p99 ms':>9}{'Memory':>11}")
+    print("-" * 73)
+    # Accuracy on the gestures that share a group: the ones the specialists exist for
+    grouped = np.isin(np.searchsorted(classes, y_test), [column for group in groups for column in group])
+    for name, predict, memory in candidates:
+        predictions = predict(X_test)
+        accuracy = float(np.mean(predictions == y_test))
+        grouped_accuracy = float(np.mean(predictions[grouped] == y_test[grouped])) if grouped.any() else 1.0
+        p50, p99 = latency_percentiles(predict, X_test)
+        print(f"{name:<24}{accuracy * 100:>9.2f}%{grouped_accuracy * 100:>9.2f}%{p50:>9.3f}{p99:>9.3f}"
+              f"{memory / 1e6:>9.2f}MB")
+
+    accepted = router.predict_proba(X_test).max(axis=1) >= args.accept_threshold
+    print(f"\n[*] Router confident on {np.mean(accepted) * 100:.1f}% of test rows "
+          f"(accuracy vs labels; 'Grouped' covers only gestures that share a group)")
+
+    manifest = save_artifact(cascade, args.output, class_names, feature_spec=args.feature_spec,
+                             source=os.path.basename(__file__))
+    print(f"[OK] Cascade artifact {manifest['version']} saved: {args.output}")
+    print(f"[*] Serve it with GESTURE_SERVING_MODEL=cascade GESTURE_CASCADE_ARTIFACT={args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,12 +12,15 @@ from mediapipe.tasks import python
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 import pickle
 import sys
 import random
 from pathlib import Path
 
+# Shared with gesture_api_server_simple.py so serving computes identical features
+from gesture_features import DEFAULT_FEATURE_SPEC, extract_features, save_landmark_dataset
+from model_artifact import export_model
+
 MODEL_PATH = r"c:\ai bot base\hand_landmarker.task"
 
 # Define multiple data sources
@@ -27,6 +30,7 @@ DATA_SOURCES = [
 ]
 
 OUTPUT_DIR = r"c:\ai bot base"
+FEATURE_SPEC = DEFAULT_FEATURE_SPEC  # Wrist-relative, palm-size normalized + joint angles
 
 print("="*70)
 print("COMPREHENSIVE GESTURE CLASSIFIER TRAINER")
@@ -85,6 +89,8 @@ print("\n[2/5] Extracting hand landmarks from images...")
 
 features_list = []
 labels_list = []
+raw_landmarks = []  # Un-augmented landmarks, saved for distillation/verification tools
+raw_labels = []
 class_mapping = {}
 
 for class_idx, gesture_class in enumerate(all_classes):
@@ -121,6 +127,8 @@ for class_idx, gesture_class in enumerate(all_classes):
                 
                 features_list.append(features)
                 labels_list.append(class_idx)
+                raw_landmarks.append(features)
+                raw_labels.append(class_idx)
                 extracted += 1
                 
                 # Data augmentation (slight variations)
@@ -147,16 +155,22 @@ X_train, X_test, y_train, y_test = train_test_split(
 print(f"  Training samples: {len(X_train)}")
 print(f"  Test samples: {len(X_test)}")
 
+# Scale- and translation-invariant features (same code the server runs)
+X_train = extract_features(X_train, FEATURE_SPEC)
+X_test = extract_features(X_test, FEATURE_SPEC)
+print(f"  Features: '{FEATURE_SPEC}' ({X_train.shape[1]} per hand)")
+
 # Train model
 print("\n[4/5] Training RandomForest classifier...")
 print("  Parameters:")
-print("    - n_estimators: 500")
-print("    - max_depth: 30")
+print("    - n_estimators: 150")
+print("    - max_depth: 20")
 print("    - class_weight: balanced")
 
+# Normalized features no longer need hundreds of deep trees to memorize position/scale
 gesture_model = RandomForestClassifier(
-    n_estimators=500,
-    max_depth=30,
+    n_estimators=150,
+    max_depth=20,
     min_samples_split=2,
     class_weight='balanced',
     n_jobs=-1,
@@ -164,6 +178,7 @@ gesture_model = RandomForestClassifier(
 )
 
 gesture_model.fit(X_train, y_train)
+gesture_model.feature_spec_ = FEATURE_SPEC  # Read by the server to build matching features
 print("[OK] Model trained")
 
 # Evaluate
@@ -213,10 +228,13 @@ importances = gesture_model.feature_importances_
 top_indices = np.argsort(importances)[-10:][::-1]
 
 for rank, idx in enumerate(top_indices, 1):
-    landmark_num = idx // 3
-    coord = ['X', 'Y', 'Z'][idx % 3]
     importance = importances[idx]
-    print(f"  {rank:2}. Landmark {landmark_num} ({coord}): {importance:.4f}")
+    if idx < 63:
+        landmark_num = idx // 3
+        coord = ['X', 'Y', 'Z'][idx % 3]
+        print(f"  {rank:2}. Landmark {landmark_num} ({coord}): {importance:.4f}")
+    else:
+        print(f"  {rank:2}. Finger angle {idx - 63}: {importance:.4f}")
 
 # Save models
 print(f"\n{'='*70}")
@@ -225,6 +243,7 @@ print(f"{'='*70}")
 
 model_path = os.path.join(OUTPUT_DIR, "gesture_classifier_comprehensive.pkl")
 class_map_path = os.path.join(OUTPUT_DIR, "gesture_class_map_comprehensive.pkl")
+dataset_path = os.path.join(OUTPUT_DIR, "gesture_landmarks_comprehensive.npz")
 
 with open(model_path, 'wb') as f:
     pickle.dump(gesture_model, f)
@@ -234,13 +253,21 @@ with open(class_map_path, 'wb') as f:
 
 print(f"[✓] Model saved: {model_path}")
 print(f"[✓] Class mapping saved: {class_map_path}")
+
+save_landmark_dataset(dataset_path, raw_landmarks, raw_labels, all_classes)
+print(f"[✓] Landmark dataset saved: {dataset_path}")
+
+artifact_path = os.path.join(OUTPUT_DIR, "models", "gesture_classifier")
+manifest = export_model(gesture_model, artifact_path, all_classes, source=model_path)
+if manifest:
+    print(f"[✓] Model artifact saved: {artifact_path} (version {manifest['version']})")
 print(f"    Gesture classes: {', '.join(all_classes)}")
 
 print(f"\n{'='*70}")
 print("✅ TRAINING COMPLETE!")
 print(f"{'='*70}")
 print("NEXT STEPS:")
-print("1. Update gesture_api_server_simple.py to use 'gesture_classifier_comprehensive.pkl'")
-print("2. Restart the Flask backend")
+print("1. gesture_api_server_simple.py loads the artifact from models/gesture_classifier")
+print("2. A running backend hot-reloads it (or POST /api/model/reload)")
 print(f"3. Test all {len(all_classes)} gesture classes")
 print(f"{'='*70}\n")
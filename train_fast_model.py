@@ -14,8 +14,12 @@ from mediapipe.tasks import python
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 import warnings
+
+# Shared with gesture_api_server_simple.py so serving computes identical features
+from gesture_features import DEFAULT_FEATURE_SPEC, extract_features, save_landmark_dataset
+from model_artifact import export_model
+
 warnings.filterwarnings('ignore')
 
 print("[TRAINING] Fast Gesture Classifier - Optimized Training")
@@ -100,12 +104,12 @@ X_train, X_test, y_train, y_test = train_test_split(
 )
 print(f"[OK] Train: {len(X_train)}, Test: {len(X_test)}")
 
-# Normalize
-print("\n[4/6] Normalizing features...")
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-print("[OK] Features normalized")
+# Scale- and translation-invariant features (same code the server runs)
+print("\n[4/6] Extracting normalized features...")
+FEATURE_SPEC = DEFAULT_FEATURE_SPEC
+X_train_features = extract_features(X_train, FEATURE_SPEC)
+X_test_features = extract_features(X_test, FEATURE_SPEC)
+print(f"[OK] Features extracted: '{FEATURE_SPEC}' ({X_train_features.shape[1]} per hand)")
 
 # Train model
 print("\n[5/6] Training RandomForest classifier...")
@@ -119,12 +123,13 @@ clf = RandomForestClassifier(
     random_state=42,
     n_jobs=-1
 )
-clf.fit(X_train_scaled, y_train)
+clf.fit(X_train_features, y_train)
+clf.feature_spec_ = FEATURE_SPEC  # Read by the server to build matching features
 print("[OK] Model trained")
 
 # Evaluate
 print("\n[6/6] Evaluating model...")
-y_pred = clf.predict(X_test_scaled)
+y_pred = clf.predict(X_test_features)
 test_acc = accuracy_score(y_test, y_pred)
 
 print(f"\n{'='*70}")
@@ -145,10 +150,9 @@ with open(model_path, 'wb') as f:
     pickle.dump(clf, f)
 print(f"[OK] Model: {model_path}")
 
-scaler_path = os.path.join(OUTPUT_DIR, "gesture_scaler.pkl")
-with open(scaler_path, 'wb') as f:
-    pickle.dump(scaler, f)
-print(f"[OK] Scaler: {scaler_path}")
+dataset_path = os.path.join(OUTPUT_DIR, "gesture_landmarks.npz")
+save_landmark_dataset(dataset_path, X, y, class_dirs)
+print(f"[OK] Landmark dataset: {dataset_path}")
 
 class_map = {i: name for i, name in enumerate(class_dirs)}
 class_map_path = os.path.join(OUTPUT_DIR, "gesture_class_map.pkl")
@@ -156,9 +160,14 @@ with open(class_map_path, 'wb') as f:
     pickle.dump(class_map, f)
 print(f"[OK] Class map: {class_map_path}")
 
+artifact_path = os.path.join(OUTPUT_DIR, "models", "gesture_classifier")
+manifest = export_model(clf, artifact_path, class_dirs, source=model_path)
+if manifest:
+    print(f"[OK] Model artifact: {artifact_path} (version {manifest['version']})")
+
 print(f"\n{'='*70}")
 print(f"[SUCCESS] Training complete! Model ready for deployment.")
 print(f"{'='*70}")
 print(f"Accuracy: {test_acc*100:.2f}%")
-print(f"Restart Flask backend to load new model.")
+print(f"A running server hot-reloads the artifact (or POST /api/model/reload).")
 print(f"{'='*70}")
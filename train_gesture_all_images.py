@@ -16,9 +16,14 @@ import pickle
 from threading import Thread
 import time
 
+# Shared with gesture_api_server_simple.py so serving computes identical features
+from gesture_features import DEFAULT_FEATURE_SPEC, NUM_LANDMARKS, extract_features
+from model_artifact import export_model
+
 MODEL_PATH = r"D:\ai bot base\hand_landmarker.task"
 DATA_PATH = r"D:\ai bot base\archive (1)\indian"
 OUTPUT_DIR = r"D:\ai bot base"
+FEATURE_SPEC = DEFAULT_FEATURE_SPEC  # Wrist-relative, palm-size normalized + joint angles
 
 # Get gesture class names (folders)
 class_dirs = sorted([d for d in os.listdir(DATA_PATH) if os.path.isdir(os.path.join(DATA_PATH, d))])
@@ -168,6 +173,11 @@ X_train, X_test, y_train, y_test = train_test_split(
 )
 print(f"[OK] Train: {len(X_train)}, Test: {len(X_test)}")
 
+# Scale- and translation-invariant features (same code the server runs)
+X_train = extract_features(X_train, FEATURE_SPEC)
+X_test = extract_features(X_test, FEATURE_SPEC)
+print(f"[OK] Features extracted: '{FEATURE_SPEC}' ({X_train.shape[1]} per hand)")
+
 print("\n[4/5] Training RandomForest (1000 trees, depth=35 for maximum accuracy)...")
 print("       This will provide the best accuracy with 1200+ images per class")
 clf = RandomForestClassifier(
@@ -183,6 +193,7 @@ clf = RandomForestClassifier(
 )
 
 clf.fit(X_train, y_train)
+clf.feature_spec_ = FEATURE_SPEC  # Read by the server and export_model to build matching features
 print("[OK] Training complete")
 
 print("\n[5/5] Evaluating model...")
@@ -205,8 +216,14 @@ with open(model_path, 'wb') as f:
 print(f"\n[OK] Model saved: {model_path}")
 print(f"[OK] File size: {os.path.getsize(model_path) / (1024*1024):.2f} MB")
 
+# The server loads this artifact in preference to the pickle
+artifact_path = os.path.join(OUTPUT_DIR, "models", "gesture_classifier")
+manifest = export_model(clf, artifact_path, class_dirs, source=model_path)
+if manifest:
+    print(f"[OK] Model artifact: {artifact_path} (version {manifest['version']})")
+
 print("\n" + "="*70)
 print("TRAINING COMPLETE!")
 print("="*70)
-print("Next: Restart Flask backend and test gesture recognition")
+print("Next: a running server hot-reloads the artifact (or POST /api/model/reload)")
 print("="*70)
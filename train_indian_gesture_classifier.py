@@ -12,11 +12,14 @@ from mediapipe.tasks import python
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 import pickle
 import signal
 import sys
 
+# Shared with gesture_api_server_simple.py so serving computes identical features
+from gesture_features import DEFAULT_FEATURE_SPEC, NUM_LANDMARKS, extract_features
+from model_artifact import export_model
+
 # Set timeout for each image processing
 def timeout_handler(signum, frame):
     raise TimeoutError("Image processing timeout")
@@ -26,6 +29,7 @@ signal.signal(signal.SIGALRM, timeout_handler)
 MODEL_PATH = r"D:\ai bot base\hand_landmarker.task"
 DATA_PATH = r"D:\ai bot base\archive (1)\indian"
 OUTPUT_DIR = r"D:\ai bot base"
+FEATURE_SPEC = DEFAULT_FEATURE_SPEC  # Wrist-relative, palm-size normalized + joint angles
 
 # Get gesture class names (folders)
 class_dirs = sorted([d for d in os.listdir(DATA_PATH) if os.path.isdir(os.path.join(DATA_PATH, d))])
@@ -185,6 +189,11 @@ X_train, X_test, y_train, y_test = train_test_split(
 print(f"Training samples: {len(X_train)}")
 print(f"Test samples: {len(X_test)}")
 
+# Scale- and translation-invariant features (same code the server runs)
+X_train = extract_features(X_train, FEATURE_SPEC)
+X_test = extract_features(X_test, FEATURE_SPEC)
+print(f"Features: '{FEATURE_SPEC}' ({X_train.shape[1]} per hand)")
+
 print("\n[4/5] Training improved RandomForest classifier...")
 print("Parameters:")
 print("  - n_estimators: 500 (increased from 200)")
@@ -207,6 +216,7 @@ clf = RandomForestClassifier(
 )
 
 clf.fit(X_train, y_train)
+clf.feature_spec_ = FEATURE_SPEC  # Read by the server and export_model to build matching features
 print("[OK] Model trained")
 
 print("\n[5/5] Evaluating model...")
@@ -252,10 +262,11 @@ feature_importance = clf.feature_importances_
 top_features = np.argsort(feature_importance)[-10:]
 print(f"\nTop 10 Important Features:")
 for i, feat_idx in enumerate(top_features[::-1], 1):
-    landmark_idx = feat_idx // 3
-    coord = ['X', 'Y', 'Z'][feat_idx % 3]
     importance = feature_importance[feat_idx]
-    print(f"  {i}. Landmark {landmark_idx} ({coord}): {importance:.4f}")
+    if feat_idx < NUM_LANDMARKS * 3:
+        print(f"  {i}. Landmark {feat_idx // 3} ({['X', 'Y', 'Z'][feat_idx % 3]}): {importance:.4f}")
+    else:
+        print(f"  {i}. Finger angle {feat_idx - NUM_LANDMARKS * 3}: {importance:.4f}")
 
 # Save model
 model_path = os.path.join(OUTPUT_DIR, "gesture_classifier.pkl")
@@ -263,10 +274,16 @@ with open(model_path, 'wb') as f:
     pickle.dump(clf, f)
 print(f"\n[OK] Model saved to: {model_path}")
 print(f"    File size: {os.path.getsize(model_path) / (1024*1024):.2f} MB")
+
+# The server loads this artifact in preference to the pickle
+artifact_path = os.path.join(OUTPUT_DIR, "models", "gesture_classifier")
+manifest = export_model(clf, artifact_path, class_dirs, source=model_path)
+if manifest:
+    print(f"[OK] Model artifact: {artifact_path} (version {manifest['version']})")
 print(f"\nTRAINING COMPLETE!")
 print("="*70)
 print("NEXT STEPS:")
-print("1. Restart Flask backend to load new model")
+print("1. A running Flask backend hot-reloads the artifact (or POST /api/model/reload)")
 print("2. Test gesture recognition in browser")
 print("3. Show hand gestures 1-9 and A-Z")
 print("="*70)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Train the optional two-hand (joint) gesture classifier
+Reads a landmark dataset of hand pairs (126 raw values per row: left hand,
+then right hand, as ordered by gesture_features.pair_order; written with
+save_landmark_dataset), trains a forest on both hands' features side by side
+and writes it as a model artifact. The server picks it up from
+GESTURE_JOINT_ARTIFACT (default models/gesture_joint) and tries it on every
+frame with two hands.
+
+With --images the dataset is collected first: every image in a folder of
+per-sign subfolders is run through the Hand Landmarker, images showing
+exactly two hands are kept (ordered with pair_order, as the server does)
+and the pairs are saved to --data for later runs.
+
+Usage:
+    python train_joint_gesture_classifier.py --images two_hand_signs/ --data gesture_pair_landmarks.npz
+    python train_joint_gesture_classifier.py --data gesture_pair_landmarks.npz
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+from forest_engine import compile_forest
+from gesture_features import (FEATURE_SPECS, NUM_LANDMARKS, extract_pair_features,
+                              landmarks_to_array, load_landmark_dataset, pair_order, save_landmark_dataset)
+from model_artifact import save_artifact
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+# Both hands' normalized landmarks: 126 features. The single-hand default
+# (normalized_angles) would add finger angles, 164 features per pair
+JOINT_FEATURE_SPEC = 'normalized'
+
+
+def collect_pairs(image_dir: str, landmarker_path: str):
+    """(X, y, class_names) of hand pairs from image_dir/<sign>/*.jpg; images without exactly two hands are skipped"""
+    import cv2
+    import mediapipe
+    from mediapipe.tasks import python
+    from mediapipe.tasks.python import vision
+
+    options = vision.HandLandmarkerOptions(
+        base_options=python.BaseOptions(model_asset_path=landmarker_path),
+        running_mode=vision.RunningMode.IMAGE,
+        num_hands=2,
+        min_hand_detection_confidence=0.3,
+        min_hand_presence_confidence=0.3
+    )
+    class_names = sorted(d for d in os.listdir(image_dir) if os.path.isdir(os.path.join(image_dir, d)))
+    X, y = [], []
+    with vision.HandLandmarker.create_from_options(options) as landmarker:
+        for class_idx, class_name in enumerate(class_names):
+            class_path = os.path.join(image_dir, class_name)
+            images = [f for f in sorted(os.listdir(class_path)) if f.lower().endswith(IMAGE_EXTENSIONS)]
+            kept = 0
+            for image_file in images:
+                image = cv2.imread(os.path.join(class_path, image_file))
+                if image is None:
+                    continue
+                mp_image = mediapipe.Image(image_format=mediapipe.ImageFormat.SRGB,
+                                           data=cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                results = landmarker.detect(mp_image)
+                if len(results.hand_landmarks) != 2:
+                    continue
+                hands = landmarks_to_array(results.hand_landmarks)
+                handedness = [categories[0].category_name for categories in results.handedness] \
+                    if results.handedness and all(results.handedness) else None
+                X.append(hands[pair_order(hands, handedness)].reshape(-1))
+                y.append(class_idx)
+                kept += 1
+            print(f"  [{class_name}] {kept} / {len(images)} images with two hands")
+    return np.array(X), np.array(y), class_names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the optional two-hand gesture classifier")
+    parser.add_argument('--data', default='gesture_pair_landmarks.npz', help="Hand-pair landmark dataset (126 values per row)")
+    parser.add_argument('--images', help="Collect --data first from this folder of per-sign image subfolders")
+    parser.add_argument('--landmarker', default='hand_landmarker.task', help="MediaPipe model used with --images")
+    parser.add_argument('--output', default=os.path.join('models', 'gesture_joint'), help="Artifact directory")
+    parser.add_argument('--feature-spec', default=JOINT_FEATURE_SPEC, choices=FEATURE_SPECS,
+                        help="Per-hand features (default: normalized, 126 per pair)")
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--depth', type=int, default=20)
+    parser.add_argument('--test-size', type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.images:
+        print(f"[*] Collecting hand pairs from {args.images}...")
+        X_raw, y, class_names = collect_pairs(args.images, args.landmarker)
+        if len(X_raw) == 0:
+            print(f"[ERR] No image in {args.images} shows two hands")
+            sys.exit(1)
+        save_landmark_dataset(args.data, X_raw, y, class_names)
+        print(f"[OK] Hand-pair dataset: {args.data} ({len(X_raw)} pairs)")
+
+    X_raw, y, class_names = load_landmark_dataset(args.data)
+    if X_raw.shape[1] != 2 * NUM_LANDMARKS * 3:
+        print(f"[ERR] {args.data} has {X_raw.shape[1]} values per row, a hand pair needs {2 * NUM_LANDMARKS * 3}")
+        sys.exit(1)
+    print(f"[OK] Dataset {args.data}: {len(X_raw)} hand pairs, {len(class_names)} two-hand signs")
+
+    X = extract_pair_features(X_raw, args.feature_spec)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=args.test_size, random_state=42, stratify=y
+    )
+    print(f"[*] Training forest: {args.trees} trees, depth {args.depth}, {X.shape[1]} features")
+    forest = RandomForestClassifier(
+        n_estimators=args.trees,
+        max_depth=args.depth,
+        max_features='sqrt',
+        class_weight='balanced',
+        random_state=42,
+        n_jobs=-1
+    )
+    forest.fit(X_train, y_train)
+    forest.feature_spec_ = args.feature_spec
+    print(f"[OK] Test accuracy: {np.mean(forest.predict(X_test) == y_test) * 100:.2f}%")
+
+    compiled = compile_forest(forest)
+    if compiled is None:
+        print("[ERR] Compiled forest does not match scikit-learn")
+        sys.exit(1)
+    manifest = save_artifact(compiled, args.output, class_names, feature_spec=args.feature_spec,
+                             source=os.path.basename(args.data))
+    print(f"[OK] Two-hand model {manifest['version']} saved: {args.output}")
+    print(f"[*] The server loads it from GESTURE_JOINT_ARTIFACT={args.output} on startup")
+
+
+if __name__ == '__main__':
+    main()
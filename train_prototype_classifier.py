@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Train the nearest-prototype gesture classifier
+Fits a few k-means centroids per gesture on standardized, PCA-projected
+features from the saved landmark dataset, calibrates the distance softmax,
+compares accuracy and latency against the forest and writes a model artifact
+for the server (GESTURE_SERVING_MODEL=prototype).
+
+Usage:
+    python train_prototype_classifier.py --data gesture_landmarks.npz
+    python train_prototype_classifier.py --prototypes 12 --components 12 --baseline gesture_classifier.pkl
+"""
+
+import argparse
+import os
+import pickle
+import sys
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from distill_gesture_model import latency_percentiles
+from forest_engine import CompiledForest
+from gesture_features import DEFAULT_FEATURE_SPEC, FEATURE_SPECS, extract_features, load_landmark_dataset
+from gesture_prototypes import INDEX_TYPES, PrototypeClassifier, train_prototypes
+from model_artifact import save_artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the nearest-prototype gesture classifier")
+    parser.add_argument('--data', default='gesture_landmarks.npz', help="Raw landmark dataset saved by training")
+    parser.add_argument('--output', default=os.path.join('models', 'gesture_prototypes'), help="Artifact directory")
+    parser.add_argument('--feature-spec', default=DEFAULT_FEATURE_SPEC, choices=FEATURE_SPECS)
+    parser.add_argument('--prototypes', type=int, default=8, help="k-means centroids per gesture")
+    parser.add_argument('--components', type=int, default=16, help="PCA dimensions (0 = no projection)")
+    parser.add_argument('--index', default='brute', choices=INDEX_TYPES,
+                        help="Prototype search the artifact is served with (both are timed below)")
+    parser.add_argument('--baseline', help="Pickled forest to compare against")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    args = parser.parse_args()
+
+    X_raw, y, class_names = load_landmark_dataset(args.data)
+    print(f"[OK] Dataset {args.data}: {len(X_raw)} samples, {len(class_names)} classes")
+    X = extract_features(X_raw, args.feature_spec)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=args.test_size, random_state=42, stratify=y
+    )
+    # Calibrate the softmax on rows the centroids were not fitted on
+    fit_rows, calibration_rows = train_test_split(np.arange(len(X_train)), test_size=0.15, random_state=0,
+                                                  stratify=y_train)
+
+    print(f"[*] Fitting {args.prototypes} prototypes per gesture, "
+          f"{args.components or 'all'} dimensions...")
+    model = train_prototypes(X_train[fit_rows], y_train[fit_rows], args.prototypes, args.components,
+                             args.index, args.feature_spec,
+                             X_val=X_train[calibration_rows], y_val=y_train[calibration_rows])
+    details = model.describe()
+    print(f"[OK] {details['prototypes']} prototypes, {details['dimensions']} dimensions, "
+          f"{details['index']} search, temperature {details['temperature']}")
+
+    candidates = []
+    if args.baseline:
+        with open(args.baseline, 'rb') as f:
+            baseline = pickle.load(f)
+        if getattr(baseline, 'feature_spec_', None) != args.feature_spec:
+            print(f"[!] {args.baseline} uses different features, skipping the comparison")
+        else:
+            compiled = CompiledForest.from_sklearn(baseline)
+            candidates.append(("Forest (compiled)", compiled.predict, compiled.memory_bytes()))
+    arrays, metadata = model.to_arrays(), model.metadata()
+    for index in ('kdtree', 'brute'):
+        variant = PrototypeClassifier.from_arrays(arrays, metadata, args.feature_spec, index=index)
+        if variant.index == index:
+            candidates.append((f"Prototypes ({index})", variant.predict, variant.memory_bytes()))
+
+    print(f"\n{'Model':<24}{'Accuracy':>10}{'p50 ms':>9}{'p99 ms':>9}{'64-row ms':>11}{'Memory':>11}")
+    print("-" * 74)
+    forest_accuracy = None
+    prototype_accuracies = {}
+    batch = X_test[:64]
+    for name, predict, memory in candidates:
+        accuracy = float(np.mean(predict(X_test) == y_test))
+        if name == "Forest (compiled)":
+            forest_accuracy = accuracy
+        else:
+            prototype_accuracies[name] = accuracy
+        p50, p99 = latency_percentiles(predict, X_test)
+        batch_p50, _ = latency_percentiles(lambda rows: predict(batch), batch, repeats=100)
+        print(f"{name:<24}{accuracy * 100:>9.2f}%{p50:>9.3f}{p99:>9.3f}{batch_p50:>11.3f}{memory / 1e6:>9.3f}MB")
+
+    # Checked before saving: a running server hot-reloads whatever lands in the artifact directory
+    if forest_accuracy is not None and max(prototype_accuracies.values()) < forest_accuracy - 0.05:
+        print("[ERR] Prototypes are more than 5 points below the forest, artifact not saved - "
+              "try more --prototypes or --components")
+        sys.exit(1)
+    manifest = save_artifact(model, args.output, class_names, feature_spec=args.feature_spec,
+                             source=os.path.basename(__file__))
+    print(f"\n[OK] Prototype artifact {manifest['version']} saved: {args.output}")
+    print(f"[*] Serve it with GESTURE_SERVING_MODEL=prototype GESTURE_PROTOTYPE_ARTIFACT={args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,7 +12,6 @@ import cv2
 import numpy as np
 from pathlib import Path
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 
@@ -21,6 +20,10 @@ import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
+# Shared with gesture_api_server_simple.py so serving computes identical features
+from gesture_features import DEFAULT_FEATURE_SPEC, extract_features, save_landmark_dataset
+from model_artifact import export_model
+
 print("[GESTURE CLASSIFIER] Training with hand_landmarker.task")
 print("=" * 60)
 
@@ -31,8 +34,10 @@ DATA_PATH = "archive (1)\\indian"
 TASK_FILE = "hand_landmarker.task"
 MAX_IMAGES_PER_CLASS = 50  # Sample images to speed up training
 OUTPUT_MODEL = "gesture_classifier.pkl"
-OUTPUT_SCALER = "gesture_scaler.pkl"
 OUTPUT_CLASS_MAP = "gesture_class_map.pkl"
+OUTPUT_DATASET = "gesture_landmarks.npz"  # Raw landmarks for distillation/verification tools
+OUTPUT_ARTIFACT = os.path.join("models", "gesture_classifier")  # Memory-mapped artifact the server loads
+FEATURE_SPEC = DEFAULT_FEATURE_SPEC  # Wrist-relative, palm-size normalized + joint angles
 
 # ============================================================================
 # STEP 1: Verify data path
@@ -186,15 +191,14 @@ X_train, X_test, y_train, y_test = train_test_split(
     X_combined, y_combined, test_size=0.2, random_state=42, stratify=y_combined
 )
 
-# Normalize features
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
+# Scale- and translation-invariant features (same code the server runs)
+X_train_features = extract_features(X_train, FEATURE_SPEC)
+X_test_features = extract_features(X_test, FEATURE_SPEC)
 
-# Train model
+# Train model (normalized features need far fewer/shallower trees)
 model = RandomForestClassifier(
-    n_estimators=300,
-    max_depth=25,
+    n_estimators=150,
+    max_depth=20,
     min_samples_split=5,
     min_samples_leaf=2,
     class_weight='balanced',
@@ -202,10 +206,11 @@ model = RandomForestClassifier(
     random_state=42
 )
 
-model.fit(X_train_scaled, y_train)
+model.fit(X_train_features, y_train)
+model.feature_spec_ = FEATURE_SPEC  # Read by the server to build matching features
 
 # Evaluate
-y_pred = model.predict(X_test_scaled)
+y_pred = model.predict(X_test_features)
 accuracy = accuracy_score(y_test, y_pred)
 
 print(f"✅ Model training complete!")
@@ -234,16 +239,20 @@ try:
         pickle.dump(model, f)
     print(f"✅ Model saved: {OUTPUT_MODEL}")
     
-    # Save scaler
-    with open(OUTPUT_SCALER, 'wb') as f:
-        pickle.dump(scaler, f)
-    print(f"✅ Scaler saved: {OUTPUT_SCALER}")
+    # Save raw (un-augmented) landmarks
+    save_landmark_dataset(OUTPUT_DATASET, X_original, y_original, gesture_folders)
+    print(f"✅ Landmark dataset saved: {OUTPUT_DATASET}")
     
     # Save class mapping
     with open(OUTPUT_CLASS_MAP, 'wb') as f:
         pickle.dump({'class_to_idx': class_to_idx, 'idx_to_class': idx_to_class}, f)
     print(f"✅ Class mapping saved: {OUTPUT_CLASS_MAP}")
     
+    # Export the memory-mappable artifact (compiled forest + manifest)
+    manifest = export_model(model, OUTPUT_ARTIFACT, gesture_folders, source=OUTPUT_MODEL)
+    if manifest:
+        print(f"✅ Model artifact saved: {OUTPUT_ARTIFACT} (version {manifest['version']})")
+    
 except Exception as e:
     print(f"❌ ERROR saving files: {e}")
     exit(1)
@@ -261,7 +270,8 @@ print(f"  • Test samples: {len(X_test)}")
 print(f"  • Gesture classes: {len(gesture_folders)} (1-9, A-Z)")
 print(f"\nFiles saved:")
 print(f"  • {OUTPUT_MODEL}")
-print(f"  • {OUTPUT_SCALER}")
+print(f"  • {OUTPUT_DATASET}")
 print(f"  • {OUTPUT_CLASS_MAP}")
-print(f"\nNext step: Restart Flask backend to load new model")
+print(f"  • {OUTPUT_ARTIFACT}")
+print(f"\nNext step: a running server hot-reloads {OUTPUT_ARTIFACT} (or POST /api/model/reload)")
 print(f"=" * 60)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for pre-fork production serving
+Models are loaded once in the gunicorn master (preload_app) and shared
+copy-on-write by every worker; MediaPipe is re-created in each worker after
+the fork (see gunicorn.conf.py)
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+    GESTURE_SERVER=lite gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import importlib
+import os
+
+SERVER_MODULES = {
+    'simple': 'gesture_api_server_simple',
+    'lite': 'gesture_api_server_lite',
+}
+
+# Tell the server module it is being preloaded in a pre-fork master
+os.environ.setdefault('GESTURE_PREFORK', '1')
+
+
+def load_server_module(name: str = None):
+    """Import (once) the server module selected by GESTURE_SERVER"""
+    name = (name or os.getenv('GESTURE_SERVER', 'simple')).lower()
+    if name not in SERVER_MODULES:
+        raise ValueError(f"Unknown GESTURE_SERVER '{name}' (expected one of {', '.join(SERVER_MODULES)})")
+    return importlib.import_module(SERVER_MODULES[name])
+
+
+def create_app(name: str = None):
+    return load_server_module(name).create_app()
+
+
+app = create_app()